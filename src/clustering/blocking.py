@@ -0,0 +1,204 @@
+"""
+Pre-partitioning of mutants into blocks before clustering.
+
+Mutants of different methods, or produced by different mutation operators, are rarely
+redundant with one another. Each mutant is diffed against the original target once; the
+changed lines give the enclosing function (from the original's AST) and the removed→added
+token pairs of each hunk give the mutation operators. Clustering then runs independently, and in parallel, on each
+block: many small problems instead of one large superlinear one.
+"""
+import os
+import ast
+import json
+import difflib
+import inspect
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+from src.clustering.cluster_api import ALGORITHMS, FEATURES_PATH, OUTPUT_DIR, as_feature_set, save_cluster_assignments
+from src.feature_extraction.compare import canonical_lines, diff_signature, tokenize
+
+ORIGINAL_PATH = "src/fsm_modeling/flight_booking_fsm.py"
+MUTANTS_DIR = "data/output/mutants/"
+
+# Changed tokens characterizing each operator of mutpy_integration
+ARITHMETIC_TOKENS = {"+", "-", "*", "/", "%"}
+RELATIONAL_TOKENS = {"<", ">", "=", "!", "in", "is"}
+CONDITIONAL_TOKENS = {"not", "and", "or"}
+# Tokens an operator may add or drop around its edit (e.g. ``not (a and b)``)
+GROUPING_TOKENS = {"(", ")"}
+
+
+def function_spans(original_lines):
+    """``(start, end, qualname)`` of every function of the original, as 0-based half-open line ranges."""
+    spans = []
+
+    def walk(node, prefix):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                spans.append((child.lineno - 1, child.end_lineno, prefix + child.name))
+                walk(child, f"{prefix}{child.name}.")
+            elif isinstance(child, ast.ClassDef):
+                walk(child, f"{prefix}{child.name}.")
+
+    walk(ast.parse("\n".join(original_lines)), "")
+    return spans
+
+
+def enclosing_function(spans, start, end):
+    """Innermost function containing the line range ``start:end``, or ``<module>``."""
+    enclosing = [(span_end - span_start, name) for span_start, span_end, name in spans
+                 if span_start <= start and max(end, start + 1) <= span_end]
+    return min(enclosing)[1] if enclosing else "<module>"
+
+
+def hunk_operators(removed_tokens, added_tokens):
+    """
+    Mutation operators of one hunk (AOR, ROR, COI, SDL, FSM_TRANS for a reordering, OTHER).
+
+    The removed and added tokens are aligned, and every removed→added pair of the alignment
+    is named on its own, so a hunk holding several edits (an AOR and a ROR swap on one
+    line, say) or edits amid unchanged code still gets their operators. A hunk that only
+    removes code, or replaces it with ``pass``, is a statement deletion.
+    """
+    if not added_tokens or (removed_tokens and tuple(added_tokens) == ("pass",)):
+        return {"SDL"}
+    if Counter(removed_tokens) == Counter(added_tokens):
+        return {"FSM_TRANS"}
+    operators = set()
+    matcher = difflib.SequenceMatcher(None, removed_tokens, added_tokens, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        changed = set(removed_tokens[i1:i2]) | set(added_tokens[j1:j2])
+        if tag == "equal" or changed <= GROUPING_TOKENS:
+            continue
+        changed -= GROUPING_TOKENS
+        if changed <= ARITHMETIC_TOKENS:
+            operators.add("AOR")
+        elif changed <= RELATIONAL_TOKENS:
+            operators.add("ROR")
+        elif changed <= CONDITIONAL_TOKENS:
+            operators.add("COI")
+        else:
+            operators.add("OTHER")
+    return operators or {"OTHER"}
+
+
+def infer_operator(removed_tokens, added_tokens):
+    """Names the mutation operators of one hunk (see ``hunk_operators``), joined with ``+``."""
+    return "+".join(sorted(hunk_operators(removed_tokens, added_tokens)))
+
+
+def mutation_sites(original_path, mutant_paths):
+    """
+    Where and how every mutant changes the original target.
+
+    :return: ``{mutant file name: (operators, functions, lines)}``: sorted tuples of the
+             inferred operators, the enclosing functions (``<module>`` when outside any
+             function) and the 0-based lines of the original that were changed.
+    """
+    with open(original_path, "r") as f:
+        original_lines = canonical_lines(f.read())
+    spans = function_spans(original_lines)
+
+    sites = {}
+    for mutant_path in mutant_paths:
+        with open(mutant_path, "r") as f:
+            signature = diff_signature(original_lines, canonical_lines(f.read()))
+        operators = set().union(*(hunk_operators(tokenize(original_lines[start:end]), tokens)
+                                  for start, end, tokens in signature))
+        functions = {enclosing_function(spans, start, end) for start, end, _ in signature} or {"<module>"}
+        lines = {line for start, end, _ in signature for line in range(start, max(end, start + 1))}
+        sites[Path(mutant_path).name] = (tuple(sorted(operators)), tuple(sorted(functions)), tuple(sorted(lines)))
+    return sites
+
+
+def assign_blocks(original_path, mutant_paths):
+    """
+    Block key of every mutant: ``"<operator>|<enclosing function>"``, for example
+    ``"ROR|FlightBookingFSM.transition"``. Mutants touching several functions or mixing
+    operators get the sorted names joined with ``+``.
+
+    :return: ``{mutant file name: block key}``
+    """
+    return {name: f"{'+'.join(operators) or 'NONE'}|{'+'.join(functions)}"
+            for name, (operators, functions, _) in mutation_sites(original_path, mutant_paths).items()}
+
+
+def _cluster_block(args):
+    """Clusters the scaled rows of one block; ``n_clusters`` is capped at the block's distinct rows."""
+    algo, scaled_block, params = args
+    algorithm = ALGORITHMS[algo]
+    n_clusters = inspect.signature(algorithm).parameters.get("n_clusters")
+    if n_clusters is not None:
+        n_distinct = len(np.unique(scaled_block, axis=0))
+        params = {**params, "n_clusters": min(params.get("n_clusters", n_clusters.default), n_distinct)}
+    labels, _ = algorithm(scaled_block, **params)
+    return np.asarray(labels)
+
+
+def blocked_cluster(features, blocks, algo="kmeans", max_workers=None, **params):
+    """
+    Clusters each block independently (in parallel processes) and merges the labels.
+
+    Features are scaled once over the whole corpus, so distances mean the same in every
+    block. Cluster ids are offset per block so that they stay unique; noise stays -1 and a
+    block of a single mutant is its own cluster.
+
+    :param features: ``FeatureSet``, features.json path, features dict or raw matrix.
+    :param blocks: Block key of every mutant, in the order of ``features.mutant_names``.
+    :param params: Parameters of the algorithm, applied to every block (``n_clusters`` is
+                   the number of clusters per block).
+    :return: Integer labels of all mutants.
+    """
+    features = as_feature_set(features)
+    rows_by_block = defaultdict(list)
+    for row, block in enumerate(blocks):
+        rows_by_block[block].append(row)
+    # Largest blocks first, so they do not end up last on a busy pool
+    block_rows = sorted((np.array(rows) for rows in rows_by_block.values()), key=len, reverse=True)
+
+    block_labels = [np.zeros(len(rows), dtype=np.int64) for rows in block_rows]
+    clustered = [i for i, rows in enumerate(block_rows) if len(rows) > 1]
+    if clustered:
+        tasks = [(algo, features.scaled[block_rows[i]], params) for i in clustered]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for i, local in zip(clustered, executor.map(_cluster_block, tasks)):
+                block_labels[i] = local
+
+    labels = np.full(len(features), -1, dtype=np.int64)
+    next_label = 0
+    for rows, local in zip(block_rows, block_labels):
+        clustered_rows = local >= 0
+        labels[rows[clustered_rows]] = local[clustered_rows] + next_label
+        next_label += local.max() + 1 if clustered_rows.any() else 0
+    return labels
+
+
+def main(features_path=FEATURES_PATH, original_path=ORIGINAL_PATH, mutants_dir=MUTANTS_DIR,
+         output_dir=OUTPUT_DIR, n_clusters=3):
+    os.makedirs(output_dir, exist_ok=True)
+
+    # 📂 Load features and block every mutant by operator and enclosing function
+    features = as_feature_set(features_path)
+    mutant_blocks = assign_blocks(original_path, [os.path.join(mutants_dir, name) for name in features.mutant_names])
+    blocks = [mutant_blocks[name] for name in features.mutant_names]
+    print(f"🧱 {len(set(blocks))} blocks: {dict(Counter(blocks))}")
+
+    # 🔍 Cluster every block in parallel
+    labels = blocked_cluster(features, blocks, algo="kmeans", n_clusters=n_clusters)
+
+    # 💾 Save blocks and cluster assignments
+    blocks_path = os.path.join(output_dir, "mutant_blocks.json")
+    with open(blocks_path, "w") as f:
+        json.dump(mutant_blocks, f, indent=4)
+    output_path = os.path.join(output_dir, "blocked_cluster_assignments.json")
+    save_cluster_assignments(labels, features.mutant_names, output_path)
+
+    print(f"🔢 Cluster distribution: {dict(Counter(labels.tolist()))}")
+    print(f"📊 Blocks saved to {blocks_path}")
+    print(f"✅ Cluster assignments saved to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""
+Library entry point for clustering mutants.
+
+Importing this module has no side effects: features are loaded and scaled on demand
+(and cached per file), and heavy libraries are only imported by the algorithm that
+needs them. Typical use::
+
+    from src.clustering.cluster_api import cluster, load_features
+
+    features = load_features("data/output/features.json")
+    labels, model = cluster(features, algo="kmeans", n_clusters=15)
+    labels, model = cluster(features, algo="hdbscan", min_cluster_size=2)
+"""
+import os
+import json
+import hashlib
+import inspect
+from functools import lru_cache
+from itertools import chain
+import numpy as np
+
+FEATURES_PATH = "data/output/features.json"
+OUTPUT_DIR = "data/output/clustering/"
+
+# Rows per chunk when accumulating scaling statistics
+SCALE_CHUNK_SIZE = 65536
+
+# Registered clustering algorithms: name -> function(scaled_features, **params) -> (labels, model)
+ALGORITHMS = {}
+
+
+def register_algorithm(name):
+    """Decorator registering a clustering function under ``name``."""
+    def decorator(func):
+        ALGORITHMS[name] = func
+        return func
+    return decorator
+
+
+class FeatureSet:
+    """
+    Feature matrix of a set of mutants with its row/column names; scaling is computed once.
+
+    The matrix is kept in its storage type (float32, or int16 when loaded from a compact
+    ``.npy``) and names live in plain lists next to it, so no DataFrame or float64 copy of
+    the corpus is ever built.
+    """
+
+    def __init__(self, matrix, mutant_names=None, columns=None):
+        self.matrix = np.asarray(matrix)
+        self.mutant_names = list(mutant_names) if mutant_names is not None else list(range(len(self.matrix)))
+        self.columns = list(columns) if columns is not None else list(range(self.matrix.shape[1]))
+        self._scaler = None
+        self._scaled = None
+        self._unique_rows = None
+
+    @classmethod
+    def from_dict(cls, features_dict, dtype=np.float32):
+        """
+        Builds a feature set from the ``{mutant: {feature: value}}`` layout of features.json.
+
+        Values are written straight into a preallocated ``dtype`` matrix; missing features are NaN.
+        """
+        mutant_names = list(features_dict.keys())
+        columns = list(dict.fromkeys(key for features in features_dict.values() for key in features))
+        shape = (len(mutant_names), len(columns))
+
+        if all(list(features) == columns for features in features_dict.values()):
+            # Common case: every mutant has the same features in the same order
+            values = chain.from_iterable(features.values() for features in features_dict.values())
+            matrix = np.fromiter(values, dtype=dtype, count=shape[0] * shape[1]).reshape(shape)
+        else:
+            column_index = {column: j for j, column in enumerate(columns)}
+            matrix = np.full(shape, np.nan, dtype=dtype)
+            for i, features in enumerate(features_dict.values()):
+                for column, value in features.items():
+                    matrix[i, column_index[column]] = value
+        return cls(matrix, mutant_names, columns)
+
+    @property
+    def scaler(self):
+        """The fitted ``StandardScaler``."""
+        if self._scaler is None:
+            self._scale()
+        return self._scaler
+
+    @property
+    def scaled(self):
+        """Standardized feature matrix."""
+        if self._scaled is None:
+            self._scale()
+        return self._scaled
+
+    def _scale(self):
+        from sklearn.preprocessing import StandardScaler
+
+        # Statistics are accumulated in float64 one chunk at a time, then a single private
+        # float32 copy of the matrix is standardized in place. The scaler itself keeps
+        # copy=True, since it is exposed (and persisted) for transforming callers' arrays.
+        self._scaler = StandardScaler()
+        for start in range(0, len(self.matrix), SCALE_CHUNK_SIZE):
+            self._scaler.partial_fit(self.matrix[start:start + SCALE_CHUNK_SIZE])
+        self._scaled = self._scaler.transform(self.matrix.astype(np.float32), copy=False)
+
+    def unique_rows(self):
+        """
+        Distinct feature vectors: ``(first_index, inverse, counts)`` such that
+        ``matrix[first_index][inverse]`` equals ``matrix`` and ``counts`` holds the number of
+        mutants sharing each distinct vector.
+        """
+        if self._unique_rows is None:
+            _, first_index, inverse, counts = np.unique(self.matrix, axis=0, return_index=True,
+                                                        return_inverse=True, return_counts=True)
+            self._unique_rows = (first_index, inverse.ravel(), counts)
+        return self._unique_rows
+
+    def __len__(self):
+        return len(self.mutant_names)
+
+
+@lru_cache(maxsize=8)
+def _load_features(features_path, mtime):
+    with open(features_path, "r") as f:
+        return FeatureSet.from_dict(json.load(f))
+
+
+def load_features(features_path=FEATURES_PATH):
+    """
+    Loads features.json (or a ``.npy`` matrix saved by ``save_feature_matrix``) into a
+    ``FeatureSet``; repeated calls reuse the parsed and scaled data.
+    """
+    features_path = os.path.abspath(features_path)
+    if features_path.endswith(".npy"):
+        return load_feature_matrix(features_path)
+    return _load_features(features_path, os.path.getmtime(features_path))
+
+
+def load_feature_matrix(matrix_path, mmap_mode=None):
+    """Loads a ``.npy`` matrix and its ``_index.json`` (see ``save_feature_matrix``) into a ``FeatureSet``."""
+    with open(os.path.splitext(matrix_path)[0] + "_index.json", "r") as f:
+        index = json.load(f)
+    return FeatureSet(np.load(matrix_path, mmap_mode=mmap_mode), index["mutants"], index["columns"])
+
+
+def as_feature_set(features):
+    """Accepts a ``FeatureSet``, a features.json path, a features dict or a raw matrix."""
+    if isinstance(features, FeatureSet):
+        return features
+    if isinstance(features, (str, os.PathLike)):
+        return load_features(features)
+    if isinstance(features, dict):
+        return FeatureSet.from_dict(features)
+    return FeatureSet(features)
+
+
+def cluster(features, algo="kmeans", deduplicate=True, **params):
+    """
+    Clusters mutants with a registered algorithm.
+
+    :param features: ``FeatureSet``, path to features.json, features dict or raw matrix.
+    :param algo: Name of a registered algorithm (see ``ALGORITHMS``).
+    :param deduplicate: For algorithms accepting a ``sample_weight``, cluster each distinct
+                        feature vector once, weighted by the number of mutants sharing it, and
+                        broadcast the labels back to every mutant. DBSCAN finds the same
+                        clusters and K-Means minimizes the same inertia. The model is fitted
+                        on the distinct vectors only, so its per-sample attributes (such as
+                        ``labels_`` or ``core_sample_indices_``) index those vectors, not the
+                        mutants; use the returned labels instead. When fewer distinct vectors
+                        than ``n_clusters`` exist, the full matrix is clustered.
+    :param params: Parameters forwarded to the algorithm.
+    :return: ``(labels, model)`` where ``labels`` is an integer array (-1 marks noise).
+    """
+    try:
+        algorithm = ALGORITHMS[algo]
+    except KeyError:
+        raise ValueError(f"Unknown clustering algorithm '{algo}'. Available: {sorted(ALGORITHMS)}") from None
+    features = as_feature_set(features)
+
+    parameters = inspect.signature(algorithm).parameters
+    if deduplicate and "sample_weight" in parameters:
+        first_index, inverse, counts = features.unique_rows()
+        n_clusters = params.get("n_clusters", getattr(parameters.get("n_clusters"), "default", None))
+        if len(counts) < len(features) and (n_clusters is None or n_clusters <= len(counts)):
+            labels, model = algorithm(features.scaled[first_index], sample_weight=counts, **params)
+            return np.asarray(labels)[inverse], model
+    return algorithm(features.scaled, **params)
+
+
+def compact_matrix(matrix):
+    """Returns the matrix as int16 when it only holds integers in the int16 range, else as float32."""
+    matrix = np.asarray(matrix)
+    limits = np.iinfo(np.int16)
+    if (matrix.size and np.isfinite(matrix).all() and (np.mod(matrix, 1) == 0).all()
+            and limits.min <= matrix.min() and matrix.max() <= limits.max):
+        return matrix.astype(np.int16)
+    return matrix.astype(np.float32, copy=False)
+
+
+def save_feature_matrix(features, output_path):
+    """
+    Saves a feature set as a ``.npy`` matrix plus a ``_index.json`` with its row and column names.
+
+    The matrix is stored as int16 when all features are small integers (counts), float32
+    otherwise. The ``.npy`` layout can be memory mapped and read in chunks (see ``streaming_kmeans``).
+    """
+    features = as_feature_set(features)
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    np.save(output_path, compact_matrix(features.matrix))
+    with open(os.path.splitext(output_path)[0] + "_index.json", "w") as f:
+        json.dump({"mutants": features.mutant_names, "columns": features.columns}, f, indent=4)
+
+
+def features_digest(matrix):
+    """Short digest of a feature matrix, used to key results persisted for it (graphs, trees)."""
+    return hashlib.blake2b(np.ascontiguousarray(matrix).tobytes(), digest_size=16).hexdigest()
+
+
+def summarize_labels(labels):
+    """
+    Cluster count, noise share and reduction ratio of a labelling.
+
+    The reduction ratio assumes one representative is run per cluster and every noise mutant
+    is run on its own: ``1 - (n_clusters + n_noise) / n``.
+    """
+    labels = np.asarray(labels)
+    n_noise = int(np.sum(labels == -1))
+    n_clusters = len(np.unique(labels[labels >= 0]))
+    return {
+        "n_clusters": n_clusters,
+        "noise_share": n_noise / len(labels),
+        "reduction_ratio": 1 - (n_clusters + n_noise) / len(labels),
+    }
+
+
+def save_cluster_assignments(labels, mutant_names, output_path):
+    """Saves ``{mutant: cluster}`` assignments to JSON and returns the dictionary."""
+    cluster_assignments = {name: int(label) for name, label in zip(mutant_names, labels)}
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with open(output_path, "w") as f:
+        json.dump(cluster_assignments, f, indent=4)
+    return cluster_assignments
+
+
+@register_algorithm("kmeans")
+def kmeans(scaled_features, n_clusters=15, random_state=42, n_init=10, sample_weight=None, **params):
+    """K-Means clustering."""
+    from sklearn.cluster import KMeans
+
+    model = KMeans(n_clusters=n_clusters, random_state=random_state, n_init=n_init, **params)
+    return model.fit_predict(scaled_features, sample_weight=sample_weight), model
+
+
+@register_algorithm("minibatch_kmeans")
+def minibatch_kmeans(scaled_features, n_clusters=15, random_state=42, batch_size=1024, sample_weight=None, **params):
+    """Mini-Batch K-Means clustering (see ``streaming_kmeans`` for out-of-core fitting)."""
+    from sklearn.cluster import MiniBatchKMeans
+
+    model = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state, batch_size=batch_size, **params)
+    return model.fit_predict(scaled_features, sample_weight=sample_weight), model
+
+
+@register_algorithm("dbscan")
+def dbscan(scaled_features, eps=0.5, min_samples=2, sample_weight=None, **params):
+    """DBSCAN clustering (with ``sample_weight``, a point counts ``weight`` times towards ``min_samples``)."""
+    from sklearn.cluster import DBSCAN
+
+    model = DBSCAN(eps=eps, min_samples=min_samples, **params)
+    return model.fit_predict(scaled_features, sample_weight=sample_weight), model
+
+
+@register_algorithm("grid_dbscan")
+def grid_dbscan(scaled_features, eps=0.5, min_samples=2, sample_weight=None):
+    """Exact DBSCAN on a grid hash, for low-dimensional features (same labels as "dbscan")."""
+    from src.clustering.grid_dbscan import GridDBSCAN
+
+    model = GridDBSCAN(eps=eps, min_samples=min_samples)
+    return model.fit_predict(scaled_features, sample_weight=sample_weight), model
+
+
+@register_algorithm("hdbscan")
+def hdbscan(scaled_features, min_cluster_size=2, min_samples=1, metric="euclidean", **params):
+    """HDBSCAN clustering."""
+    import hdbscan as hdbscan_lib
+
+    model = hdbscan_lib.HDBSCAN(min_cluster_size=min_cluster_size, min_samples=min_samples, metric=metric, **params)
+    return model.fit_predict(scaled_features), model
+
+
+@register_algorithm("agglomerative")
+def agglomerative(scaled_features, n_clusters=15, distance_threshold=None, n_neighbors=10, linkage="ward",
+                  tree_path=None):
+    """
+    Agglomerative clustering constrained to a kNN graph; the model is the ``LinkageTree``, which can be re-cut.
+
+    The tree is cached at ``tree_path`` (default ``hierarchical.TREE_PATH``) and reused while
+    the features and tree parameters are unchanged.
+    """
+    from src.clustering.hierarchical import TREE_PATH, load_or_build_linkage_tree
+
+    tree = load_or_build_linkage_tree(scaled_features, tree_path or TREE_PATH, n_neighbors=n_neighbors,
+                                      linkage=linkage)
+    if distance_threshold is not None:
+        return tree.cut(distance_threshold=distance_threshold), tree
+    return tree.cut(n_clusters=n_clusters), tree
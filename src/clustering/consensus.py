@@ -0,0 +1,133 @@
+import os
+import json
+import inspect
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from src.clustering.cluster_api import ALGORITHMS, FEATURES_PATH, OUTPUT_DIR, as_feature_set, save_cluster_assignments
+from src.clustering.neighbor_graph import build_neighbor_graph
+
+# Scaled features of the worker process, populated by the pool initializer
+_FEATURES = None
+
+
+def _init_worker(scaled_features):
+    global _FEATURES
+    _FEATURES = scaled_features
+
+
+def _cluster_subsample(args):
+    """Clusters one subsample; returns the sampled row indices and their labels."""
+    algo, indices, seed, params = args
+    algorithm = ALGORITHMS[algo]
+    if "random_state" in inspect.signature(algorithm).parameters:
+        params = {**params, "random_state": seed}
+    labels, _ = algorithm(_FEATURES[indices], **params)
+    return indices, np.asarray(labels)
+
+
+def co_association(n, rows, cols, subsamples):
+    """
+    Counts, for each candidate pair ``(rows[e], cols[e])``, how often both mutants were
+    sampled together and how often they then shared a cluster.
+
+    :return: ``(co_clustered, co_sampled)`` arrays aligned with the candidate pairs.
+    """
+    co_clustered = np.zeros(len(rows), dtype=np.int32)
+    co_sampled = np.zeros(len(rows), dtype=np.int32)
+    for indices, labels in subsamples:
+        full_labels = np.full(n, -2, dtype=np.int64)  # -2: not sampled, -1: noise
+        full_labels[indices] = labels
+        label_i, label_j = full_labels[rows], full_labels[cols]
+        both_sampled = (label_i != -2) & (label_j != -2)
+        co_sampled += both_sampled
+        co_clustered += both_sampled & (label_i == label_j) & (label_i >= 0)
+    return co_clustered, co_sampled
+
+
+def consensus_cluster(features, algo="kmeans", n_subsamples=50, sample_fraction=0.8, threshold=0.5,
+                      unstable_threshold=0.8, n_neighbors=15, max_workers=None, random_state=42, **params):
+    """
+    Subsampling consensus clustering.
+
+    ``n_subsamples`` subsamples, each a ``sample_fraction`` of the mutants drawn without
+    replacement (bootstrap duplicates would only repeat identical feature rows), are
+    clustered in parallel with a different seed. A sparse co-association matrix records,
+    for each pair of mutants in the symmetrized ``n_neighbors``-nearest-neighbour graph, the
+    fraction of subsamples containing both in which they shared a cluster; restricting it to neighbours
+    keeps memory linear in the number of mutants. Final clusters are the connected
+    components of pairs with consensus >= ``threshold``.
+
+    A mutant's stability is its mean consensus with its neighbours in the same final
+    cluster (for a singleton, 1 minus its highest consensus with any neighbour). Mutants
+    below ``unstable_threshold`` have a membership that depends on the seed or the sample.
+
+    :return: ``(labels, stability, unstable)`` where ``unstable`` is a boolean mask.
+    """
+    scaled_features = as_feature_set(features).scaled
+    n = len(scaled_features)
+    rng = np.random.default_rng(random_state)
+    sample_size = max(2, int(round(sample_fraction * n)))
+    tasks = [
+        (algo, np.sort(rng.choice(n, size=sample_size, replace=False)), int(rng.integers(2 ** 31)), params)
+        for _ in range(n_subsamples)
+    ]
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(scaled_features,)) as executor:
+        subsamples = list(executor.map(_cluster_subsample, tasks))
+
+    # 🔗 Candidate pairs: each undirected kNN edge once
+    candidates = sparse.triu(build_neighbor_graph(scaled_features, n_neighbors=n_neighbors), k=1).tocoo()
+    rows, cols = candidates.row, candidates.col
+    co_clustered, co_sampled = co_association(n, rows, cols, subsamples)
+    consensus = co_clustered / np.maximum(co_sampled, 1)
+
+    # ✂️ Cut the co-association graph
+    strong = consensus >= threshold
+    graph = sparse.csr_matrix((np.ones(strong.sum()), (rows[strong], cols[strong])), shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+
+    # 📊 Per-mutant stability (each pair counts for both of its mutants)
+    ends = np.concatenate([rows, cols])
+    pair_consensus = np.concatenate([consensus, consensus])
+    same_cluster = np.concatenate([labels[rows] == labels[cols]] * 2)
+    within = np.bincount(ends[same_cluster], weights=pair_consensus[same_cluster], minlength=n)
+    within_count = np.bincount(ends[same_cluster], minlength=n)
+    stability = within / np.maximum(within_count, 1)
+    best_other = np.zeros(n)
+    np.maximum.at(best_other, ends, pair_consensus)
+    sizes = np.bincount(labels)[labels]
+    stability = np.where(sizes == 1, 1 - best_other, stability)
+
+    return labels, stability, stability < unstable_threshold
+
+
+def main(features_path=FEATURES_PATH, output_dir=OUTPUT_DIR, n_clusters=15):
+    os.makedirs(output_dir, exist_ok=True)
+
+    # 📂 Load extracted features (scaled once)
+    features = as_feature_set(features_path)
+
+    # 🔍 Consensus over subsampled k-means runs
+    labels, stability, unstable = consensus_cluster(features, algo="kmeans", n_clusters=n_clusters, n_init=1)
+
+    # 💾 Save cluster assignments and stability
+    output_path = os.path.join(output_dir, "consensus_cluster_assignments.json")
+    save_cluster_assignments(labels, features.mutant_names, output_path)
+    stability_path = os.path.join(output_dir, "consensus_stability.json")
+    with open(stability_path, "w") as f:
+        json.dump({
+            "stability": {name: round(float(s), 4) for name, s in zip(features.mutant_names, stability)},
+            "unstable": [name for name, flag in zip(features.mutant_names, unstable) if flag],
+        }, f, indent=4)
+
+    print(f"🔢 Cluster distribution: {dict(Counter(labels.tolist()))}")
+    print(f"⚠️ {int(unstable.sum())} unstable mutants flagged for extra evaluation")
+    print(f"✅ Consensus cluster assignments saved to {output_path}")
+    print(f"📊 Stability saved to {stability_path}")
+
+
+if __name__ == "__main__":
+    main()
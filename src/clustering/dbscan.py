@@ -1,40 +1,40 @@
 import json
-import numpy as np
-from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import DBSCAN
-import matplotlib.pyplot as plt
-from sklearn.decomposition import PCA
-import pandas as pd
 import os
 from collections import Counter
+from src.clustering.cluster_api import FEATURES_PATH, OUTPUT_DIR, as_feature_set, cluster
+from src.clustering.neighbor_graph import dbscan_from_graph, load_or_build_neighbor_graph
+from src.clustering.visualization import plot_in_background, save_cluster_plot_data
 
-def load_features(features_file):
-    """Load features from JSON file and convert to numpy array."""
-    with open(features_file, 'r') as f:
-        features_dict = json.load(f)
-    
-    # Convert dictionary to DataFrame
-    df = pd.DataFrame.from_dict(features_dict, orient='index')
-    
-    # Store mutant names for later reference
-    mutant_names = list(features_dict.keys())
-    
-    # Convert to numpy array for clustering
-    feature_matrix = df.values
+# Radius of the persisted neighbour graph: any eps up to it reuses the graph without recomputing distances
+GRAPH_RADIUS = 4.0
+
+def load_features(features_path):
+    """Load features from JSON file as a float32 numpy array, with mutant and feature names alongside."""
+    features = as_feature_set(features_path)
     
-    return feature_matrix, mutant_names, df
+    return features.matrix, features.mutant_names, features.columns
 
-def perform_clustering(feature_matrix, eps=0.5, min_samples=2):
-    """Perform DBSCAN clustering on normalized features."""
-    # Normalize features
-    scaler = StandardScaler()
-    normalized_features = scaler.fit_transform(feature_matrix)
+def perform_clustering(feature_matrix, eps=0.5, min_samples=2, neighbor_graph=None, algorithm="auto"):
+    """
+    Perform DBSCAN clustering on normalized features.
+
+    If a precomputed ``neighbor_graph`` (radius >= eps) is given, neighbourhoods are read
+    from it instead of being recomputed. ``algorithm="grid"`` uses the grid-hash backend
+    (``grid_dbscan``, same labels, suited to a handful of integer features); other values
+    select scikit-learn's neighbour search ("auto", "ball_tree", "kd_tree", "brute").
+    """
+    # Normalize features (computed once per feature set)
+    features = as_feature_set(feature_matrix)
     
     # Perform DBSCAN clustering
-    dbscan = DBSCAN(eps=eps, min_samples=min_samples)
-    clusters = dbscan.fit_predict(normalized_features)
-    
-    return clusters, normalized_features
+    if neighbor_graph is not None:
+        clusters = dbscan_from_graph(neighbor_graph, eps=eps, min_samples=min_samples)
+    elif algorithm == "grid":
+        clusters, _ = cluster(features, algo="grid_dbscan", eps=eps, min_samples=min_samples)
+    else:
+        clusters, _ = cluster(features, algo="dbscan", eps=eps, min_samples=min_samples, algorithm=algorithm)
+    
+    return clusters, features.scaled
 
 def save_cluster_assignments(clusters, mutant_names, output_file):
     """Save cluster assignments to JSON file."""
@@ -46,69 +46,46 @@ def save_cluster_assignments(clusters, mutant_names, output_file):
     return cluster_dict
 
 def visualize_clusters(normalized_features, clusters, output_file):
-    """Create a 2D visualization of the clusters using PCA, matching HDBSCAN style."""
-    # Reduce dimensionality to 2D using PCA
-    pca = PCA(n_components=2)
-    reduced_features = pca.fit_transform(normalized_features)
-    
-    # Create the plot
-    plt.figure(figsize=(10, 6))
-    
-    # Add jitter to prevent overlapping
-    jittered_features = reduced_features + np.random.uniform(-0.05, 0.05, size=reduced_features.shape)
-    
-    # Create scatter plot with tab10 colormap
-    scatter = plt.scatter(
-        jittered_features[:, 0],
-        jittered_features[:, 1],
-        c=clusters,
-        cmap='tab10',
-        edgecolors='k',
-        alpha=0.6
-    )
-    
-    plt.xlabel('PCA Component 1')
-    plt.ylabel('PCA Component 2')
-    plt.title('DBSCAN Mutant Clustering')
-    
-    # Add colorbar
-    cbar = plt.colorbar(scatter)
-    cbar.set_label('Cluster ID')
-    
-    # Save the plot
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
-    plt.close()
+    """Render a 2D PCA visualization of the clusters in the background, matching HDBSCAN style."""
+    plot_data = save_cluster_plot_data(normalized_features, clusters, os.path.splitext(output_file)[0] + ".npz",
+                                       'DBSCAN Mutant Clustering', dpi=300)
+    return plot_in_background(plot_data, output_file)
 
-def main():
+def main(features_path=FEATURES_PATH, output_dir=OUTPUT_DIR, eps=2.0, plot=True, graph_radius=GRAPH_RADIUS):
     # File paths
-    features_file = "data/output/features.json"
-    output_dir = "data/output/clustering/"
     os.makedirs(output_dir, exist_ok=True)
     
     visualization_file = os.path.join(output_dir, "dbscan_output.png")
     cluster_assignments_file = os.path.join(output_dir, "dbscan_cluster_assignments.json")
     
     # Load features
-    feature_matrix, mutant_names, df = load_features(features_file)
+    features = as_feature_set(features_path)
+    
+    # Neighbour graph, reused across runs while the features are unchanged and eps <= its radius
+    neighbor_graph = load_or_build_neighbor_graph(features, os.path.join(output_dir, "neighbor_graph.npz"),
+                                                  radius=max(eps, graph_radius))
     
     # Perform clustering
     clusters, normalized_features = perform_clustering(
-        feature_matrix, 
-        eps=2.0,  # Adjust this value based on your needs
-        min_samples=2
+        features, 
+        eps=eps,
+        min_samples=2,
+        neighbor_graph=neighbor_graph
     )
     
     # Save cluster assignments
-    cluster_dict = save_cluster_assignments(clusters, mutant_names, cluster_assignments_file)
+    save_cluster_assignments(clusters, features.mutant_names, cluster_assignments_file)
     
     # Visualize results
-    visualize_clusters(normalized_features, clusters, visualization_file)
+    if plot:
+        visualize_clusters(normalized_features, clusters, visualization_file)
     
     # Print summary
-    cluster_counts = Counter(clusters)
+    cluster_counts = Counter(clusters.tolist())
     print(f"🔢 Cluster distribution: {dict(cluster_counts)}")
     print(f"✅ Cluster assignments saved to {cluster_assignments_file}")
-    print(f"📊 Clustering visualization saved to {visualization_file}")
+    if plot:
+        print(f"📊 Clustering visualization rendering in the background to {visualization_file}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
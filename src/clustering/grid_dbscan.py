@@ -0,0 +1,149 @@
+"""
+Exact DBSCAN for low-dimensional data, using a grid hash instead of a search tree.
+
+Points are bucketed into cells of side ``eps``, so two points closer than ``eps`` are always
+in the same or in adjacent cells: only those cell pairs are compared. Identical points are
+collapsed first, so the small integer structural features leave few distinct points in few
+non-empty cells, and no tree is built. Labels are identical to ``sklearn.cluster.DBSCAN`` with the
+Euclidean metric (same cluster numbering, same tie-breaking for border points).
+"""
+import itertools
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+# 3 ** d neighbouring cells are visited per cell, which limits the grid to low dimensions
+MAX_DIMENSIONS = 8
+
+
+def _cell_keys(cells, spans):
+    """Mixed-radix integer key of each cell."""
+    keys = np.zeros(len(cells), dtype=np.int64)
+    for j, span in enumerate(spans):
+        keys = keys * span + cells[:, j]
+    return keys
+
+
+def _half_offsets(n_dimensions):
+    """Neighbouring cell offsets whose first non-zero component is positive (each pair of cells once)."""
+    offsets = np.array(list(itertools.product((-1, 0, 1), repeat=n_dimensions)), dtype=np.int64)
+    first_nonzero = offsets[np.arange(len(offsets)), np.argmax(offsets != 0, axis=1)]
+    return offsets[first_nonzero > 0]
+
+
+def _expand_pairs(first_a, size_a, first_b, size_b):
+    """All (i, j) point index pairs between cell ranges ``[first_a, first_a + size_a)`` and the ``b`` ones."""
+    counts = size_a * size_b
+    pair_cell = np.repeat(np.arange(len(counts)), counts)
+    local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return first_a[pair_cell] + local // size_b[pair_cell], first_b[pair_cell] + local % size_b[pair_cell]
+
+
+def neighbor_pairs(points, eps):
+    """
+    All pairs ``i < j`` (in sorted order, see ``order``) at distance <= ``eps``.
+
+    :return: ``(order, i, j)``: ``order`` sorts the points by cell, and ``i``/``j`` index the sorted points.
+    """
+    n_dimensions = points.shape[1]
+    if n_dimensions > MAX_DIMENSIONS:
+        raise ValueError(f"Grid DBSCAN supports at most {MAX_DIMENSIONS} dimensions, got {n_dimensions}")
+
+    # Cells slightly wider than eps, so float rounding never puts neighbours two cells apart
+    cells = np.floor(points / (eps * (1 + 1e-9))).astype(np.int64)
+    cells -= cells.min(axis=0) - 1  # Offsets of -1 stay in range
+    spans = cells.max(axis=0) + 2
+    if np.sum(np.log2(spans.astype(np.float64))) >= 62:
+        raise ValueError("eps is too small for the grid: cell keys would overflow")
+
+    keys = _cell_keys(cells, spans)
+    order = np.argsort(keys, kind="stable")
+    cell_keys, first, size = np.unique(keys[order], return_index=True, return_counts=True)
+    cell_coords = cells[order][first]
+    columns = np.ascontiguousarray(points[order].T)
+    eps_squared = eps * eps
+
+    pairs_i, pairs_j = [], []
+
+    def keep_close(i, j):
+        squared_distance = np.zeros(len(i))
+        for column in columns:
+            squared_distance += (column[i] - column[j]) ** 2
+        close = squared_distance <= eps_squared
+        pairs_i.append(i[close])
+        pairs_j.append(j[close])
+
+    # Pairs within a cell (i < j)
+    i, j = _expand_pairs(first, size, first, size)
+    keep_close(i[i < j], j[i < j])
+
+    # Pairs between a cell and each of its "forward" neighbours
+    for offset in _half_offsets(n_dimensions):
+        neighbor_keys = _cell_keys(cell_coords + offset, spans)
+        position = np.minimum(np.searchsorted(cell_keys, neighbor_keys), len(cell_keys) - 1)
+        present = np.flatnonzero(cell_keys[position] == neighbor_keys)
+        if len(present):
+            keep_close(*_expand_pairs(first[present], size[present], first[position[present]], size[position[present]]))
+
+    return order, np.concatenate(pairs_i), np.concatenate(pairs_j)
+
+
+class GridDBSCAN:
+    """DBSCAN with the Euclidean metric on a grid hash; mirrors the ``sklearn.cluster.DBSCAN`` interface."""
+
+    def __init__(self, eps=0.5, min_samples=5):
+        self.eps = eps
+        self.min_samples = min_samples
+
+    def fit(self, X, y=None, sample_weight=None):
+        points = np.asarray(X, dtype=np.float64)
+        n = len(points)
+        weights = np.ones(n) if sample_weight is None else np.asarray(sample_weight, dtype=np.float64)
+        if n == 0:
+            self.core_sample_indices_, self.labels_ = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+            return self
+
+        # Identical points share their neighbourhood: each distinct point is processed once,
+        # weighted by its multiplicity and identified by its first occurrence
+        points, first_index, inverse = np.unique(points, axis=0, return_index=True, return_inverse=True)
+        inverse = inverse.ravel()
+        weights = np.bincount(inverse, weights, minlength=len(points))
+        n_unique = len(points)
+
+        order, i, j = neighbor_pairs(points, self.eps)
+        i, j = order[i], order[j]  # Back to distinct point indices
+
+        # Core points: weighted neighbourhood (the point itself included) >= min_samples
+        neighborhood = weights + np.bincount(i, weights[j], minlength=n_unique) + np.bincount(j, weights[i], minlength=n_unique)
+        core = neighborhood >= self.min_samples
+
+        # Clusters are the connected components of core points, numbered like scikit-learn:
+        # in the order of their lowest-index core point
+        core_edges = core[i] & core[j]
+        graph = sparse.csr_matrix((np.ones(core_edges.sum()), (i[core_edges], j[core_edges])),
+                                  shape=(n_unique, n_unique))
+        _, component = connected_components(graph, directed=False)
+        core_index = np.flatnonzero(core)
+        first_core = np.full(n_unique, n)
+        np.minimum.at(first_core, component[core_index], first_index[core_index])
+        rank = np.empty(n_unique, dtype=np.int64)
+        rank[np.argsort(first_core, kind="stable")] = np.arange(n_unique)
+
+        labels = np.full(n_unique, -1, dtype=np.int64)
+        labels[core_index] = rank[component[core_index]]
+
+        # Border points join the lowest-numbered cluster among their core neighbours, the one
+        # scikit-learn's expansion reaches first
+        border = np.full(n_unique, np.iinfo(np.int64).max)
+        for source, target in ((i, j), (j, i)):
+            reach = core[source] & ~core[target]
+            np.minimum.at(border, target[reach], labels[source[reach]])
+        reached = ~core & (border < np.iinfo(np.int64).max)
+        labels[reached] = border[reached]
+
+        self.core_sample_indices_ = np.flatnonzero(core[inverse])
+        self.labels_ = labels[inverse]
+        return self
+
+    def fit_predict(self, X, y=None, sample_weight=None):
+        return self.fit(X, sample_weight=sample_weight).labels_
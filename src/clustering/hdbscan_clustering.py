@@ -1,71 +1,39 @@
 import os
-import json
-import numpy as np
-import pandas as pd
-import hdbscan
-import matplotlib.pyplot as plt
-from sklearn.preprocessing import StandardScaler
-from sklearn.decomposition import PCA
 from collections import Counter
+from src.clustering.cluster_api import FEATURES_PATH, OUTPUT_DIR, cluster, load_features, save_cluster_assignments
+from src.clustering.neighbor_graph import hdbscan_from_graph, load_or_build_neighbor_graph
+from src.clustering.visualization import plot_in_background, save_cluster_plot_data
 
-# Define paths
-features_path = "data/output/features.json"
-output_dir = "data/output/clustering/"
-os.makedirs(output_dir, exist_ok=True)  # Ensure output directory exists
 
-# 📂 Load extracted features from JSON
-with open(features_path, "r") as f:
-    features_data = json.load(f)
+def main(features_path=FEATURES_PATH, output_dir=OUTPUT_DIR, n_neighbors=None, plot=True):
+    os.makedirs(output_dir, exist_ok=True)  # Ensure output directory exists
 
-# 🔄 Convert features to DataFrame
-df = pd.DataFrame.from_dict(features_data, orient="index")
+    # 📂 Load extracted features (normalized on first use)
+    features = load_features(features_path)
 
-# 🏷️ Store mutant names
-mutant_names = df.index.tolist()
+    # 🔍 Apply HDBSCAN clustering (on a persisted kNN graph for large corpora)
+    if n_neighbors is not None:
+        graph_path = os.path.join(output_dir, "neighbor_graph_knn.npz")
+        neighbor_graph = load_or_build_neighbor_graph(features, graph_path, n_neighbors=n_neighbors)
+        cluster_labels = hdbscan_from_graph(neighbor_graph, min_cluster_size=2, min_samples=1)
+    else:
+        cluster_labels, _ = cluster(features, algo="hdbscan", min_cluster_size=2, min_samples=1, metric='euclidean')
 
-# 📊 Normalize features (Standardization)
-scaler = StandardScaler()
-scaled_features = scaler.fit_transform(df)
+    # 💾 Save cluster assignments to JSON
+    output_path = os.path.join(output_dir, "hdbscan_cluster_assignments.json")
+    save_cluster_assignments(cluster_labels, features.mutant_names, output_path)
+    print(f"✅ Cluster assignments saved to {output_path}")
 
-# 🔍 Apply HDBSCAN clustering
-clusterer = hdbscan.HDBSCAN(min_cluster_size=2, min_samples=1, metric='euclidean')
-cluster_labels = clusterer.fit_predict(scaled_features)
+    # 📊 Display cluster summary
+    cluster_counts = Counter(cluster_labels.tolist())
+    print(f"🔢 Cluster distribution: {dict(cluster_counts)}")
 
-# 📌 Store results in a dictionary
-cluster_assignments = {mutant_names[i]: int(cluster_labels[i]) for i in range(len(mutant_names))}
+    # 🎨 Plot is rendered in the background from the saved PCA coordinates
+    if plot:
+        plot_data = save_cluster_plot_data(features.scaled, cluster_labels,
+                                           os.path.join(output_dir, "hdbscan_clustering.npz"), "HDBSCAN Mutant Clustering")
+        plot_in_background(plot_data, os.path.join(output_dir, "hdbscan_clustering.png"))
 
-# 💾 Save cluster assignments to JSON
-output_path = os.path.join(output_dir, "hdbscan_cluster_assignments.json")
-with open(output_path, "w") as f:
-    json.dump(cluster_assignments, f, indent=4)
-print(f"✅ Cluster assignments saved to {output_path}")
 
-# 📊 Display cluster summary
-cluster_counts = Counter(cluster_labels)
-print(f"🔢 Cluster distribution: {dict(cluster_counts)}")
-
-# 📈 Reduce dimensions for visualization using PCA
-pca = PCA(n_components=2)
-reduced_features = pca.fit_transform(scaled_features)
-
-# 🎨 Plot clusters with jittering and transparency
-plt.figure(figsize=(10, 6))
-scatter = plt.scatter(
-    reduced_features[:, 0] + np.random.uniform(-0.05, 0.05, size=len(reduced_features)),
-    reduced_features[:, 1] + np.random.uniform(-0.05, 0.05, size=len(reduced_features)),
-    c=cluster_labels, cmap="tab10", edgecolors="k", alpha=0.6
-)
-plt.xlabel("PCA Component 1")
-plt.ylabel("PCA Component 2")
-plt.title("HDBSCAN Mutant Clustering")
-
-# Add cluster size legend
-cbar = plt.colorbar(scatter)
-cbar.set_label("Cluster ID")
-
-# Save the figure
-output_image_path = os.path.join(output_dir, "hdbscan_clustering.png")
-plt.savefig(output_image_path)
-print(f"📊 Clustering visualization saved to {output_image_path}")
-
-plt.show()
+if __name__ == "__main__":
+    main()
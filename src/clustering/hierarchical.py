@@ -0,0 +1,136 @@
+import os
+import json
+import numpy as np
+from src.clustering.cluster_api import (
+    FEATURES_PATH, OUTPUT_DIR, as_feature_set, features_digest, save_cluster_assignments, summarize_labels
+)
+from src.clustering.neighbor_graph import build_neighbor_graph
+
+TREE_PATH = os.path.join(OUTPUT_DIR, "linkage_tree.npz")
+
+
+class LinkageTree:
+    """
+    Merge tree of an agglomerative clustering, in scikit-learn's ``children_``/``distances_`` layout.
+
+    Merge ``i`` joins the nodes ``children[i]`` into node ``n_leaves + i``. Any number of flat
+    clusterings can be cut from the same tree without refitting.
+    """
+
+    def __init__(self, children, distances):
+        self.children = np.asarray(children, dtype=np.int64)
+        self.distances = np.asarray(distances, dtype=np.float64)
+        self.n_leaves = len(self.children) + 1
+        # Parent of every node; the root is its own parent
+        self.parent = np.arange(2 * self.n_leaves - 1)
+        self.parent[self.children.ravel()] = np.repeat(np.arange(self.n_leaves, 2 * self.n_leaves - 1), 2)
+
+    def cut(self, n_clusters=None, distance_threshold=None):
+        """
+        Flat labels (0..n_clusters-1) of the tree cut into ``n_clusters`` clusters, or at
+        ``distance_threshold`` (clusters merged at a distance >= threshold stay apart,
+        as in ``AgglomerativeClustering(distance_threshold=...)``).
+        """
+        if (n_clusters is None) == (distance_threshold is None):
+            raise ValueError("Exactly one of n_clusters or distance_threshold must be given")
+        if distance_threshold is not None:
+            n_clusters = int(np.sum(self.distances >= distance_threshold)) + 1
+        n_clusters = min(max(n_clusters, 1), self.n_leaves)
+
+        # Undo the last n_clusters - 1 merges, then follow parent pointers (by doubling) to the top
+        first_unmerged = 2 * self.n_leaves - n_clusters
+        ancestor = np.where(self.parent < first_unmerged, self.parent, np.arange(len(self.parent)))
+        while True:
+            next_ancestor = ancestor[ancestor]
+            if np.array_equal(next_ancestor, ancestor):
+                break
+            ancestor = next_ancestor
+        return np.unique(ancestor[:self.n_leaves], return_inverse=True)[1]
+
+    def save(self, tree_path, **meta):
+        os.makedirs(os.path.dirname(tree_path) or ".", exist_ok=True)
+        np.savez(tree_path, children=self.children, distances=self.distances)
+        with open(os.path.splitext(tree_path)[0] + ".json", "w") as f:
+            json.dump(meta, f, indent=4)
+
+    @classmethod
+    def load(cls, tree_path):
+        with np.load(tree_path) as npz:
+            return cls(npz["children"], npz["distances"])
+
+
+def build_linkage_tree(scaled_features, n_neighbors=10, linkage="ward"):
+    """
+    Builds the full merge tree of an agglomerative clustering.
+
+    Merges are restricted to the symmetrized ``n_neighbors``-nearest-neighbour graph, which
+    keeps the cost near-linear in the number of mutants instead of quadratic. If the graph
+    is disconnected, scikit-learn first adds edges between the closest points of its
+    components (with a warning), so the tree still ends in a single root.
+    """
+    from sklearn.cluster import AgglomerativeClustering
+
+    connectivity = build_neighbor_graph(scaled_features, n_neighbors=n_neighbors)
+    model = AgglomerativeClustering(n_clusters=None, distance_threshold=0, compute_full_tree=True,
+                                    linkage=linkage, connectivity=connectivity)
+    model.fit(scaled_features)
+    return LinkageTree(model.children_, model.distances_)
+
+
+def load_or_build_linkage_tree(scaled_features, tree_path=TREE_PATH, n_neighbors=10, linkage="ward"):
+    """
+    Returns the linkage tree of scaled features, reusing the one persisted at ``tree_path``.
+
+    The tree is rebuilt only when the scaled features or the tree parameters changed.
+    """
+    meta = {"digest": features_digest(scaled_features), "n_neighbors": n_neighbors, "linkage": linkage}
+    meta_path = os.path.splitext(tree_path)[0] + ".json"
+
+    if os.path.exists(tree_path) and os.path.exists(meta_path):
+        with open(meta_path, "r") as f:
+            if json.load(f) == meta:
+                return LinkageTree.load(tree_path)
+
+    tree = build_linkage_tree(scaled_features, n_neighbors=n_neighbors, linkage=linkage)
+    tree.save(tree_path, **meta)
+    return tree
+
+
+def mean_centroid_distance(scaled_features, labels):
+    """Mean distance of the mutants to their cluster centroid (lower = more representative clusters)."""
+    counts = np.bincount(labels)
+    centroids = np.stack([np.bincount(labels, weights=column) for column in scaled_features.T], axis=1)
+    centroids /= counts[:, None]
+    return float(np.linalg.norm(scaled_features - centroids[labels], axis=1).mean())
+
+
+def main(features_path=FEATURES_PATH, output_dir=OUTPUT_DIR, n_clusters=15):
+    os.makedirs(output_dir, exist_ok=True)
+
+    # 📂 Load features and the cached merge tree
+    features = as_feature_set(features_path)
+    tree = load_or_build_linkage_tree(features.scaled, os.path.join(output_dir, "linkage_tree.npz"))
+
+    # ✂️ Cut the same tree at many cluster counts
+    cuts = []
+    for k in range(2, min(len(features), 31)):
+        labels = tree.cut(n_clusters=k)
+        cuts.append({"n_clusters": k, "reduction_ratio": summarize_labels(labels)["reduction_ratio"],
+                     "mean_centroid_distance": mean_centroid_distance(features.scaled, labels)})
+
+    cuts_path = os.path.join(output_dir, "agglomerative_cuts.json")
+    with open(cuts_path, "w") as f:
+        json.dump(cuts, f, indent=4)
+    for row in cuts:
+        print(f"k={row['n_clusters']:3d} reduction={row['reduction_ratio']:.1%} "
+              f"mean centroid distance={row['mean_centroid_distance']:.3f}")
+
+    # 💾 Save cluster assignments for the requested cut
+    output_path = os.path.join(output_dir, "agglomerative_cluster_assignments.json")
+    save_cluster_assignments(tree.cut(n_clusters=n_clusters), features.mutant_names, output_path)
+    print(f"📊 Cut summary saved to {cuts_path}")
+    print(f"✅ Cluster assignments saved to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
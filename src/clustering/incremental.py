@@ -0,0 +1,178 @@
+import os
+import json
+import pickle
+import hashlib
+from collections import Counter
+import numpy as np
+from src.clustering.cluster_api import (
+    FEATURES_PATH, OUTPUT_DIR, FeatureSet, as_feature_set, cluster, save_cluster_assignments
+)
+
+MODEL_DIR = os.path.join(OUTPUT_DIR, "model")
+
+# Assignments kept up to date by update_assignments, next to the model they come from
+ASSIGNMENTS_PATH = os.path.join(MODEL_DIR, "cluster_assignments.json")
+
+
+def _nearest_centroid(scaled_features, centroids):
+    """Returns the index of and the distance to the nearest centroid for every row (chunked)."""
+    from sklearn.metrics import pairwise_distances_argmin_min
+
+    return pairwise_distances_argmin_min(scaled_features, centroids)
+
+
+def fit_and_save(features, algo="kmeans", model_dir=MODEL_DIR, **params):
+    """
+    Clusters the full corpus and persists everything needed to assign new mutants later.
+
+    Saved artifacts: the fitted ``StandardScaler``, the k-means centroids (``algo="kmeans"``)
+    or the HDBSCAN model with prediction data (``algo="hdbscan"``), and a ``model.json`` with
+    the feature columns and reference statistics used for drift detection.
+
+    :return: Cluster labels of the corpus.
+    """
+    features = as_feature_set(features)
+    if algo == "hdbscan":
+        params.setdefault("prediction_data", True)
+    labels, model = cluster(features, algo=algo, **params)
+
+    os.makedirs(model_dir, exist_ok=True)
+    with open(os.path.join(model_dir, "scaler.pkl"), "wb") as f:
+        pickle.dump(features.scaler, f)
+
+    meta = {"algo": algo, "params": params, "columns": features.columns, "n_fitted": len(features)}
+    if algo == "kmeans":
+        centroids = model.cluster_centers_
+        np.save(os.path.join(model_dir, "kmeans_centroids.npy"), centroids)
+        _, distances = _nearest_centroid(features.scaled, centroids)
+        meta["mean_centroid_distance"] = float(distances.mean())
+    elif algo == "hdbscan":
+        with open(os.path.join(model_dir, "hdbscan_model.pkl"), "wb") as f:
+            pickle.dump(model, f)
+        meta["noise_share"] = float(np.mean(labels == -1))
+    else:
+        raise ValueError(f"Incremental assignment supports 'kmeans' and 'hdbscan', not '{algo}'")
+
+    with open(os.path.join(model_dir, "model.json"), "w") as f:
+        json.dump(meta, f, indent=4)
+    return labels
+
+
+def assign(new_features, model_dir=MODEL_DIR, drift_threshold=1.5, noise_threshold=0.2):
+    """
+    Assigns new mutants to the persisted clusters without refitting.
+
+    K-means assigns the nearest centroid; HDBSCAN uses ``approximate_predict``. A refit is
+    recommended when the new mutants drift away from the fitted clusters: their mean
+    distance to the nearest centroid exceeds ``drift_threshold`` times the fit-time mean
+    (k-means), or the share of noise points exceeds ``noise_threshold`` (HDBSCAN).
+
+    :param new_features: ``FeatureSet``, features dict or raw (unscaled) matrix of the new mutants.
+    :return: ``(labels, refit_needed, stats)``
+    """
+    with open(os.path.join(model_dir, "model.json"), "r") as f:
+        meta = json.load(f)
+    with open(os.path.join(model_dir, "scaler.pkl"), "rb") as f:
+        scaler = pickle.load(f)
+
+    new_features = as_feature_set(new_features)
+    if set(new_features.columns) == set(meta["columns"]):
+        order = [new_features.columns.index(column) for column in meta["columns"]]
+        matrix = new_features.matrix[:, order]
+    else:
+        matrix = new_features.matrix  # Unnamed columns are assumed to follow the fitted layout
+    scaled = scaler.transform(matrix, copy=True)  # Scalers persisted with copy=False would overwrite the caller's array
+
+    if meta["algo"] == "kmeans":
+        centroids = np.load(os.path.join(model_dir, "kmeans_centroids.npy"))
+        labels, distances = _nearest_centroid(scaled, centroids)
+        drift = float(distances.mean()) / max(meta["mean_centroid_distance"], 1e-12)
+        stats = {"drift": drift}
+        refit_needed = drift > drift_threshold
+    else:
+        import hdbscan as hdbscan_lib
+
+        with open(os.path.join(model_dir, "hdbscan_model.pkl"), "rb") as f:
+            model = pickle.load(f)
+        labels, strengths = hdbscan_lib.approximate_predict(model, scaled)
+        noise_share = float(np.mean(labels == -1))
+        stats = {"noise_share": noise_share, "mean_strength": float(np.mean(strengths))}
+        refit_needed = noise_share > noise_threshold
+
+    return np.asarray(labels), refit_needed, stats
+
+
+def _file_digest(path):
+    """Digest of a file's content (None when it does not exist)."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def _save_and_bind(labels, mutant_names, assignments_path, model_dir):
+    """Saves cluster assignments and records their digest in ``model.json``, binding them to the model."""
+    cluster_assignments = save_cluster_assignments(labels, mutant_names, assignments_path)
+    meta_path = os.path.join(model_dir, "model.json")
+    with open(meta_path, "r") as f:
+        meta = json.load(f)
+    meta["assignments_digest"] = _file_digest(assignments_path)
+    with open(meta_path, "w") as f:
+        json.dump(meta, f, indent=4)
+    return cluster_assignments
+
+
+def update_assignments(features_path=FEATURES_PATH, assignments_path=ASSIGNMENTS_PATH, algo="kmeans",
+                       model_dir=MODEL_DIR, **params):
+    """
+    Brings a cluster assignment file up to date with features.json.
+
+    Only mutants missing from ``assignments_path`` are assigned. The persisted model is used
+    only if it was fitted with ``algo`` and ``assignments_path`` is the file it last wrote
+    (its digest is recorded in ``model.json``), so labels of one fit are never merged into
+    the assignments of another. Otherwise, or when ``assign`` reports drift, the corpus is
+    refitted from scratch and ``assignments_path`` rewritten; a refit reuses the parameters
+    of the persisted fit unless ``params`` overrides them.
+    """
+    features = as_feature_set(features_path)
+
+    cluster_assignments = {}
+    if os.path.exists(assignments_path):
+        with open(assignments_path, "r") as f:
+            cluster_assignments = json.load(f)
+
+    new_rows = [i for i, name in enumerate(features.mutant_names) if name not in cluster_assignments]
+    meta_path = os.path.join(model_dir, "model.json")
+    model_exists = False
+    if os.path.exists(meta_path):
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        digest = _file_digest(assignments_path)
+        model_exists = meta["algo"] == algo and digest is not None and meta.get("assignments_digest") == digest
+        if meta["algo"] == algo:
+            params = {**meta.get("params", {}), **params}
+        if not model_exists:
+            print(f"⚠️ The persisted model was not fitted for {assignments_path}, refitting")
+
+    if model_exists and not new_rows:
+        print("✅ Cluster assignments are up to date")
+        return cluster_assignments
+
+    if model_exists:
+        new_names = [features.mutant_names[i] for i in new_rows]
+        new_features = FeatureSet(features.matrix[new_rows], new_names, features.columns)
+        labels, refit_needed, stats = assign(new_features, model_dir=model_dir)
+        print(f"📌 Assigned {len(new_rows)} new mutants to the persisted clusters ({stats})")
+        if not refit_needed:
+            cluster_assignments.update({name: int(label) for name, label in zip(new_names, labels)})
+            return _save_and_bind(list(cluster_assignments.values()), list(cluster_assignments), assignments_path,
+                                  model_dir)
+        print("🔄 Drift threshold exceeded, refitting the full corpus")
+
+    labels = fit_and_save(features, algo=algo, model_dir=model_dir, **params)
+    print(f"🔢 Cluster distribution: {dict(Counter(labels.tolist()))}")
+    return _save_and_bind(labels, features.mutant_names, assignments_path, model_dir)
+
+
+if __name__ == "__main__":
+    update_assignments()
@@ -0,0 +1,105 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from src.clustering.cluster_api import as_feature_set
+
+
+def knee_point(k_values, inertias):
+    """
+    Detects the elbow of an inertia curve (Kneedle).
+
+    Both axes are normalized to [0, 1]; the knee is the k whose point lies furthest below
+    the straight line joining the first and last points of the curve.
+    """
+    k = np.asarray(k_values, dtype=np.float64)
+    inertia = np.asarray(inertias, dtype=np.float64)
+    if len(k) < 3 or inertia[0] == inertia[-1]:
+        return int(k[0])
+    k_norm = (k - k[0]) / (k[-1] - k[0])
+    inertia_norm = (inertia - inertia[-1]) / (inertia[0] - inertia[-1])
+    return int(k[np.argmax((1 - k_norm) - inertia_norm)])
+
+
+def _fit(scaled_features, k, init, random_state, n_init=1):
+    from sklearn.cluster import KMeans
+
+    if init is None:
+        model = KMeans(n_clusters=k, random_state=random_state, n_init=n_init)
+    else:
+        model = KMeans(n_clusters=k, init=init, n_init=1, random_state=random_state)
+    return model.fit(scaled_features)
+
+
+def _split_init(scaled_features, model):
+    """Warm start for k + 1: the k fitted centroids plus the point furthest from its centroid."""
+    residuals = model.transform(scaled_features)[np.arange(len(scaled_features)), model.labels_]
+    return np.vstack([model.cluster_centers_, scaled_features[np.argmax(residuals)]])
+
+
+def select_k(features, k_values=range(2, 11), sample_size=2000, max_workers=None, random_state=42, n_init=1):
+    """
+    Selects the number of K-Means clusters automatically.
+
+    Candidate k values are fitted in parallel threads over the same read-only matrix, in two
+    waves: every other k is fitted from scratch, then the remaining k values are warm started
+    from the solution for k - 1 (its centroids plus the worst-fitted point). The knee of the
+    inertia curve is detected and, among the knee and its neighbours, the k with the best
+    silhouette (on a sample of at most ``sample_size`` points) is chosen.
+
+    :param features: ``FeatureSet``, features.json path, features dict or raw matrix.
+    :param k_values: Candidate numbers of clusters.
+    :param sample_size: Maximum number of points used for the silhouette score.
+    :param max_workers: Number of threads (defaults to the executor's default).
+    :param random_state: Seed for the fits and the silhouette sample.
+    :param n_init: Initializations of every cold fit (warm starts always use one). The
+                   fitted models are meant to be reused, so raise it when the chosen model
+                   must match a ``KMeans(n_init=10)`` fit on data with less clear structure.
+    :return: Dictionary with the chosen ``k``, the ``knee``, the fitted ``models``, per-k
+             ``inertia`` and ``silhouette`` scores and the elapsed ``seconds``.
+    """
+    from sklearn.metrics import silhouette_score
+
+    start = time.perf_counter()
+    scaled_features = as_feature_set(features).scaled
+    k_values = sorted(k for k in k_values if 2 <= k < len(scaled_features))
+    if not k_values:
+        raise ValueError(f"No candidate k is valid for {len(scaled_features)} mutants")
+
+    models = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # 🔍 Wave 1: cold fits for every other k
+        cold = k_values[::2]
+        for k, model in zip(cold, executor.map(lambda k: _fit(scaled_features, k, None, random_state, n_init), cold)):
+            models[k] = model
+
+        # 🔥 Wave 2: warm starts from the neighbouring solution
+        warm = k_values[1::2]
+        def fit_warm(k):
+            if k - 1 in models:
+                return _fit(scaled_features, k, _split_init(scaled_features, models[k - 1]), random_state)
+            return _fit(scaled_features, k, None, random_state, n_init)
+        for k, model in zip(warm, executor.map(fit_warm, warm)):
+            models[k] = model
+
+        inertia = {k: float(models[k].inertia_) for k in k_values}
+        knee = knee_point(k_values, [inertia[k] for k in k_values])
+
+        # 📊 Sampled silhouette around the knee
+        candidates = [k for k in (knee - 1, knee, knee + 1) if k in models]
+        sample = min(sample_size, len(scaled_features))
+        def score(k):
+            if len(np.unique(models[k].labels_)) < 2:
+                return -1.0
+            return float(silhouette_score(scaled_features, models[k].labels_, sample_size=sample,
+                                          random_state=random_state))
+        silhouette = dict(zip(candidates, executor.map(score, candidates)))
+
+    best_k = max(candidates, key=lambda k: silhouette[k])
+    return {
+        "k": best_k,
+        "knee": knee,
+        "models": models,
+        "inertia": inertia,
+        "silhouette": silhouette,
+        "seconds": time.perf_counter() - start,
+    }
@@ -1,133 +1,76 @@
 import os
-import json
+import csv
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-from sklearn.preprocessing import StandardScaler
-from sklearn.decomposition import PCA
-from sklearn.cluster import KMeans
 from collections import Counter
+from src.clustering.cluster_api import FEATURES_PATH, OUTPUT_DIR, load_features, save_cluster_assignments
+from src.clustering.k_selection import select_k
+from src.clustering.visualization import plot_in_background, save_cluster_plot_data, save_curve_plot_data
 
-# Define paths
-features_path = "data/output/features.json"
-output_dir = "data/output/clustering/"
-os.makedirs(output_dir, exist_ok=True)
-
-# Load extracted features from JSON
-with open(features_path, "r") as f:
-    features_data = json.load(f)
-
-# Convert features to DataFrame
-df = pd.DataFrame.from_dict(features_data, orient="index")
-
-# Store mutant names
-mutant_names = df.index.tolist()
-
-# Normalize features (Standardization)
-scaler = StandardScaler()
-scaled_features = scaler.fit_transform(df)
 
 # Function to find optimal k using elbow method
-def find_optimal_k(data, max_k=10):
-    inertias = []
-    k_values = range(2, max_k + 1)
-    
-    for k in k_values:
-        kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
-        kmeans.fit(data)
-        inertias.append(kmeans.inertia_)
+def find_optimal_k(features, max_k=10, output_dir=OUTPUT_DIR, plot=True):
+    selection = select_k(features, k_values=range(2, max_k + 1))
     
-    # Plot elbow curve
-    plt.figure(figsize=(12, 5))
+    # Elbow curve and sampled silhouette around the knee, rendered in the background
+    if plot:
+        k_values = sorted(selection["inertia"])
+        silhouette_k = sorted(selection["silhouette"])
+        curve_data = save_curve_plot_data([
+            {"x": k_values, "y": [selection["inertia"][k] for k in k_values], "style": 'bx-',
+             "xlabel": 'k', "ylabel": 'Inertia', "title": 'Elbow Method for Optimal k', "vline": selection["knee"]},
+            {"x": silhouette_k, "y": [selection["silhouette"][k] for k in silhouette_k], "style": 'go-',
+             "xlabel": 'k', "ylabel": 'Silhouette', "title": 'Silhouette Around the Knee'},
+        ], os.path.join(output_dir, "elbow_curve.json"))
+        plot_in_background(curve_data, os.path.join(output_dir, "elbow_curve.png"))
     
-    # Inertia plot
-    plt.subplot(1, 2, 1)
-    plt.plot(k_values, inertias, 'bx-')
-    plt.xlabel('k')
-    plt.ylabel('Inertia')
-    plt.title('Elbow Method for Optimal k')
-    
-    
-    # Save the elbow curve
-    plt.savefig(os.path.join(output_dir, "elbow_curve.png"))
-    plt.close()
-    
-    return 5
-
-# Find optimal number of clusters
-optimal_k = find_optimal_k(scaled_features)
-print(f"🔍 Optimal number of clusters (k): {optimal_k}")
-
-# Apply K-means clustering with optimal k
-kmeans = KMeans(n_clusters=optimal_k, random_state=42, n_init=10)
-cluster_labels = kmeans.fit_predict(scaled_features)
+    print(f"⏱️ k selection took {selection['seconds']:.2f}s")
+    return selection
 
-# Store results in a dictionary
-cluster_assignments = {mutant_names[i]: int(cluster_labels[i]) for i in range(len(mutant_names))}
 
-# Save cluster assignments to JSON
-output_path = os.path.join(output_dir, "kmeans_alt_cluster_assignments.json")
-with open(output_path, "w") as f:
-    json.dump(cluster_assignments, f, indent=4)
-print(f"✅ Cluster assignments saved to {output_path}")
+def main(features_path=FEATURES_PATH, output_dir=OUTPUT_DIR, plot=True):
+    os.makedirs(output_dir, exist_ok=True)
 
-# Display cluster summary
-cluster_counts = Counter(cluster_labels)
-print(f"🔢 Cluster distribution: {dict(cluster_counts)}")
+    # Load extracted features (normalized once, reused by every fit)
+    features = load_features(features_path)
 
-# Calculate cluster centers in original feature space
-cluster_centers_scaled = kmeans.cluster_centers_
-cluster_centers_original = scaler.inverse_transform(cluster_centers_scaled)
-cluster_centers_df = pd.DataFrame(
-    cluster_centers_original,
-    columns=df.columns,
-    index=[f"Cluster_{i}" for i in range(optimal_k)]
-)
+    # Find optimal number of clusters
+    selection = find_optimal_k(features, output_dir=output_dir, plot=plot)
+    optimal_k = selection["k"]
+    print(f"🔍 Optimal number of clusters (k): {optimal_k}")
 
-# Save cluster centers to CSV
-centers_output_path = os.path.join(output_dir, "kmeans_cluster_centers.csv")
-cluster_centers_df.to_csv(centers_output_path)
-print(f"📊 Cluster centers saved to {centers_output_path}")
+    # K-means model with optimal k, reused from the selection instead of refitted
+    kmeans = selection["models"][optimal_k]
+    cluster_labels = kmeans.labels_
 
-# Reduce dimensions for visualization using PCA
-pca = PCA(n_components=2)
-reduced_features = pca.fit_transform(scaled_features)
-reduced_centers = pca.transform(cluster_centers_scaled)
+    # Save cluster assignments to JSON
+    output_path = os.path.join(output_dir, "kmeans_alt_cluster_assignments.json")
+    save_cluster_assignments(cluster_labels, features.mutant_names, output_path)
+    print(f"✅ Cluster assignments saved to {output_path}")
 
-# Plot clusters with centers
-plt.figure(figsize=(10, 6))
-scatter = plt.scatter(
-    reduced_features[:, 0],
-    reduced_features[:, 1],
-    c=cluster_labels,
-    cmap="tab10",
-    alpha=0.6,
-    edgecolors="k"
-)
+    # Display cluster summary
+    cluster_counts = Counter(cluster_labels.tolist())
+    print(f"🔢 Cluster distribution: {dict(cluster_counts)}")
 
-# Plot cluster centers
-plt.scatter(
-    reduced_centers[:, 0],
-    reduced_centers[:, 1],
-    c='red',
-    marker='x',
-    s=200,
-    linewidth=3,
-    label='Cluster Centers'
-)
+    # Calculate cluster centers in original feature space
+    cluster_centers_scaled = kmeans.cluster_centers_
+    cluster_centers_original = features.scaler.inverse_transform(cluster_centers_scaled.astype(np.float64))
 
-plt.xlabel("PCA Component 1")
-plt.ylabel("PCA Component 2")
-plt.title("K-means Mutant Clustering")
-plt.legend()
+    # Save cluster centers to CSV
+    centers_output_path = os.path.join(output_dir, "kmeans_cluster_centers.csv")
+    with open(centers_output_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([""] + list(features.columns))
+        for i, center in enumerate(cluster_centers_original):
+            writer.writerow([f"Cluster_{i}"] + center.tolist())
+    print(f"📊 Cluster centers saved to {centers_output_path}")
 
-# Add cluster size legend
-cbar = plt.colorbar(scatter)
-cbar.set_label("Cluster ID")
+    # Plot clusters with centers, rendered in the background from the saved PCA coordinates
+    if plot:
+        plot_data = save_cluster_plot_data(features.scaled, cluster_labels,
+                                           os.path.join(output_dir, "kmeans_clustering_alt.npz"),
+                                           "K-means Mutant Clustering", centers=cluster_centers_scaled)
+        plot_in_background(plot_data, os.path.join(output_dir, "kmeans_clustering_alt.png"))
 
-# Save the figure
-output_image_path = os.path.join(output_dir, "kmeans_clustering_alt.png")
-plt.savefig(output_image_path)
-print(f"📊 Clustering visualization saved to {output_image_path}")
 
-plt.close()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
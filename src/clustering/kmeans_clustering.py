@@ -1,97 +1,57 @@
 import os
-import json
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
-from sklearn.decomposition import PCA
 from collections import Counter
-
-# Define paths
-features_path = "data/output/features.json"
-output_dir = "data/output/clustering/"
-os.makedirs(output_dir, exist_ok=True)  # Ensure output directory exists
-
-# 📂 Load extracted features from JSON
-with open(features_path, "r") as f:
-    features_data = json.load(f)
-
-# 🔄 Convert features to DataFrame
-df = pd.DataFrame.from_dict(features_data, orient="index")
-
-# 🏷️ Store mutant names
-mutant_names = df.index.tolist()
-
-# 📊 Normalize features (Standardization)
-scaler = StandardScaler()
-scaled_features = scaler.fit_transform(df)
-
-inertia = []
-k_range = range(1, 11)  # You can adjust the range as needed
-
-for k in k_range:
-    kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
-    kmeans.fit(scaled_features)
-    inertia.append(kmeans.inertia_)
-
-# 📉 Plot the elbow graph
-plt.figure(figsize=(10, 6))
-plt.plot(k_range, inertia, marker='o')
-plt.xlabel('Number of clusters (K)')
-plt.ylabel('Inertia')
-plt.title('Elbow Method For Optimal K')
-plt.xticks(k_range)
-#plt.grid(True)
-elbow_output_path = os.path.join(output_dir, "elbow_method.png")
-plt.savefig(elbow_output_path)
-print(f"📉 Elbow method graph saved to {elbow_output_path}")
-plt.show()
-
-
-# 🔍 Apply K-Means clustering (initially with 5 clusters)
-n_clusters = 15  # You can adjust the number of clusters as needed
-kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-cluster_labels = kmeans.fit_predict(scaled_features)
-
-
-
-
-# 📌 Store results in a dictionary
-cluster_assignments = {mutant_names[i]: int(cluster_labels[i]) for i in range(len(mutant_names))}
-
-# 💾 Save cluster assignments to JSON
-output_path = os.path.join(output_dir, "kmeans_cluster_assignments.json")
-with open(output_path, "w") as f:
-    json.dump(cluster_assignments, f, indent=4)
-print(f"✅ K-Means cluster assignments saved to {output_path}")
-
-# 📊 Display cluster summary
-cluster_counts = Counter(cluster_labels)
-print(f"🔢 Cluster distribution: {dict(cluster_counts)}")
-
-# 📈 Reduce dimensions for visualization using PCA
-pca = PCA(n_components=2)
-reduced_features = pca.fit_transform(scaled_features)
-
-# 🎨 Plot clusters with jittering and transparency
-plt.figure(figsize=(10, 6))
-scatter = plt.scatter(
-    reduced_features[:, 0] + np.random.uniform(-0.05, 0.05, size=len(reduced_features)),
-    reduced_features[:, 1] + np.random.uniform(-0.05, 0.05, size=len(reduced_features)),
-    c=cluster_labels, cmap="tab10", edgecolors="k", alpha=0.6
-)
-plt.xlabel("PCA Component 1")
-plt.ylabel("PCA Component 2")
-plt.title("K-Means Mutant Clustering")
-
-# Add cluster size legend
-cbar = plt.colorbar(scatter)
-cbar.set_label("Cluster ID")
-
-# Save the figure
-output_image_path = os.path.join(output_dir, "kmeans_clustering.png")
-plt.savefig(output_image_path)
-print(f"📊 Clustering visualization saved to {output_image_path}")
-
-plt.show()
+from src.clustering.cluster_api import FEATURES_PATH, OUTPUT_DIR, cluster, load_features, save_cluster_assignments
+from src.clustering.k_selection import select_k
+from src.clustering.visualization import plot_in_background, save_cluster_plot_data, save_curve_plot_data
+
+
+def save_elbow(selection, output_path):
+    """Saves the inertia (elbow) curve of a ``select_k`` sweep, marking the chosen k."""
+    k_range = sorted(selection["inertia"])
+    return save_curve_plot_data([{
+        "x": k_range,
+        "y": [selection["inertia"][k] for k in k_range],
+        "xlabel": 'Number of clusters (K)',
+        "ylabel": 'Inertia',
+        "title": 'Elbow Method For Optimal K',
+        "vline": selection["k"],
+    }], output_path)
+
+
+def main(features_path=FEATURES_PATH, output_dir=OUTPUT_DIR, n_clusters=None, plot=True):
+    os.makedirs(output_dir, exist_ok=True)  # Ensure output directory exists
+
+    # 📂 Load extracted features (normalized once, reused by every fit)
+    features = load_features(features_path)
+
+    # 🔍 Apply K-Means clustering (k chosen automatically unless given)
+    selection = None
+    if n_clusters is None:
+        selection = select_k(features, k_values=range(2, 16))
+        n_clusters = selection["k"]
+        print(f"🔍 Selected k={n_clusters} (knee at {selection['knee']}) in {selection['seconds']:.2f}s")
+        cluster_labels = selection["models"][n_clusters].labels_
+    else:
+        cluster_labels, _ = cluster(features, algo="kmeans", n_clusters=n_clusters)
+
+    # 💾 Save cluster assignments to JSON
+    output_path = os.path.join(output_dir, "kmeans_cluster_assignments.json")
+    save_cluster_assignments(cluster_labels, features.mutant_names, output_path)
+    print(f"✅ K-Means cluster assignments saved to {output_path}")
+
+    # 📊 Display cluster summary
+    cluster_counts = Counter(cluster_labels.tolist())
+    print(f"🔢 Cluster distribution: {dict(cluster_counts)}")
+
+    # 🎨 Plots are rendered in the background from the saved data
+    if plot:
+        if selection is not None:
+            elbow_data = save_elbow(selection, os.path.join(output_dir, "elbow_method.json"))
+            plot_in_background(elbow_data, os.path.join(output_dir, "elbow_method.png"))
+        plot_data = save_cluster_plot_data(features.scaled, cluster_labels,
+                                           os.path.join(output_dir, "kmeans_clustering.npz"), "K-Means Mutant Clustering")
+        plot_in_background(plot_data, os.path.join(output_dir, "kmeans_clustering.png"))
+
+
+if __name__ == "__main__":
+    main()
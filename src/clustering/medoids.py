@@ -0,0 +1,90 @@
+"""
+Medoid selection with a bounded number of distance evaluations.
+
+The medoid of a cluster is the member with the smallest total distance to all other
+members; unlike the mutant nearest to the centroid, it is always a mutant that actually
+"sits in the middle" of the cluster under the chosen metric. An exact search costs m²
+distances per cluster of m members, so large clusters use correlated sequential halving
+(Baharav & Tse, 2019): every round estimates the candidates' mean distance on a shared
+random sample of reference members and keeps the better half, and the sample grows as
+the candidates shrink.
+"""
+import math
+import numpy as np
+from scipy.spatial.distance import cdist
+
+# Distance evaluations per distinct member and halving round
+EVALUATIONS_PER_POINT = 32
+
+# Rows per block when summing exact distances
+BLOCK_SIZE = 1024
+
+
+def _exact_costs(candidates, points, weights, metric):
+    """Weighted total distance from each candidate to all points, computed block by block."""
+    costs = np.empty(len(candidates))
+    for start in range(0, len(candidates), BLOCK_SIZE):
+        costs[start:start + BLOCK_SIZE] = cdist(candidates[start:start + BLOCK_SIZE], points, metric) @ weights
+    return costs
+
+
+def medoid(vectors, metric="euclidean", max_evaluations=None, random_state=42):
+    """
+    Index of the (approximate) medoid of ``vectors``.
+
+    Identical vectors are collapsed first and weighted by their multiplicity, so the search
+    runs over distinct vectors only. The medoid is exact when all pairwise distances fit in
+    ``max_evaluations``; otherwise correlated sequential halving finds it with at most
+    ``max_evaluations`` distance computations. Every halving round compares each candidate
+    with at least one reference, so budgets below one distance per distinct vector and
+    round are raised to that floor.
+
+    :param vectors: Feature vectors of the cluster members.
+    :param metric: Any ``scipy.spatial.distance.cdist`` metric ("euclidean", "cityblock", ...).
+    :param max_evaluations: Distance budget; defaults to ``EVALUATIONS_PER_POINT`` per
+                            distinct vector and halving round, and never less than one.
+    :param random_state: Seed of the reference samples.
+    :return: Row index in ``vectors`` (the first of identical rows).
+    """
+    points, first_index, counts = np.unique(np.asarray(vectors, dtype=np.float64), axis=0,
+                                            return_index=True, return_counts=True)
+    n_points = len(points)
+    n_rounds = max(1, math.ceil(math.log2(n_points)))
+    if max_evaluations is None:
+        max_evaluations = EVALUATIONS_PER_POINT * n_points * n_rounds
+    max_evaluations = max(max_evaluations, n_points * n_rounds)
+    weights = counts.astype(np.float64)
+
+    candidates = np.arange(n_points)
+    rng = np.random.default_rng(random_state)
+    while len(candidates) > 1:
+        n_references = max_evaluations // n_rounds // len(candidates)
+        if n_references >= n_points:
+            # Few enough candidates left to evaluate them exactly
+            costs = _exact_costs(points[candidates], points, weights, metric)
+            best = candidates[costs == costs.min()]
+            return int(first_index[best].min())
+        references = rng.choice(n_points, size=n_references, p=weights / weights.sum())
+        estimates = cdist(points[candidates], points[references], metric).mean(axis=1)
+        candidates = candidates[np.argsort(estimates, kind="stable")[:math.ceil(len(candidates) / 2)]]
+    return int(first_index[candidates[0]])
+
+
+def cluster_medoids(matrix, labels, metric="euclidean", max_evaluations=None, random_state=42):
+    """
+    Medoid row of every cluster (noise, -1, is skipped).
+
+    Rows are grouped with one stable sort, as in ``representatives.group_clusters``.
+
+    :return: ``{cluster: row index in matrix}``
+    """
+    labels = np.asarray(labels)
+    matrix = np.asarray(matrix)
+    clustered = np.flatnonzero(labels != -1)
+    order = clustered[np.argsort(labels[clustered], kind="stable")]
+    sorted_labels = labels[order]
+    starts = np.flatnonzero(np.r_[True, sorted_labels[1:] != sorted_labels[:-1]]) if len(order) else order
+    medoids = {}
+    for rows in np.split(order, starts[1:]) if len(order) else []:
+        medoids[int(labels[rows[0]])] = int(rows[medoid(matrix[rows], metric, max_evaluations, random_state)])
+    return medoids
@@ -1,60 +1,75 @@
 import os
 import json
 import numpy as np
-import pandas as pd
-from scipy.spatial.distance import euclidean
-
-# Define paths
-cluster_path = "data/output/clustering/kmeans_cluster_assignments.json"
-features_path = "data/output/features.json"
-output_dir = "data/output/clustering/"
-os.makedirs(output_dir, exist_ok=True)
-
-# 📂 Load cluster assignments
-with open(cluster_path, "r") as f:
-    cluster_assignments = json.load(f)
-
-# 📂 Load extracted features
-with open(features_path, "r") as f:
-    features_data = json.load(f)
-
-# 🔄 Convert features to DataFrame
-df = pd.DataFrame.from_dict(features_data, orient="index")
-
-# Group mutants by cluster
-clustered_mutants = {}
-for mutant, cluster in cluster_assignments.items():
-    if cluster != -1:  # Ignore noise
-        clustered_mutants.setdefault(cluster, []).append(mutant)
-
-# 📌 Compute centroids and designate representatives
-representatives = {}
-pruned_mutants = {}  # Mutants removed per cluster
-
-for cluster, mutants in clustered_mutants.items():
-    # Get feature vectors for all mutants in this cluster
-    cluster_vectors = df.loc[mutants].values
-    
-    # Compute centroid as the mean feature vector
-    centroid = np.mean(cluster_vectors, axis=0)
-    
-    # Find the closest mutant to the centroid
-    closest_mutant = min(mutants, key=lambda m: euclidean(df.loc[m].values, centroid))
-    
-    # Assign as representative
-    representatives[cluster] = closest_mutant
-
-    # Store pruned mutants (all except the representative)
-    pruned_mutants[cluster] = [m for m in mutants if m != closest_mutant]
-
-# 💾 Save representative mutants
-rep_output_path = os.path.join(output_dir, "representative_mutants.json")
-with open(rep_output_path, "w") as f:
-    json.dump(representatives, f, indent=4)
-print(f"✅ Representative mutants saved to {rep_output_path}")
-
-# 💾 Save pruned mutants (the ones removed)
-pruned_output_path = os.path.join(output_dir, "pruned_mutants.json")
-with open(pruned_output_path, "w") as f:
-    json.dump(pruned_mutants, f, indent=4)
-print(f"🗑️ Pruned mutants saved to {pruned_output_path}")
+from src.clustering.cluster_api import FEATURES_PATH, OUTPUT_DIR, load_features
+from src.clustering.representatives import RUN_TIMES_PATH, group_clusters, load_run_times, select_representatives
+
+CLUSTER_PATH = "data/output/clustering/kmeans_cluster_assignments.json"
+
+
+def prune_mutants(cluster_assignments, features, strategy="centroid", noise="keep", run_times_path=RUN_TIMES_PATH,
+                  **params):
+    """
+    Keeps the representatives of every cluster and lists the pruned mutants.
+
+    :param cluster_assignments: ``{mutant: cluster}``
+    :param features: ``FeatureSet`` covering (at least) the assigned mutants.
+    :param strategy: Representative selection strategy (see ``representatives.STRATEGIES``).
+    :param noise: Noise handling, "keep", "drop" or "cluster" (see ``select_representatives``).
+    :param run_times_path: Recorded run times, used by the "cheapest" strategy.
+    :return: ``(representatives, pruned_mutants)``, both keyed by cluster in order of first
+             appearance. A cluster's representative is a mutant name, or a list of names
+             when the strategy picks several.
+    """
+    row_index = {mutant: i for i, mutant in enumerate(features.mutant_names)}
+    mutants = np.array(list(cluster_assignments), dtype=object)
+    labels = np.fromiter(cluster_assignments.values(), dtype=np.int64, count=len(mutants))
+    rows = np.fromiter((row_index[m] for m in mutants), dtype=np.int64, count=len(mutants))
+
+    run_times = load_run_times(mutants, run_times_path) if strategy == "cheapest" else None
+    selected = select_representatives(features.matrix[rows], labels, strategy=strategy, noise=noise,
+                                      run_times=run_times, **params)
+
+    order, starts = group_clusters(labels)
+    members = dict(zip(labels[order[starts]].tolist(), np.split(order, starts[1:]))) if len(order) else {}
+    members[-1] = np.flatnonzero(labels == -1)
+
+    representatives = {}
+    pruned_mutants = {}  # Mutants removed per cluster
+    for cluster in dict.fromkeys(labels.tolist()):
+        if cluster not in selected:
+            continue
+        names = mutants[selected[cluster]].tolist()
+        representatives[cluster] = names[0] if len(names) == 1 else names
+        pruned_mutants[cluster] = mutants[np.setdiff1d(members[cluster], selected[cluster])].tolist()
+    return representatives, pruned_mutants
+
+
+def main(cluster_path=CLUSTER_PATH, features_path=FEATURES_PATH, output_dir=OUTPUT_DIR, strategy="centroid"):
+    os.makedirs(output_dir, exist_ok=True)
+
+    # 📂 Load cluster assignments
+    with open(cluster_path, "r") as f:
+        cluster_assignments = json.load(f)
+
+    # 📂 Load extracted features (float32 matrix, rows indexed by mutant name)
+    features = load_features(features_path)
+
+    # 📌 Designate representatives
+    representatives, pruned_mutants = prune_mutants(cluster_assignments, features, strategy=strategy)
+
+    # 💾 Save representative mutants
+    rep_output_path = os.path.join(output_dir, "representative_mutants.json")
+    with open(rep_output_path, "w") as f:
+        json.dump(representatives, f, indent=4)
+    print(f"✅ Representative mutants saved to {rep_output_path}")
+
+    # 💾 Save pruned mutants (the ones removed)
+    pruned_output_path = os.path.join(output_dir, "pruned_mutants.json")
+    with open(pruned_output_path, "w") as f:
+        json.dump(pruned_mutants, f, indent=4)
+    print(f"🗑️ Pruned mutants saved to {pruned_output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import os
+import json
+import numpy as np
+from scipy import sparse
+from src.clustering.cluster_api import OUTPUT_DIR, as_feature_set, features_digest
+
+GRAPH_PATH = os.path.join(OUTPUT_DIR, "neighbor_graph.npz")
+
+# Version of the persisted graph format; graphs saved by another version are rebuilt
+# (version 2: zero distances between duplicates are kept as the smallest positive value)
+GRAPH_FORMAT_VERSION = 2
+
+
+def build_neighbor_graph(scaled_features, radius=None, n_neighbors=None, algorithm="auto"):
+    """
+    Builds a sparse, symmetric neighbour graph whose entries are Euclidean distances.
+
+    Exactly one of ``radius`` (all pairs closer than ``radius``) or ``n_neighbors`` (k nearest
+    neighbours, symmetrized) must be given. Neighbourhoods are found with a KD/ball tree.
+
+    A radius graph gives DBSCAN results identical to the dense computation for any
+    ``eps <= radius``; a kNN graph with ``n_neighbors >= min_samples`` is what HDBSCAN needs.
+    """
+    from sklearn.neighbors import NearestNeighbors
+
+    if (radius is None) == (n_neighbors is None):
+        raise ValueError("Exactly one of radius or n_neighbors must be given")
+
+    if radius is not None:
+        nn = NearestNeighbors(radius=radius, algorithm=algorithm).fit(scaled_features)
+        graph = nn.radius_neighbors_graph(mode="distance")
+    else:
+        n_neighbors = min(n_neighbors, len(scaled_features) - 1)
+        nn = NearestNeighbors(n_neighbors=n_neighbors, algorithm=algorithm).fit(scaled_features)
+        graph = nn.kneighbors_graph(mode="distance")
+    # A 0 distance (duplicate mutants) is stored as the smallest positive value: sparse
+    # operations drop explicit zeros, which would silently disconnect duplicates
+    graph.data[graph.data == 0] = np.finfo(graph.dtype).tiny
+    if n_neighbors is not None:
+        graph = graph.maximum(graph.T)
+    return graph.tocsr()
+
+
+def _covers(stored, meta):
+    """Whether a graph persisted with ``stored`` metadata can serve a request for ``meta``."""
+    if any(stored.get(key) != meta[key] for key in ("version", "digest", "n_neighbors")):
+        return False
+    if meta["radius"] is None:
+        return stored.get("radius") is None
+    return stored.get("radius") is not None and stored["radius"] >= meta["radius"]
+
+
+def load_or_build_neighbor_graph(features, graph_path=GRAPH_PATH, radius=None, n_neighbors=None):
+    """
+    Returns the neighbour graph of a feature set, reusing the one persisted at ``graph_path``.
+
+    A persisted radius graph is reused for any radius up to its own (DBSCAN on it is the same
+    for every ``eps <= radius``), and a kNN graph for the same ``n_neighbors``. The graph is
+    rebuilt, and replaced on disk, only when the (scaled) features or the graph format
+    version changed or a larger radius is asked for, so eps/min_samples/min_cluster_size
+    can be tuned without recomputing any distance.
+    """
+    scaled_features = as_feature_set(features).scaled
+    meta = {"version": GRAPH_FORMAT_VERSION, "digest": features_digest(scaled_features), "radius": radius,
+            "n_neighbors": n_neighbors}
+    meta_path = os.path.splitext(graph_path)[0] + ".json"
+
+    if os.path.exists(graph_path) and os.path.exists(meta_path):
+        with open(meta_path, "r") as f:
+            stored = json.load(f)
+        if _covers(stored, meta):
+            return sparse.load_npz(graph_path)
+
+    graph = build_neighbor_graph(scaled_features, radius=radius, n_neighbors=n_neighbors)
+    os.makedirs(os.path.dirname(graph_path) or ".", exist_ok=True)
+    sparse.save_npz(graph_path, graph)
+    with open(meta_path, "w") as f:
+        json.dump(meta, f, indent=4)
+    return graph
+
+
+def dbscan_from_graph(graph, eps=0.5, min_samples=2):
+    """DBSCAN on a precomputed neighbour graph (pairs missing from the graph count as far apart)."""
+    from sklearn.cluster import DBSCAN
+
+    return DBSCAN(eps=eps, min_samples=min_samples, metric="precomputed").fit_predict(graph)
+
+
+def hdbscan_from_graph(graph, min_cluster_size=2, min_samples=1):
+    """
+    HDBSCAN on a precomputed neighbour graph.
+
+    HDBSCAN needs a connected sparse matrix, so it runs on each connected component of the
+    graph separately; components smaller than ``min_cluster_size`` are noise.
+    """
+    import hdbscan as hdbscan_lib
+    from scipy.sparse.csgraph import connected_components
+
+    graph = graph.tocsr()
+    n_components, component_labels = connected_components(graph, directed=False)
+    labels = np.full(graph.shape[0], -1, dtype=np.int64)
+    next_label = 0
+    for component in range(n_components):
+        members = np.flatnonzero(component_labels == component)
+        if len(members) < min_cluster_size:
+            continue
+        clusterer = hdbscan_lib.HDBSCAN(min_cluster_size=min_cluster_size, min_samples=min_samples, metric="precomputed")
+        component_result = clusterer.fit_predict(graph[members][:, members])
+        clustered = component_result >= 0
+        labels[members[clustered]] = component_result[clustered] + next_label
+        next_label += component_result.max() + 1 if clustered.any() else 0
+    return labels
@@ -0,0 +1,179 @@
+import os
+import json
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from src.clustering.cluster_api import FEATURES_PATH, OUTPUT_DIR, load_features, summarize_labels
+from src.clustering.neighbor_graph import build_neighbor_graph
+
+# Worker-side views on the shared arrays, populated by the pool initializer
+_SHARED = {}
+_SHARED_BLOCKS = []
+
+
+def _to_shared_memory(arrays):
+    """Copies arrays into shared memory blocks; returns the blocks and the specs workers attach to."""
+    blocks, specs = [], {}
+    for key, array in arrays.items():
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        blocks.append(block)
+        specs[key] = (block.name, array.shape, array.dtype.str)
+    return blocks, specs
+
+
+def _attach_shared_memory(specs):
+    for key, (name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=name)
+        _SHARED_BLOCKS.append(block)
+        _SHARED[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def core_distances(graph, max_min_samples):
+    """
+    Distance to the m-th nearest neighbour (the point itself counting as the first) for
+    m = 1..max_min_samples, read from a sparse distance graph. Missing neighbours are inf.
+    """
+    graph = graph.tocsr()
+    rows = np.repeat(np.arange(graph.shape[0]), np.diff(graph.indptr))
+    order = np.lexsort((graph.data, rows))
+    rank = np.arange(len(order)) - graph.indptr[rows[order]] + 1  # +1: the point itself is rank 0
+
+    distances = np.full((graph.shape[0], max_min_samples), np.inf)
+    distances[:, 0] = 0.0
+    keep = rank < max_min_samples
+    distances[rows[order][keep], rank[keep]] = graph.data[order][keep]
+    return distances
+
+
+def _dbscan_summary(eps, min_samples):
+    """DBSCAN statistics for one setting, on the shared graph and core distances."""
+    n = len(_SHARED["indptr"]) - 1
+    within = sparse.csr_matrix((_SHARED["data"] <= eps, _SHARED["indices"], _SHARED["indptr"]), shape=(n, n))
+    within.eliminate_zeros()
+
+    core = _SHARED["core_distances"][:, min_samples - 1] <= eps
+    n_clusters = connected_components(within[core][:, core], directed=False)[0] if core.any() else 0
+    reachable = (within @ core.astype(np.int32)) > 0
+    n_noise = int(np.sum(~core & ~reachable))
+    return {
+        "algo": "dbscan",
+        "eps": eps,
+        "min_samples": min_samples,
+        "n_clusters": int(n_clusters),
+        "noise_share": n_noise / n,
+        "reduction_ratio": 1 - (n_clusters + n_noise) / n,
+    }
+
+
+def _dbscan_block(settings):
+    return [_dbscan_summary(eps, min_samples) for eps, min_samples in settings]
+
+
+def _hdbscan_summaries(min_samples, min_cluster_sizes):
+    """
+    Fits HDBSCAN once for ``min_samples`` and re-condenses its tree for each ``min_cluster_size``.
+
+    Re-condensing relies on hdbscan's internal ``_hdbscan_tree`` module; if a release no longer
+    provides it, every ``min_cluster_size`` is fitted through the public API instead.
+    """
+    import hdbscan as hdbscan_lib
+    try:
+        from hdbscan._hdbscan_tree import condense_tree, compute_stability, get_clusters
+    except ImportError:
+        condense_tree = None
+
+    if condense_tree is not None:
+        clusterer = hdbscan_lib.HDBSCAN(min_cluster_size=min(min_cluster_sizes), min_samples=min_samples)
+        clusterer.fit(_SHARED["features"])
+        single_linkage_tree = clusterer.single_linkage_tree_.to_numpy()
+
+    summaries = []
+    for min_cluster_size in min_cluster_sizes:
+        if condense_tree is not None:
+            condensed_tree = condense_tree(single_linkage_tree, min_cluster_size)
+            labels = get_clusters(condensed_tree, compute_stability(condensed_tree))[0]
+        else:
+            labels = hdbscan_lib.HDBSCAN(min_cluster_size=min_cluster_size,
+                                         min_samples=min_samples).fit_predict(_SHARED["features"])
+        summaries.append({"algo": "hdbscan", "min_samples": min_samples, "min_cluster_size": min_cluster_size,
+                          **summarize_labels(labels)})
+    return summaries
+
+
+def sweep_dbscan(scaled_features, eps_values, min_samples_values, max_workers=None):
+    """
+    Evaluates DBSCAN over a grid of ``eps`` x ``min_samples`` values.
+
+    The radius graph (radius = max eps) and the core distances are computed once and shared
+    with the worker processes; each setting then only thresholds the shared arrays. Cluster
+    counts and noise shares match ``sklearn.cluster.DBSCAN``.
+    """
+    graph = build_neighbor_graph(scaled_features, radius=max(eps_values))
+    arrays = {
+        "data": graph.data,
+        "indices": graph.indices,
+        "indptr": graph.indptr,
+        "core_distances": core_distances(graph, max(min_samples_values)),
+    }
+    settings = list(itertools.product(eps_values, min_samples_values))
+    n_blocks = max_workers or os.cpu_count() or 1
+    blocks = [settings[i::n_blocks] for i in range(n_blocks) if settings[i::n_blocks]]
+
+    shared_blocks, specs = _to_shared_memory(arrays)
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_attach_shared_memory, initargs=(specs,)) as executor:
+            results = [row for block in executor.map(_dbscan_block, blocks) for row in block]
+    finally:
+        for block in shared_blocks:
+            block.close()
+            block.unlink()
+    return sorted(results, key=lambda row: (row["eps"], row["min_samples"]))
+
+
+def sweep_hdbscan(scaled_features, min_samples_values, min_cluster_sizes, max_workers=None):
+    """
+    Evaluates HDBSCAN over a grid of ``min_samples`` x ``min_cluster_size`` values.
+
+    One fit per ``min_samples`` runs in parallel over the shared feature matrix; every
+    ``min_cluster_size`` is then extracted from the same single-linkage tree.
+    """
+    shared_blocks, specs = _to_shared_memory({"features": np.ascontiguousarray(scaled_features)})
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_attach_shared_memory, initargs=(specs,)) as executor:
+            futures = [executor.submit(_hdbscan_summaries, s, sorted(min_cluster_sizes)) for s in min_samples_values]
+            results = [row for future in futures for row in future.result()]
+    finally:
+        for block in shared_blocks:
+            block.close()
+            block.unlink()
+    return results
+
+
+def main(features_path=FEATURES_PATH, output_dir=OUTPUT_DIR):
+    os.makedirs(output_dir, exist_ok=True)
+
+    # 📂 Load and scale features once
+    scaled_features = load_features(features_path).scaled
+
+    # 🔍 Sweep both density algorithms
+    results = sweep_dbscan(scaled_features, eps_values=[0.5, 1.0, 1.5, 2.0, 2.5, 3.0], min_samples_values=[2, 3, 5])
+    results += sweep_hdbscan(scaled_features, min_samples_values=[1, 2, 3], min_cluster_sizes=[2, 3, 5, 10])
+
+    # 💾 Save sweep results
+    output_path = os.path.join(output_dir, "parameter_sweep.json")
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=4)
+
+    for row in results:
+        params = ", ".join(f"{key}={row[key]}" for key in ("eps", "min_samples", "min_cluster_size") if key in row)
+        print(f"{row['algo']:8} {params:35} clusters={row['n_clusters']:4d} "
+              f"noise={row['noise_share']:.1%} reduction={row['reduction_ratio']:.1%}")
+    print(f"✅ Parameter sweep saved to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Strategies for choosing the mutants that represent each cluster.
+
+Every strategy maps a feature matrix and cluster labels to ``{cluster: [rows]}``; select one
+by name with ``select_representatives``::
+
+    from src.clustering.representatives import select_representatives
+
+    representatives = select_representatives(matrix, labels, strategy="medoid")
+    representatives = select_representatives(matrix, labels, strategy="cheapest", run_times=seconds)
+
+Available strategies: "centroid" (mutant nearest to the centroid), "medoid", "kcenter"
+(greedy farthest-point spread), "cheapest" (fastest mutant among the central ones, using
+recorded run times) and "proportional" (a number of spread representatives proportional
+to the cluster size). Noise (label -1) is never silently dropped: see ``select_representatives``.
+"""
+import os
+import json
+import math
+import numpy as np
+from scipy.spatial.distance import cdist
+from src.clustering.medoids import cluster_medoids
+
+# Per-mutant test suite run times in seconds, recorded by mutpy_evaluation
+RUN_TIMES_PATH = "data/output/mutant_run_times.json"
+
+# Registered strategies: name -> function(matrix, labels, run_times, **params) -> {cluster: [rows]}
+STRATEGIES = {}
+
+
+def register_strategy(name):
+    """Decorator registering a representative selection strategy under ``name``."""
+    def decorator(func):
+        STRATEGIES[name] = func
+        return func
+    return decorator
+
+
+def group_clusters(labels):
+    """
+    Groups rows by cluster with one stable sort (noise, -1, excluded).
+
+    :return: ``(order, starts)``: the clustered rows sorted by label (input order within a
+             cluster) and the offset of each cluster in ``order``.
+    """
+    labels = np.asarray(labels)
+    clustered = np.flatnonzero(labels != -1)
+    order = clustered[np.argsort(labels[clustered], kind="stable")]
+    sorted_labels = labels[order]
+    starts = np.flatnonzero(np.r_[True, sorted_labels[1:] != sorted_labels[:-1]]) if len(order) else order
+    return order, starts
+
+
+def centroid_distances(matrix, order, starts, metric="euclidean"):
+    """Distance of every row of ``order`` to its cluster centroid (segment means, one vectorized pass)."""
+    counts = np.diff(np.r_[starts, len(order)])
+    segment = np.repeat(np.arange(len(starts)), counts)
+    vectors = np.asarray(matrix, dtype=np.float64)[order]
+    centroids = np.add.reduceat(vectors, starts, axis=0) / counts[:, None]
+    differences = vectors - centroids[segment]
+    if metric == "cityblock":
+        return np.sum(np.abs(differences), axis=1)
+    return np.sqrt(np.sum(differences ** 2, axis=1))
+
+
+def _k_center(vectors, first, k, metric):
+    """Greedy k-center: starting from ``first``, repeatedly add the member farthest from the chosen ones."""
+    chosen = [first]
+    nearest = cdist(vectors, vectors[[first]], metric)[:, 0]
+    while len(chosen) < min(k, len(vectors)) and nearest.max() > 0:
+        farthest = int(np.argmax(nearest))
+        chosen.append(farthest)
+        nearest = np.minimum(nearest, cdist(vectors, vectors[[farthest]], metric)[:, 0])
+    return chosen
+
+
+@register_strategy("centroid")
+def centroid(matrix, labels, run_times=None, metric="euclidean"):
+    """The mutant nearest to the cluster centroid (the first one on ties), vectorized over all clusters."""
+    labels = np.asarray(labels)
+    order, starts = group_clusters(labels)
+    if len(order) == 0:
+        return {}
+    distances = centroid_distances(matrix, order, starts, metric)
+    segment = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(order)]))
+    # Sorted by cluster, then distance; the stable sort keeps the first row on ties
+    nearest = order[np.lexsort((distances, segment))[starts]]
+    return {int(labels[row]): [int(row)] for row in nearest}
+
+
+@register_strategy("medoid")
+def medoid(matrix, labels, run_times=None, metric="euclidean", max_evaluations=None, random_state=42):
+    """The cluster medoid (approximate for very large clusters, see ``medoids``)."""
+    return {cluster: [row] for cluster, row in
+            cluster_medoids(matrix, labels, metric, max_evaluations, random_state).items()}
+
+
+def _spread(matrix, labels, n_per_cluster, metric):
+    """Greedy k-center representatives of every cluster, ``n_per_cluster(size)`` of them."""
+    labels = np.asarray(labels)
+    matrix = np.asarray(matrix, dtype=np.float64)
+    order, starts = group_clusters(labels)
+    first = centroid(matrix, labels, metric=metric)
+    representatives = {}
+    for members in np.split(order, starts[1:]) if len(order) else []:
+        cluster = int(labels[members[0]])
+        start = int(np.flatnonzero(members == first[cluster][0])[0])
+        chosen = _k_center(matrix[members], start, n_per_cluster(len(members)), metric)
+        representatives[cluster] = members[chosen].tolist()
+    return representatives
+
+
+@register_strategy("kcenter")
+def kcenter(matrix, labels, run_times=None, n_representatives=1, metric="euclidean"):
+    """``n_representatives`` per cluster spread by greedy k-center, starting from the centroid-nearest mutant."""
+    return _spread(matrix, labels, lambda size: n_representatives, metric)
+
+
+@register_strategy("proportional")
+def proportional(matrix, labels, run_times=None, fraction=0.1, metric="euclidean"):
+    """``ceil(fraction * cluster size)`` representatives per cluster, spread by greedy k-center."""
+    return _spread(matrix, labels, lambda size: max(1, math.ceil(fraction * size)), metric)
+
+
+@register_strategy("cheapest")
+def cheapest(matrix, labels, run_times=None, candidate_quantile=0.5, metric="euclidean"):
+    """
+    The fastest mutant to execute among the central members of each cluster.
+
+    Candidates are the members whose distance to the centroid is within the cluster's
+    ``candidate_quantile``; among them, the one with the smallest recorded run time wins.
+    Clusters without any recorded run time fall back to the centroid-nearest mutant.
+
+    :param run_times: Run time of every row (``np.inf`` when unknown).
+    """
+    if run_times is None:
+        raise ValueError("The 'cheapest' strategy needs run_times")
+    run_times = np.asarray(run_times, dtype=np.float64)
+    labels = np.asarray(labels)
+    order, starts = group_clusters(labels)
+    if len(order) == 0:
+        return {}
+    distances = centroid_distances(matrix, order, starts, metric)
+    first = centroid(matrix, labels, metric=metric)
+
+    representatives = {}
+    for members, member_distances in zip(np.split(order, starts[1:]), np.split(distances, starts[1:])):
+        cluster = int(labels[members[0]])
+        candidates = members[member_distances <= np.quantile(member_distances, candidate_quantile)]
+        times = run_times[candidates]
+        representatives[cluster] = [int(candidates[np.argmin(times)])] if np.isfinite(times).any() else first[cluster]
+    return representatives
+
+
+def select_representatives(matrix, labels, strategy="centroid", noise="keep", run_times=None, **params):
+    """
+    Chooses the representatives of every cluster with a registered strategy.
+
+    :param matrix: Feature matrix (one row per mutant).
+    :param labels: Cluster label of every row (-1 marks noise).
+    :param strategy: Name of a registered strategy (see ``STRATEGIES``).
+    :param noise: How noise mutants are handled: "keep" (default) keeps every one of them,
+                  since nothing is known to be redundant with a noise mutant; "drop" ignores
+                  them; "cluster" treats them as one more cluster for the strategy.
+    :param run_times: Run time of every row, used by cost-aware strategies.
+    :param params: Parameters forwarded to the strategy.
+    :return: ``{cluster: [rows]}``; noise representatives are under -1.
+    """
+    try:
+        select = STRATEGIES[strategy]
+    except KeyError:
+        raise ValueError(f"Unknown representative strategy '{strategy}'. Available: {sorted(STRATEGIES)}") from None
+    if noise not in ("keep", "drop", "cluster"):
+        raise ValueError(f"noise must be 'keep', 'drop' or 'cluster', not '{noise}'")
+
+    labels = np.asarray(labels)
+    is_noise = labels == -1
+    if noise == "cluster" and is_noise.any():
+        noise_label = int(labels.max()) + 1
+        representatives = select(matrix, np.where(is_noise, noise_label, labels), run_times, **params)
+        representatives[-1] = representatives.pop(noise_label)
+        return representatives
+
+    representatives = select(matrix, labels, run_times, **params)
+    if noise == "keep" and is_noise.any():
+        representatives[-1] = np.flatnonzero(is_noise).tolist()
+    return representatives
+
+
+def load_run_times(mutant_names, run_times_path=RUN_TIMES_PATH):
+    """Recorded run times aligned with ``mutant_names`` (``np.inf`` when unknown or not recorded yet)."""
+    recorded = {}
+    if os.path.exists(run_times_path):
+        with open(run_times_path, "r") as f:
+            recorded = json.load(f)
+    return np.array([recorded.get(name, np.inf) for name in mutant_names], dtype=np.float64)
+
+
+def representative_names(representatives):
+    """Flattens a saved ``{cluster: mutant or [mutants]}`` mapping into the list of selected mutants."""
+    names = []
+    for selected in representatives.values():
+        names.extend(selected if isinstance(selected, list) else [selected])
+    return names
@@ -0,0 +1,123 @@
+import os
+import json
+import hashlib
+from collections import Counter
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.preprocessing import StandardScaler
+from src.clustering.cluster_api import FEATURES_PATH, OUTPUT_DIR, save_cluster_assignments, save_feature_matrix
+
+MATRIX_PATH = "data/output/features.npy"
+
+# Bytes read at a time when hashing the source features file
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def _file_digest(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def export_feature_matrix(features_path, matrix_path):
+    """
+    Exports ``features_path`` to a memory-mappable ``.npy`` matrix unless an up-to-date one exists.
+
+    The source's mtime and digest are recorded in the matrix's ``_index.json``. The matrix is
+    re-exported when the digest changed; an unchanged mtime skips hashing altogether.
+
+    :return: The mutant names of the matrix rows.
+    """
+    index_path = os.path.splitext(matrix_path)[0] + "_index.json"
+    mtime = os.path.getmtime(features_path)
+    if os.path.exists(matrix_path) and os.path.exists(index_path):
+        with open(index_path, "r") as f:
+            index = json.load(f)
+        source = index.get("source", {})
+        if source.get("mtime") == mtime:
+            return index["mutants"]
+        digest = _file_digest(features_path)
+        if source.get("digest") == digest:
+            index["source"]["mtime"] = mtime
+            with open(index_path, "w") as f:
+                json.dump(index, f, indent=4)
+            return index["mutants"]
+    else:
+        digest = _file_digest(features_path)
+
+    save_feature_matrix(features_path, matrix_path)
+    with open(index_path, "r") as f:
+        index = json.load(f)
+    index["source"] = {"mtime": mtime, "digest": digest}
+    with open(index_path, "w") as f:
+        json.dump(index, f, indent=4)
+    print(f"💾 Feature matrix saved to {matrix_path}")
+    return index["mutants"]
+
+
+def iter_chunks(matrix, chunk_size):
+    """Yields ``(start, chunk)`` slices of a (memory mapped) matrix as float32 arrays."""
+    for start in range(0, len(matrix), chunk_size):
+        yield start, np.asarray(matrix[start:start + chunk_size], dtype=np.float32)
+
+
+def fit_streaming_kmeans(matrix_path, n_clusters=15, chunk_size=10000, n_passes=2, random_state=42):
+    """
+    Fits Mini-Batch K-Means over a ``.npy`` feature matrix without loading it in memory.
+
+    The matrix is memory mapped and read in chunks: one pass fits the scaler, ``n_passes``
+    passes update the model with ``partial_fit``, and a final pass assigns labels. Peak
+    memory is bounded by ``chunk_size`` rows rather than by the size of the corpus.
+
+    :param matrix_path: Path to the ``.npy`` feature matrix (rows = mutants).
+    :param n_clusters: Number of clusters.
+    :param chunk_size: Rows read per chunk (and mini-batch size); must be >= ``n_clusters``.
+    :param n_passes: Number of passes over the data used to update the centroids.
+    :param random_state: Seed of the model.
+    :return: ``(labels, model, scaler)``
+    """
+    matrix = np.load(matrix_path, mmap_mode="r")
+    if chunk_size < n_clusters:
+        raise ValueError(f"chunk_size ({chunk_size}) must be at least n_clusters ({n_clusters})")
+
+    # 📊 Pass 1: standardization statistics
+    scaler = StandardScaler()
+    for _, chunk in iter_chunks(matrix, chunk_size):
+        scaler.partial_fit(chunk)
+
+    # 🔍 Incremental centroid updates
+    model = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state, batch_size=chunk_size, n_init=3)
+    for _ in range(n_passes):
+        for _, chunk in iter_chunks(matrix, chunk_size):
+            model.partial_fit(scaler.transform(chunk))
+
+    # 📌 Final pass: label assignment
+    labels = np.empty(len(matrix), dtype=np.int32)
+    for start, chunk in iter_chunks(matrix, chunk_size):
+        labels[start:start + len(chunk)] = model.predict(scaler.transform(chunk))
+
+    return labels, model, scaler
+
+
+def main(features_path=FEATURES_PATH, matrix_path=MATRIX_PATH, output_dir=OUTPUT_DIR, n_clusters=15):
+    os.makedirs(output_dir, exist_ok=True)
+
+    # 📂 Export features.json to a memory-mappable matrix, again whenever it changes
+    mutant_names = export_feature_matrix(features_path, matrix_path)
+
+    cluster_labels, _, _ = fit_streaming_kmeans(matrix_path, n_clusters=n_clusters)
+
+    # 💾 Save cluster assignments to JSON
+    output_path = os.path.join(output_dir, "minibatch_kmeans_cluster_assignments.json")
+    save_cluster_assignments(cluster_labels, mutant_names, output_path)
+    print(f"✅ Mini-Batch K-Means cluster assignments saved to {output_path}")
+
+    # 📊 Display cluster summary
+    cluster_counts = Counter(cluster_labels.tolist())
+    print(f"🔢 Cluster distribution: {dict(cluster_counts)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Deferred, headless plotting of clustering results.
+
+Clustering scripts only save the data needed for a plot (scaled features and labels, or
+curve points) and hand it to ``plot_in_background``, which projects and renders it in a
+separate process with the non-interactive Agg backend. Neither the PCA projection nor
+Matplotlib runs in the clustering process, and nothing waits for a GUI window.
+
+Plots can also be rendered (or re-rendered) later from the saved data::
+
+    python -m src.clustering.visualization data/output/clustering/kmeans_clustering.npz kmeans_clustering.png
+"""
+import os
+import sys
+import json
+import subprocess
+import numpy as np
+
+# Above this many points, scatter plots are replaced by hexbin density plots
+HEXBIN_THRESHOLD = 50000
+
+# Repository root, so the renderer can be started with ``-m`` from any working directory
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Renderer processes started by plot_in_background that have not been reaped yet
+_renderers = []
+
+
+def save_cluster_plot_data(scaled_features, labels, output_path, title, centers=None, dpi=100):
+    """
+    Saves scaled features and their labels for a cluster plot; the PCA projection is left to the renderer.
+
+    :param centers: Optional cluster centers (in scaled space), projected with the same PCA.
+    :return: ``output_path``
+    """
+    data = {"features": np.asarray(scaled_features, dtype=np.float32), "labels": np.asarray(labels),
+            "title": title, "dpi": dpi}
+    if centers is not None:
+        data["centers"] = np.asarray(centers, dtype=np.float32)
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    np.savez(output_path, **data)
+    return output_path
+
+
+def project_plot_data(data):
+    """
+    Projects saved cluster plot data on its first two PCA components, in place.
+
+    Replaces ``features`` with 2D ``coords`` and projects ``centers`` with the same PCA.
+    Data saved already projected (``coords``) is left as is.
+    """
+    if "coords" in data:
+        return data
+    from sklearn.decomposition import PCA
+
+    features = data.pop("features")
+    pca = PCA(n_components=2, svd_solver="randomized" if len(features) > HEXBIN_THRESHOLD else "auto",
+              random_state=42)
+    data["coords"] = pca.fit_transform(features).astype(np.float32)
+    if "centers" in data:
+        data["centers"] = pca.transform(data["centers"]).astype(np.float32)
+    return data
+
+
+def save_curve_plot_data(panels, output_path):
+    """
+    Saves line plots (e.g. elbow curves) as JSON.
+
+    :param panels: List of dicts with ``x``, ``y``, ``xlabel``, ``ylabel``, ``title`` and
+                   optionally ``style`` (matplotlib format string) and ``vline`` (x position).
+    :return: ``output_path``
+    """
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with open(output_path, "w") as f:
+        json.dump({"panels": panels}, f, indent=4)
+    return output_path
+
+
+def _render_clusters(plt, data):
+    coords, labels = data["coords"], data["labels"]
+    plt.figure(figsize=(10, 6))
+    if len(coords) > HEXBIN_THRESHOLD:
+        # Density rendering: millions of scatter points are slow and unreadable
+        hexbin = plt.hexbin(coords[:, 0], coords[:, 1], gridsize=200, bins="log", cmap="viridis", mincnt=1)
+        plt.colorbar(hexbin).set_label("Mutants (log)")
+    else:
+        # Add jitter to prevent overlapping
+        jittered = coords + np.random.uniform(-0.05, 0.05, size=coords.shape)
+        scatter = plt.scatter(jittered[:, 0], jittered[:, 1], c=labels, cmap="tab10", edgecolors="k", alpha=0.6)
+        plt.colorbar(scatter).set_label("Cluster ID")
+    if "centers" in data:
+        centers = data["centers"]
+        plt.scatter(centers[:, 0], centers[:, 1], c='red', marker='x', s=200, linewidth=3, label='Cluster Centers')
+        plt.legend()
+    plt.xlabel("PCA Component 1")
+    plt.ylabel("PCA Component 2")
+    plt.title(str(data["title"]))
+
+
+def _render_curves(plt, panels):
+    plt.figure(figsize=(6 * len(panels) if len(panels) > 1 else 10, 5 if len(panels) > 1 else 6))
+    for i, panel in enumerate(panels, start=1):
+        plt.subplot(1, len(panels), i)
+        plt.plot(panel["x"], panel["y"], panel.get("style", "o-"))
+        if panel.get("vline") is not None:
+            plt.axvline(panel["vline"], color='gray', linestyle='--')
+        plt.xlabel(panel["xlabel"])
+        plt.ylabel(panel["ylabel"])
+        plt.title(panel["title"])
+
+
+def render_plot(data_path, image_path):
+    """Renders saved plot data (``.npz`` cluster plot or ``.json`` curves) to an image, headless."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    dpi = None
+    if data_path.endswith(".json"):
+        with open(data_path, "r") as f:
+            _render_curves(plt, json.load(f)["panels"])
+    else:
+        with np.load(data_path) as npz:
+            data = {key: npz[key] for key in npz.files}
+        _render_clusters(plt, project_plot_data(data))
+        dpi = int(data["dpi"])
+
+    plt.savefig(image_path, dpi=dpi, bbox_inches='tight')
+    plt.close()
+    print(f"📊 Visualization saved to {image_path}")
+
+
+def reap_renderers(wait=False):
+    """
+    Reaps the renderer processes that have exited, so they do not linger as zombies.
+
+    :param wait: Wait for every running renderer first.
+    :return: The renderers still running.
+    """
+    for process in list(_renderers):
+        if wait:
+            process.wait()
+        if process.poll() is not None:
+            _renderers.remove(process)
+    return list(_renderers)
+
+
+def plot_in_background(data_path, image_path):
+    """
+    Starts rendering in a detached process and returns immediately (the ``Popen`` handle).
+
+    The renderer runs in its own session, so it survives an interrupt of the clustering
+    script; finished renderers are reaped on the next call (or with ``reap_renderers``).
+    """
+    reap_renderers()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "src.clustering.visualization", os.path.abspath(data_path), os.path.abspath(image_path)],
+        cwd=PROJECT_ROOT,
+        start_new_session=True,
+    )
+    _renderers.append(process)
+    return process
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("Usage: python -m src.clustering.visualization <plot_data.npz|.json> <image.png>")
+    render_plot(sys.argv[1], sys.argv[2])
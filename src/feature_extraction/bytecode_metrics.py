@@ -0,0 +1,99 @@
+import os
+import json
+import dis
+from collections import Counter
+import numpy as np
+
+# Opcodes whose argument is the operator itself, so e.g. ``>`` and ``<`` get separate columns
+OPERATOR_OPCODES = {"COMPARE_OP", "BINARY_OP"}
+
+# Opcodes whose argument only says whether the operator is negated: operator for arg 0 and arg 1
+NEGATABLE_OPCODES = {"IS_OP": ("is", "is not"), "CONTAINS_OP": ("in", "not in")}
+
+UINT16_MAX = np.iinfo(np.uint16).max
+
+
+def iter_code_objects(code, qualname="<module>"):
+    """Yields ``(qualified_name, code_object)`` for a code object and all nested ones."""
+    yield qualname, code
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            nested = const.co_name if qualname == "<module>" else f"{qualname}.{const.co_name}"
+            yield from iter_code_objects(const, nested)
+
+
+def extract_bytecode_metrics(file_path):
+    """
+    Compiles a mutant and counts its opcodes and per-function code sizes.
+
+    Compilation applies constant folding, so trivially equivalent mutants compile to the
+    same bytecode, and comparison/arithmetic operators show up as explicit columns.
+    """
+    with open(file_path, "r") as file:
+        code = compile(file.read(), file_path, "exec")
+
+    counts = Counter()
+    for name, code_object in iter_code_objects(code):
+        # Qualnames repeat (lambdas, comprehensions, same-named nested functions): sum their sizes
+        counts[f"size:{name}"] += len(code_object.co_code)
+        for instruction in dis.get_instructions(code_object):
+            counts[instruction.opname] += 1
+            if instruction.opname in OPERATOR_OPCODES:
+                counts[f"{instruction.opname}:{instruction.argrepr}"] += 1
+            elif instruction.opname in NEGATABLE_OPCODES:
+                counts[f"{instruction.opname}:{NEGATABLE_OPCODES[instruction.opname][instruction.arg]}"] += 1
+    return counts
+
+
+def build_feature_matrix(mutant_paths):
+    """
+    Builds the dense opcode-histogram matrix for a set of mutants.
+
+    :param mutant_paths: Paths of the mutant files.
+    :return: ``(matrix, mutant_names, columns)`` where ``matrix`` is ``uint16`` (counts are
+             clipped at 65535) with one row per mutant and one column per feature. Mutants
+             that do not compile are skipped (and reported).
+    """
+    rows = []
+    compiled_paths = []
+    for path in mutant_paths:
+        try:
+            rows.append(extract_bytecode_metrics(path))
+        except (SyntaxError, ValueError) as e:
+            print(f"⚠️ Skipping {os.path.basename(path)}: {e}")
+            continue
+        compiled_paths.append(path)
+    columns = sorted(set().union(*rows))
+    column_index = {column: j for j, column in enumerate(columns)}
+
+    matrix = np.zeros((len(rows), len(columns)), dtype=np.uint16)
+    for i, counts in enumerate(rows):
+        for column, count in counts.items():
+            matrix[i, column_index[column]] = min(count, UINT16_MAX)
+
+    mutant_names = [os.path.basename(path) for path in compiled_paths]
+    return matrix, mutant_names, columns
+
+
+def process_all_mutants(mutants_dir, output_file):
+    """Extracts bytecode features for all mutants and saves the matrix with its row/column index."""
+    mutant_paths = sorted(
+        os.path.join(mutants_dir, filename)
+        for filename in os.listdir(mutants_dir)
+        if filename.endswith(".py")
+    )
+    matrix, mutant_names, columns = build_feature_matrix(mutant_paths)
+
+    np.save(output_file, matrix)
+    index_file = os.path.splitext(output_file)[0] + "_index.json"
+    with open(index_file, "w") as f:
+        json.dump({"mutants": mutant_names, "columns": columns}, f, indent=4)
+
+    print(f"🚀 Bytecode features {matrix.shape} saved to {output_file} (index in {index_file})")
+
+
+if __name__ == "__main__":
+    mutants_dir = "data/output/mutants/"  # Directory where mutants are stored
+    output_file = "data/output/bytecode_features.npy"  # Dense uint16 opcode histogram matrix
+
+    process_all_mutants(mutants_dir, output_file)
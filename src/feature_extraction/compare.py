@@ -1,8 +1,18 @@
 import filecmp
 import difflib
+import hashlib
+import ast
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import os
 
+import astor
+
+# Tokens used to normalize replacement lines in diff signatures
+_TOKEN_RE = re.compile(r"\w+|\S")
+
 def compare_files(file1_path: str, file2_path: str, show_differences: bool = True) -> bool:
     """
     Compare two files and optionally show their differences.
@@ -39,36 +49,154 @@ def compare_files(file1_path: str, file2_path: str, show_differences: bool = Tru
         differ = difflib.Differ()
         diff = list(differ.compare(file1_lines, file2_lines))
         
-        if show_diff:
-            # Print differences
-            print("\nDifferences found:")
-            print("Legend: '+' new line, '-' deleted line, '?' modified line\n")
-            for line in diff:
-                if line.startswith(('+ ', '- ', '? ')):
-                    print(line.rstrip())
+        # Print differences
+        print("\nDifferences found:")
+        print("Legend: '+' new line, '-' deleted line, '?' modified line\n")
+        for line in diff:
+            if line.startswith(('+ ', '- ', '? ')):
+                print(line.rstrip())
     
     return are_identical
 
-if __name__ == '__main__':
-    
-    global show_diff
-    show_diff = False
+def canonical_lines(source: str) -> list:
+    """
+    Return the source as canonical lines so that the original and mutants line up.
+
+    Mutants are written with ``astor.to_source``, so the original target is passed
+    through the same round trip. Sources that fail to parse are used verbatim.
+    """
+    try:
+        source = astor.to_source(ast.parse(source))
+    except SyntaxError:
+        pass
+    return source.splitlines()
+
+def diff_signature(original_lines: list, mutant_lines: list) -> tuple:
+    """
+    Compute the canonical hunk signature of a mutant against the original.
+
+    Args:
+        original_lines: Canonical lines of the original target
+        mutant_lines: Canonical lines of the mutant
 
-    directory = './data/output/mutants' 
+    Returns:
+        tuple: One ``(start, end, tokens)`` entry per changed hunk, where ``start:end``
+        is the 0-based, half-open line range replaced in the original and ``tokens``
+        are the normalized tokens of the replacement lines
+    """
+    matcher = difflib.SequenceMatcher(None, original_lines, mutant_lines, autojunk=False)
+    signature = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        tokens = tokenize(mutant_lines[j1:j2])
+        signature.append((i1, i2, tokens))
+    return tuple(signature)
+
+def tokenize(lines: list) -> tuple:
+    """Return the normalized tokens (identifiers, numbers and single symbols) of source lines."""
+    return tuple(_TOKEN_RE.findall(" ".join(lines)))
+
+def signature_key(signature: tuple) -> str:
+    """Return a short, stable hash of a diff signature (usable as a blocking key)."""
+    return hashlib.blake2b(repr(signature).encode(), digest_size=8).hexdigest()
+
+def group_by_diff_signature(original_path: str, mutant_paths: list) -> tuple:
+    """
+    Diff every mutant against the original once and group them by hunk signature.
+
+    Args:
+        original_path: Path to the original (unmutated) target file
+        mutant_paths: Paths to the mutant files
+
+    Returns:
+        tuple: ``(signature_groups, line_families)``. ``signature_groups`` maps a
+        signature key to the mutants sharing that exact diff (duplicates when a group
+        has more than one member). ``line_families`` maps the changed line ranges
+        (e.g. ``"11:12"``) to the mutants touching exactly those lines.
+    """
+    with open(original_path, 'r') as f:
+        original_lines = canonical_lines(f.read())
 
+    signature_groups = defaultdict(list)
+    line_families = defaultdict(list)
+    for mutant_path in mutant_paths:
+        with open(mutant_path, 'r') as f:
+            mutant_lines = canonical_lines(f.read())
+
+        signature = diff_signature(original_lines, mutant_lines)
+        name = Path(mutant_path).name
+        signature_groups[signature_key(signature)].append(name)
+        lines = ",".join(f"{start}:{end}" for start, end, _ in signature) or "unchanged"
+        line_families[lines].append(name)
+
+    return dict(signature_groups), dict(line_families)
+
+def file_digests(file_path: str) -> tuple:
+    """
+    Stream a file once and hash both its raw bytes and its whitespace-normalized lines.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        tuple: ``(raw_digest, normalized_digest)``
+    """
+    raw = hashlib.blake2b(digest_size=16)
+    normalized = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for line in f:
+            raw.update(line)
+            tokens = line.split()
+            if tokens:  # Blank lines do not count as differences
+                normalized.update(b" ".join(tokens) + b"\n")
+    return raw.hexdigest(), normalized.hexdigest()
+
+def group_identical(paths: list, max_workers: int = None) -> tuple:
+    """
+    Group byte-identical and whitespace-normalized-identical files.
+
+    Each file is read exactly once; hashing runs in a thread pool since the work is
+    dominated by file I/O.
+
+    Args:
+        paths: Paths to the files to group
+        max_workers: Size of the thread pool (defaults to the executor's default)
+
+    Returns:
+        tuple: ``(identical_groups, normalized_groups)``, each a list of groups (lists
+        of paths, in input order) with more than one member
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        digests = list(executor.map(file_digests, paths))
+
+    identical = defaultdict(list)
+    normalized = defaultdict(list)
+    for path, (raw_digest, normalized_digest) in zip(paths, digests):
+        identical[raw_digest].append(path)
+        normalized[normalized_digest].append(path)
+
+    identical_groups = [group for group in identical.values() if len(group) > 1]
+    normalized_groups = [group for group in normalized.values() if len(group) > 1]
+    return identical_groups, normalized_groups
+
+if __name__ == '__main__':
+    directory = './data/output/mutants'
+    target_file = './src/fsm_modeling/flight_booking_fsm.py'
 
-    for i in range(0, 30):
-        file2 = os.path.join(directory, f"mutant_{i}.py")
+    mutant_paths = sorted(
+        os.path.join(directory, filename)
+        for filename in os.listdir(directory)
+        if filename.endswith(".py")
+    )
 
-        try:
+    # Tier 1: exact duplicates by file digest
+    identical_groups, normalized_groups = group_identical(mutant_paths)
+    print(f"🔍 {len(identical_groups)} byte-identical groups, "
+          f"{len(normalized_groups)} whitespace-normalized groups")
+    for group in normalized_groups:
+        print("  " + ", ".join(Path(p).name for p in group))
 
-            file1 = "./data/output/mutants/mutant_39.py"
-            
-            result = compare_files(file1, file2)
-            if result:
-                print("Files are identical")
-            else:
-                print("Files are different")
-                
-        except Exception as e:
-            print(f"Error: {e}")
\ No newline at end of file
+    # Tier 2: diff signatures against the original target
+    signature_groups, line_families = group_by_diff_signature(target_file, mutant_paths)
+    print(f"🔍 {len(signature_groups)} diff signatures, {len(line_families)} line families")
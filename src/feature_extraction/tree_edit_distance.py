@@ -0,0 +1,299 @@
+import ast
+import os
+import json
+import hashlib
+from itertools import chain, islice
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import numpy as np
+
+# Per-process trees, populated by the pool initializer
+_TREES = None
+
+
+def node_label(node):
+    """Returns the label of an AST node (its type plus the identifier or constant it carries)."""
+    label = type(node).__name__
+    if isinstance(node, ast.Name):
+        return f"{label}:{node.id}"
+    if isinstance(node, ast.Attribute):
+        return f"{label}:{node.attr}"
+    if isinstance(node, ast.Constant):
+        return f"{label}:{node.value!r}"
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return f"{label}:{node.name}"
+    if isinstance(node, ast.arg):
+        return f"{label}:{node.arg}"
+    return label
+
+
+def _children(node):
+    """AST children, skipping Load/Store/Del contexts which carry no structure."""
+    return [child for child in ast.iter_child_nodes(node) if not isinstance(child, ast.expr_context)]
+
+
+def _build_tree(root, units, prefix):
+    """Post-order arrays for ``root``; nested functions become leaves and are added to ``units``."""
+    labels, leftmost = [], []
+
+    def walk(node, qualname):
+        first = None
+        for child in _children(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                _build_tree(child, units, f"{qualname}{child.name}.")
+                labels.append(node_label(child))
+                leftmost.append(len(labels) - 1)
+                index = len(labels) - 1
+            else:
+                child_name = f"{qualname}{child.name}." if isinstance(child, ast.ClassDef) else qualname
+                index = walk(child, child_name)
+            if first is None:
+                first = leftmost[index]
+        labels.append(node_label(node))
+        leftmost.append(first if first is not None else len(labels) - 1)
+        return len(labels) - 1
+
+    walk(root, prefix)
+    # A keyroot is the highest node sharing a given leftmost leaf
+    keyroots = sorted({leaf: i for i, leaf in enumerate(leftmost)}.values())
+    # Redefinitions (e.g. property setters) share a qualified name: number the later ones
+    name = key = prefix.rstrip(".") or "<module>"
+    ordinal = 1
+    while key in units:
+        ordinal += 1
+        key = f"{name}#{ordinal}"
+    units[key] = (labels, leftmost, keyroots)
+
+
+def build_tree(source):
+    """
+    Converts source code to the post-order trees used by Zhang-Shasha.
+
+    The module is split into one tree per function (keyed by qualified name, e.g.
+    ``FlightBookingFSM.transition``; a redefinition such as a property setter gets an ordinal
+    suffix, ``Booking.state#2``) plus a ``<module>`` skeleton where function bodies are
+    collapsed to a single leaf. Each tree is a tuple ``(labels, leftmost, keyroots)``: the
+    node labels in post-order, the index of each node's leftmost leaf descendant, and the
+    keyroot indices.
+    """
+    units = {}
+    _build_tree(ast.parse(source), units, "")
+    return units
+
+
+def lower_bound(tree1, tree2):
+    """
+    Cheap lower bound on the unit-cost edit distance between two single trees.
+
+    Every edit changes the size by at most one and the label histogram (L1) by at most two.
+    """
+    labels1, labels2 = tree1[0], tree2[0]
+    histogram = Counter(labels1)
+    histogram.subtract(labels2)
+    label_bound = (sum(abs(v) for v in histogram.values()) + 1) // 2
+    return max(abs(len(labels1) - len(labels2)), label_bound)
+
+
+def zhang_shasha(tree1, tree2):
+    """Computes the unit-cost tree edit distance between two trees built with ``build_tree``."""
+    labels1, leftmost1, keyroots1 = tree1
+    labels2, leftmost2, keyroots2 = tree2
+    treedist = [[0] * len(labels2) for _ in range(len(labels1))]
+
+    for i in keyroots1:
+        for j in keyroots2:
+            li, lj = leftmost1[i], leftmost2[j]
+            rows, cols = i - li + 2, j - lj + 2
+            forest = [[0] * cols for _ in range(rows)]
+            for x in range(1, rows):
+                forest[x][0] = x
+            for y in range(1, cols):
+                forest[0][y] = y
+
+            for x in range(1, rows):
+                ni = li + x - 1
+                row, prev = forest[x], forest[x - 1]
+                for y in range(1, cols):
+                    nj = lj + y - 1
+                    if leftmost1[ni] == li and leftmost2[nj] == lj:
+                        cost = 0 if labels1[ni] == labels2[nj] else 1
+                        row[y] = min(prev[y] + 1, row[y - 1] + 1, prev[y - 1] + cost)
+                        treedist[ni][nj] = row[y]
+                    else:
+                        p, q = leftmost1[ni] - li, leftmost2[nj] - lj
+                        row[y] = min(prev[y] + 1, row[y - 1] + 1, forest[p][q] + treedist[ni][nj])
+
+    return treedist[-1][-1]
+
+
+def tree_distance(units1, units2, cutoff=None):
+    """
+    Tree edit distance between two modules built with ``build_tree``.
+
+    Functions are matched by qualified name and their distances summed; a function present
+    on one side only costs its size. Mutation operators never move code across functions,
+    so restricting edit mappings to matching functions loses nothing for mutants while
+    avoiding the blow-up of running Zhang-Shasha on the whole module. If ``cutoff`` is given and the
+    lower bound already exceeds it, the lower bound is returned instead of the exact value.
+    """
+    distance, pending = 0, []
+    for name in units1.keys() | units2.keys():
+        tree1, tree2 = units1.get(name), units2.get(name)
+        if tree1 is None or tree2 is None:
+            distance += len((tree1 or tree2)[0])
+        elif tree1[0] != tree2[0]:
+            pending.append((tree1, tree2))
+
+    bound = distance + sum(lower_bound(tree1, tree2) for tree1, tree2 in pending)
+    if cutoff is not None and bound > cutoff:
+        return bound
+    return distance + sum(zhang_shasha(tree1, tree2) for tree1, tree2 in pending)
+
+
+def condensed_index(i, j, n):
+    """Position of pair (i, j), i < j, in a condensed distance vector (scipy ordering)."""
+    return n * i - i * (i + 1) // 2 + (j - i - 1)
+
+
+def _init_worker(sources):
+    global _TREES
+    _TREES = [build_tree(source) for source in sources]
+
+
+def _compute_block(args):
+    pairs, cutoff = args
+    return [tree_distance(_TREES[i], _TREES[j], cutoff) for i, j in pairs]
+
+
+def _pending_pairs(codes, positions, cached, cached_n, distances):
+    """
+    Yields the pairs left to compute, row by row, filling ``distances`` with cached pairs on the way.
+
+    :param codes: Content id of each mutant; pairs with equal ids are skipped (distance 0).
+    :param positions: Row of each mutant in the cached matrix, or -1.
+    """
+    n = len(codes)
+    for i in range(n - 1):
+        js = np.arange(i + 1, n)
+        new = codes[js] != codes[i]
+        if positions[i] >= 0:
+            hit = new & (positions[js] >= 0)
+            a = np.minimum(positions[i], positions[js[hit]])
+            b = np.maximum(positions[i], positions[js[hit]])
+            distances[condensed_index(i, js[hit], n)] = cached[condensed_index(a, b, cached_n)]
+            new &= ~hit
+        for j in js[new].tolist():
+            yield i, j
+
+
+def _store_block(distances, block, results, n):
+    """Writes the distances of a computed block into the condensed matrix; returns the number of pairs."""
+    for (i, j), distance in zip(block, results):
+        distances[condensed_index(i, j, n)] = distance
+    return len(block)
+
+
+def _content_hash(source):
+    return hashlib.blake2b(source.encode(), digest_size=16).hexdigest()
+
+
+def compute_distance_matrix(mutant_paths, output_path, cutoff=None, block_size=256, max_workers=None):
+    """
+    Computes (or updates) the condensed AST tree-edit-distance matrix of a set of mutants.
+
+    The matrix is stored as a ``.npy`` file next to a JSON index holding the cutoff and, for
+    each row, the mutant name and its content hash. On reruns with the same cutoff, distances
+    between mutants whose content hash is already in the stored index are copied over, so
+    only new pairs are computed. A different cutoff recomputes every pair, since pruned
+    entries are lower bounds that depend on it.
+
+    :param mutant_paths: Paths of the mutant files.
+    :param output_path: Path of the condensed ``.npy`` matrix to write.
+    :param cutoff: Optional distance cutoff used for lower-bound pruning.
+    :param block_size: Number of pairs per task sent to the process pool. Blocks are
+                       generated lazily, a few per worker ahead of the results.
+    :param max_workers: Size of the process pool.
+    :return: The condensed distance matrix, memory mapped from ``output_path``.
+    """
+    sources = []
+    for path in mutant_paths:
+        with open(path, "r") as f:
+            sources.append(f.read())
+    hashes = [_content_hash(source) for source in sources]
+    n = len(sources)
+
+    # 📂 Reuse previously computed pairs, keyed by content hash
+    index_path = os.path.splitext(output_path)[0] + "_index.json"
+    cached, cached_positions, cached_n = None, {}, 0
+    if os.path.exists(output_path) and os.path.exists(index_path):
+        with open(index_path, "r") as f:
+            cached_index = json.load(f)
+        if isinstance(cached_index, dict) and cached_index.get("cutoff") == cutoff:
+            cached = np.load(output_path, mmap_mode="r")
+            cached_positions = {entry["hash"]: pos for pos, entry in enumerate(cached_index["mutants"])}
+            # Rows, not distinct hashes: duplicate-content mutants each have their own row
+            cached_n = len(cached_index["mutants"])
+
+    distances = np.zeros(n * (n - 1) // 2, dtype=np.float32)
+    content_ids = {}
+    codes = np.array([content_ids.setdefault(h, len(content_ids)) for h in hashes], dtype=np.int64)
+    positions = np.array([cached_positions.get(h, -1) for h in hashes], dtype=np.int64)
+    pairs = _pending_pairs(codes, positions, cached, cached_n, distances)
+    blocks = iter(lambda: list(islice(pairs, block_size)), [])
+
+    # 🚀 Compute the remaining pairs over a process pool, keeping a bounded number of blocks in flight
+    n_computed = 0
+    first_block = next(blocks, None)
+    if first_block is not None:
+        max_in_flight = 4 * (max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(sources,)) as executor:
+            in_flight = {}
+            for block in chain([first_block], blocks):
+                if len(in_flight) >= max_in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        n_computed += _store_block(distances, in_flight.pop(future), future.result(), n)
+                in_flight[executor.submit(_compute_block, (block, cutoff))] = block
+            for future in wait(in_flight).done:
+                n_computed += _store_block(distances, in_flight[future], future.result(), n)
+    del cached
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    np.save(output_path, distances)
+    with open(index_path, "w") as f:
+        json.dump({"cutoff": cutoff,
+                   "mutants": [{"mutant": os.path.basename(p), "hash": h} for p, h in zip(mutant_paths, hashes)]},
+                  f, indent=4)
+
+    print(f"🌳 {n_computed} new pairs computed, {len(distances) - n_computed} reused or identical")
+    return np.load(output_path, mmap_mode="r")
+
+
+def load_distance_matrix(matrix_path, square=True):
+    """
+    Loads a persisted distance matrix and the mutant names of its rows.
+
+    With ``square=True`` the condensed vector is expanded so it can be passed to
+    DBSCAN/HDBSCAN with ``metric='precomputed'``; otherwise it stays memory mapped.
+    """
+    from scipy.spatial.distance import squareform
+
+    with open(os.path.splitext(matrix_path)[0] + "_index.json", "r") as f:
+        mutant_names = [entry["mutant"] for entry in json.load(f)["mutants"]]
+    distances = np.load(matrix_path, mmap_mode="r")
+    if square:
+        distances = squareform(np.asarray(distances, dtype=np.float64))
+    return distances, mutant_names
+
+
+if __name__ == "__main__":
+    mutants_dir = "data/output/mutants/"
+    output_path = "data/output/tree_edit_distances.npy"
+
+    mutant_paths = sorted(
+        os.path.join(mutants_dir, filename)
+        for filename in os.listdir(mutants_dir)
+        if filename.endswith(".py")
+    )
+    compute_distance_matrix(mutant_paths, output_path)
+    print(f"✅ Tree edit distance matrix saved to {output_path}")
@@ -1,7 +1,11 @@
 import os
+import re
 import json
+import time
 import shutil
 import subprocess
+from src.clustering.representatives import RUN_TIMES_PATH, representative_names
+from src.mutation_testing.subsumption import KILLS_PATH
 
 # 📂 Define paths
 evaluation_dir = "data/output/evaluation_mutants/"
@@ -16,7 +20,7 @@ with open(selected_mutants_path, "r") as f:
     representative_mutants = json.load(f)
 
 # Extracting the correct mutant filenames
-selected_mutants = list(representative_mutants.values())  # Extract filenames properly
+selected_mutants = representative_names(representative_mutants)  # Extract filenames properly
 
 # 🏗️ Ensure evaluation directory exists
 os.makedirs(evaluation_dir, exist_ok=True)
@@ -33,6 +37,15 @@ results = {
 killed = 0
 survived = 0
 
+# ⏱️ Per-mutant test suite run times (used by the "cheapest" representative strategy)
+run_times = {}
+if os.path.exists(RUN_TIMES_PATH):
+    with open(RUN_TIMES_PATH, "r") as f:
+        run_times = json.load(f)
+
+# 🎯 Per-mutant killing tests (used to compute dominator mutants)
+kills = {}
+
 # 📌 Backup original FSM file
 if not os.path.exists(backup_file):
     shutil.copy(target_file, backup_file)
@@ -45,8 +58,11 @@ for mutant in selected_mutants:
 
     # 🚀 Run mutation testing with `pytest-mutagen`
     try:
+        start = time.perf_counter()
         test_result = subprocess.run(["pytest", "--mutagen", test_file], capture_output=True, text=True)
+        run_times[mutant] = time.perf_counter() - start
         output = test_result.stdout
+        kills[mutant] = sorted(set(re.findall(r"^FAILED (\S+)", output, re.MULTILINE)))
 
         # 📌 Check if mutant was killed
         if "FAILED" in output:
@@ -69,4 +85,12 @@ results["mutation_score"] = f"{mutation_score:.2f}% (Killed: {killed}, Survived:
 with open(output_file, "w") as f:
     json.dump(results, f, indent=4)
 
+with open(RUN_TIMES_PATH, "w") as f:
+    json.dump(run_times, f, indent=4)
+
+with open(KILLS_PATH, "w") as f:
+    json.dump(kills, f, indent=4)
+
 print(f"✅ Mutation Testing Completed. Results saved to {output_file}")
+print(f"⏱️ Run times saved to {RUN_TIMES_PATH}")
+print(f"🎯 Killing tests saved to {KILLS_PATH}")
@@ -1,6 +1,7 @@
 import os
 import json
 import shutil
+from src.clustering.representatives import representative_names
 
 # 📂 Define paths
 mutants_dir = "data/output/mutants/"
@@ -11,7 +12,7 @@ representative_path = "data/output/clustering/representative_mutants.json"
 with open(representative_path, "r") as f:
     representative_mutants = json.load(f)
 
-selected_mutants = set(representative_mutants.values())  # Unique selected mutants
+selected_mutants = set(representative_names(representative_mutants))  # Unique selected mutants
 
 # 🧹 Clear and recreate evaluation directory
 if os.path.exists(evaluation_dir):
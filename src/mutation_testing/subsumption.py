@@ -0,0 +1,160 @@
+"""
+Dominator mutants from a per-test kill matrix.
+
+Mutant A subsumes mutant B when every test that kills A also kills B: any test suite that
+kills A kills B too, so B is redundant. The dominator mutants, those not subsumed by any
+other (one per distinct kill set), are the minimal set that still has to be run.
+
+Kill sets are packed into 64-bit words, so "kills(A) ⊆ kills(B)" is ``A & ~B == 0`` over a
+handful of words. Kill sets are sorted by popcount: a mutant can only be subsumed by one
+that is killed by fewer tests, and, by transitivity, checking it against the dominators
+already found is enough.
+"""
+import os
+import json
+import numpy as np
+
+KILLS_PATH = "data/output/mutant_kills.json"
+OUTPUT_PATH = "data/output/dominator_mutants.json"
+
+# Bits set in every byte value
+_BYTE_POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+# (candidate, dominator) pairs checked per block
+BLOCK_PAIRS = 1 << 18
+
+# Fraction of still possible pairs below which only those pairs are checked further
+REMAINING_FRACTION = 1 / 16
+
+
+def pack_kills(kills):
+    """
+    Packs a boolean kill matrix into 64-bit words.
+
+    :param kills: ``(n_mutants, n_tests)`` array, True where the test kills the mutant.
+    :return: ``(n_mutants, ceil(n_tests / 64))`` uint64 array.
+    """
+    kills = np.asarray(kills, dtype=bool)
+    bits = np.packbits(kills, axis=1)
+    packed = np.zeros((kills.shape[0], max(1, -(-bits.shape[1] // 8)) * 8), dtype=np.uint8)
+    packed[:, :bits.shape[1]] = bits
+    return packed.view(np.uint64)
+
+
+def popcount(words):
+    """Number of set bits (killing tests) of every row of packed kill sets."""
+    words = np.ascontiguousarray(words, dtype=np.uint64)
+    return _BYTE_POPCOUNT[words.view(np.uint8)].reshape(len(words), -1).sum(axis=1, dtype=np.int64)
+
+
+def subsumes(words_a, words_b):
+    """Whether kill set A is a subset of kill set B (A subsumes B) for packed rows."""
+    return not np.any(np.asarray(words_a, dtype=np.uint64) & ~np.asarray(words_b, dtype=np.uint64))
+
+
+def _first_subset(candidates, dominators):
+    """
+    Index of the first dominator kill set contained in every candidate kill set (-1 if none).
+
+    Pairs are checked one word at a time, on the whole block while most of them are still
+    possible and then only on the pairs that remain.
+    """
+    first = np.full(len(candidates), -1, dtype=np.int64)
+    if len(dominators) == 0:
+        return first
+    n_words = candidates.shape[1]
+    inverted = ~candidates
+    step = max(1, BLOCK_PAIRS // len(dominators))
+    for start in range(0, len(candidates), step):
+        block = inverted[start:start + step]
+        # (candidate, dominator): no dominator bit is missing from the candidate
+        contained = np.ones((len(block), len(dominators)), dtype=bool)
+        word = 0
+        while word < n_words and np.count_nonzero(contained) > contained.size * REMAINING_FRACTION:
+            contained &= np.bitwise_and.outer(block[:, word], dominators[:, word]) == 0
+            word += 1
+        if word < n_words:
+            rows, columns = np.nonzero(contained)
+            contained[:] = False
+            for word in range(word, n_words):
+                possible = (block[rows, word] & dominators[columns, word]) == 0
+                rows, columns = rows[possible], columns[possible]
+            contained[rows, columns] = True
+        first[start:start + step] = np.where(contained.any(axis=1), contained.argmax(axis=1), -1)
+    return first
+
+
+def dominator_mutants(words):
+    """
+    Dominator mutants of packed kill sets.
+
+    Mutants that no test kills (live or equivalent) are never dominators. Of mutants with
+    identical kill sets only the first one is kept.
+
+    :param words: Packed kill sets (see ``pack_kills``).
+    :return: ``(dominators, subsumed_by)``: sorted row indices of the dominator mutants, and
+             for every row a dominator whose kill set it contains (-1 for unkilled rows, the
+             row itself for dominators).
+    """
+    words = np.ascontiguousarray(words, dtype=np.uint64)
+    distinct, first_index, inverse = np.unique(words, axis=0, return_index=True, return_inverse=True)
+    counts = popcount(distinct)
+
+    owner = np.full(len(distinct), -1, dtype=np.int64)
+    dominator_sets = np.empty(0, dtype=np.int64)
+    # Distinct kill sets of equal popcount cannot contain one another, so each level is checked at once
+    for level in np.unique(counts[counts > 0]):
+        candidates = np.flatnonzero(counts == level)
+        first = _first_subset(distinct[candidates], distinct[dominator_sets])
+        new = first < 0
+        owner[candidates[~new]] = dominator_sets[first[~new]]
+        owner[candidates[new]] = candidates[new]
+        dominator_sets = np.concatenate([dominator_sets, candidates[new]])
+
+    subsumed_by = np.where(owner >= 0, first_index[owner], -1)[inverse.reshape(-1)]
+    return np.sort(first_index[dominator_sets]), subsumed_by
+
+
+def load_kill_matrix(kills_path=KILLS_PATH):
+    """
+    Loads recorded kills, ``{mutant: [killing tests]}``, as packed kill sets.
+
+    :return: ``(mutant_names, test_names, words)``
+    """
+    with open(kills_path, "r") as f:
+        recorded = json.load(f)
+    mutant_names = list(recorded)
+    test_names = sorted({test for tests in recorded.values() for test in tests})
+    test_index = {test: i for i, test in enumerate(test_names)}
+    kills = np.zeros((len(mutant_names), len(test_names)), dtype=bool)
+    for row, mutant in enumerate(mutant_names):
+        kills[row, [test_index[test] for test in recorded[mutant]]] = True
+    return mutant_names, test_names, pack_kills(kills)
+
+
+def main(kills_path=KILLS_PATH, output_path=OUTPUT_PATH):
+    # 📂 Load the kill matrix recorded by mutpy_evaluation
+    mutant_names, test_names, words = load_kill_matrix(kills_path)
+    print(f"📥 {len(mutant_names)} mutants × {len(test_names)} killing tests")
+
+    # 🔍 Minimal dominator set
+    dominators, subsumed_by = dominator_mutants(words)
+    names = np.array(mutant_names, dtype=object)
+    result = {
+        "dominator_mutants": names[dominators].tolist(),
+        "subsumed_by": {mutant: names[owner] for mutant, owner in zip(mutant_names, subsumed_by.tolist())
+                        if owner >= 0 and names[owner] != mutant},
+        "live_mutants": names[subsumed_by < 0].tolist(),
+    }
+
+    # 💾 Save results
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with open(output_path, "w") as f:
+        json.dump(result, f, indent=4)
+
+    print(f"🏆 {len(dominators)} dominator mutants, {len(result['live_mutants'])} live")
+    print(f"✅ Dominator mutants saved to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,18 @@
 import os
 import json
-from itertools import combinations
-import importlib.util
-from src.fsm_modeling.flight_booking_fsm import FlightBookingFSM  
+import time
+import types
+import signal
+import hashlib
+import resource
+import multiprocessing
+from multiprocessing.connection import wait
+from collections import OrderedDict, deque
 
 # Paths
 mutants_dir = "data/output/mutants/"
 cluster_assignments_path = "data/output/clustering/kmeans_cluster_assignments.json"
 output_path = "data/output/equivalence_testing/cluster_equivalence_results.json"
-os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
 # Distinguishing Sequence (DS)
 DS_SEQUENCE = ["A", "A", "A", "A"]
@@ -27,14 +31,48 @@ TEST_SUITE = [
     ["A", "A", "X", "A", "A", "A", "A"]  # Details → Cancelled → DS
 ]
 
+# Wall-clock seconds a mutant may take to load and run the test suite
+MUTANT_TIMEOUT = 10.0
+
+# Extra wall-clock seconds a worker gets per cluster on top of the mutants' time limits
+CLUSTER_GRACE = 5.0
+
+# Address space limit of every worker process, in bytes
+MEMORY_LIMIT = 2 << 30
+
+# Compiled mutant FSM classes kept in memory, least recently used evicted first
+CLASS_CACHE_SIZE = 256
+_class_cache = OrderedDict()  # content hash -> FSM class
+
+# Function to dynamically load a mutant FSM class
+def load_fsm_class(mutant_path):
+    """
+    Compiles and executes a mutant file once per distinct content and returns its FSM class.
+
+    Classes are cached by content hash, so identical mutants and repeated loads reuse the
+    compiled code and the module's imports; at most ``CLASS_CACHE_SIZE`` are kept.
+    """
+    with open(mutant_path, "rb") as f:
+        source = f.read()
+    content_hash = hashlib.blake2b(source, digest_size=16).hexdigest()
+    fsm_class = _class_cache.get(content_hash)
+    if fsm_class is not None:
+        _class_cache.move_to_end(content_hash)
+        return fsm_class
+
+    module = types.ModuleType(os.path.basename(mutant_path).replace(".py", ""))
+    module.__file__ = mutant_path
+    exec(compile(source, mutant_path, "exec"), module.__dict__)
+    fsm_class = module.FlightBookingFSM
+    _class_cache[content_hash] = fsm_class
+    if len(_class_cache) > CLASS_CACHE_SIZE:
+        _class_cache.popitem(last=False)
+    return fsm_class
+
 # Function to dynamically load a mutant FSM
 def load_fsm_from_file(mutant_path):
-    """Dynamically loads an FSM class from a mutant file."""
-    module_name = os.path.basename(mutant_path).replace(".py", "")
-    spec = importlib.util.spec_from_file_location(module_name, mutant_path)
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    return module.FlightBookingFSM()
+    """Returns a fresh FSM instance of a mutant file (the class is compiled once, see ``load_fsm_class``)."""
+    return load_fsm_class(mutant_path)()
 
 # Execute Test Suite on FSM
 def execute_fsm(fsm, sequence):
@@ -59,7 +97,7 @@ def are_mutants_equivalent(fsm1, fsm2):
     for seq in TEST_SUITE:
         state1, outputs1 = execute_fsm(fsm1, seq)
         state2, outputs2 = execute_fsm(fsm2, seq)
-        
+
         if state1 == "Error" or state2 == "Error":
             return False  # If any FSM throws an error, they are NOT equivalent
 
@@ -68,40 +106,201 @@ def are_mutants_equivalent(fsm1, fsm2):
 
     return True  # No difference detected → Equivalent mutant
 
-# Load Cluster Assignments
-with open(cluster_assignments_path, "r") as f:
-    cluster_assignments = json.load(f)
+# Behavioral signature of one FSM
+def behavioral_signature(fsm, test_suite=TEST_SUITE):
+    """
+    Runs the test suite once on the FSM and hashes its (final state, outputs) sequence.
 
-# Group mutants by cluster
-clusters = {}
-for mutant, cluster in cluster_assignments.items():
-    clusters.setdefault(cluster, []).append(mutant)
+    Two FSMs are equivalent under ``are_mutants_equivalent`` exactly when their signatures
+    are equal, so grouping by signature replaces the pairwise comparisons. An FSM that
+    errors on a sequence is equivalent to none: its signature is None.
+    """
+    behavior = []
+    for seq in test_suite:
+        state, outputs = execute_fsm(fsm, seq)
+        if state == "Error":
+            return None
+        behavior.append((state, outputs))
+    return hashlib.blake2b(repr(behavior).encode(), digest_size=16).hexdigest()
 
-# Run Equivalence Testing Within Each Cluster
-equivalence_results = {}
+class MutantTimeout(BaseException):
+    """
+    Raised in a mutant that exceeds its time limit.
 
-for cluster_id, mutants in clusters.items():
-    print(f"🔍 Checking equivalence within Cluster {cluster_id}...")
+    It is a BaseException, so ``except Exception`` in mutant code does not swallow it; a bare
+    ``except:`` still can, and a mutant stuck in C code never sees it. The per-cluster
+    deadline of ``check_clusters`` covers both.
+    """
 
-    # Compare all mutant pairs in the cluster
-    for mutant1, mutant2 in combinations(mutants, 2):
-        mutant1_path = os.path.join(mutants_dir, mutant1)
-        mutant2_path = os.path.join(mutants_dir, mutant2)
+def _raise_timeout(signum, frame):
+    raise MutantTimeout()
 
+# Group the mutants of one cluster by behavior
+def group_equivalent_mutants(mutants, mutants_dir=mutants_dir, test_suite=TEST_SUITE, timeout=None):
+    """
+    Groups mutants with identical behavior on the test suite, loading and running each once.
+
+    :param timeout: Wall-clock seconds allowed per mutant (None for no limit). Uses SIGALRM,
+                    so it must be called from the main thread of a process.
+    :return: ``{"groups": [[mutants]], "errors": {mutant: message}}``; every mutant that
+             loads and runs is in exactly one group, a singleton when it is equivalent to
+             no other mutant of the list. Mutants over the time limit are recorded as
+             "timeout" and those over the memory limit as "memory limit".
+    """
+    groups = {}
+    errors = {}
+    previous_handler = signal.signal(signal.SIGALRM, _raise_timeout) if timeout else None
+    for mutant in mutants:
         try:
-            fsm1 = load_fsm_from_file(mutant1_path)
-            fsm2 = load_fsm_from_file(mutant2_path)
-
-            # Check equivalence
-            if are_mutants_equivalent(fsm1, fsm2):
-                equivalence_results[f"{mutant1} ↔ {mutant2}"] = "Equivalent"
-            else:
-                equivalence_results[f"{mutant1} ↔ {mutant2}"] = "Non-Equivalent"
+            try:
+                if timeout:
+                    signal.setitimer(signal.ITIMER_REAL, timeout)
+                signature = behavioral_signature(load_fsm_from_file(os.path.join(mutants_dir, mutant)), test_suite)
+            finally:
+                if timeout:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+        except MutantTimeout:
+            errors[mutant] = "timeout"
+            continue
+        except MemoryError:
+            errors[mutant] = "memory limit"
+            continue
         except Exception as e:
-            equivalence_results[f"{mutant1} ↔ {mutant2}"] = f"Error: {str(e)}"
+            errors[mutant] = f"Error: {str(e)}"
+            continue
+        # Erroring FSMs are equivalent to no other mutant
+        groups.setdefault(signature if signature is not None else mutant, []).append(mutant)
+    if timeout:
+        signal.signal(signal.SIGALRM, previous_handler)
+    return {"groups": list(groups.values()), "errors": errors}
+
+def _init_worker(memory_limit):
+    """Caps the address space of a worker process, so a runaway mutant fails with MemoryError."""
+    if memory_limit:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+def _check_cluster(args):
+    mutants, mutants_dir, timeout = args
+    return group_equivalent_mutants(mutants, mutants_dir, timeout=timeout)
+
+def _worker_loop(connection, memory_limit):
+    """Checks the clusters received on ``connection`` until None is received."""
+    _init_worker(memory_limit)
+    for task in iter(connection.recv, None):
+        connection.send(_check_cluster(task))
+
+def _start_worker(memory_limit):
+    """Starts a worker process; returns it with the parent's end of its pipe."""
+    connection, child_connection = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=_worker_loop, args=(child_connection, memory_limit), daemon=True)
+    process.start()
+    child_connection.close()
+    return process, connection
+
+def _stop_worker(process, connection):
+    """Kills a worker process and closes its pipe."""
+    process.kill()
+    process.join()
+    connection.close()
+
+# Check every cluster in parallel
+def check_clusters(clusters, mutants_dir=mutants_dir, timeout=MUTANT_TIMEOUT, memory_limit=MEMORY_LIMIT,
+                   max_workers=None, cluster_timeout=None):
+    """
+    Groups equivalent mutants within every cluster, one cluster at a time per worker process.
+
+    Every mutant runs under ``timeout`` seconds and every worker under ``memory_limit`` bytes,
+    so a looping or exploding mutant is recorded and the run goes on. Since the per-mutant
+    limit cannot interrupt C code or a bare ``except:``, the parent also gives every cluster
+    a hard deadline: a worker that misses it is killed and replaced, and all mutants of its
+    cluster are recorded as "timeout". A cluster whose worker dies is retried once in a fresh
+    worker; if it dies again, all its mutants are recorded as crashed.
+
+    :param clusters: ``{cluster: [mutants]}``
+    :param cluster_timeout: Wall-clock seconds a cluster may take in its worker; defaults to
+                            ``timeout`` per mutant plus ``CLUSTER_GRACE`` (no deadline when
+                            ``timeout`` is None).
+    :return: ``{cluster: group_equivalent_mutants result}``, in the order of ``clusters``.
+    """
+    def deadline(cluster_id):
+        limit = cluster_timeout
+        if limit is None and timeout:
+            limit = timeout * len(clusters[cluster_id]) + CLUSTER_GRACE
+        return time.monotonic() + limit if limit else None
+
+    results = {}
+    crashed = set()
+    # Largest clusters first, so they do not end up last on a busy pool
+    pending = deque(sorted(clusters, key=lambda cluster_id: len(clusters[cluster_id]), reverse=True))
+    n_workers = min(max_workers or os.cpu_count() or 1, len(pending))
+    idle = [_start_worker(memory_limit) for _ in range(n_workers)]
+    busy = {}  # connection -> (process, cluster, deadline)
+    try:
+        while pending or busy:
+            while pending and idle:
+                process, connection = idle.pop()
+                cluster_id = pending.popleft()
+                connection.send((clusters[cluster_id], mutants_dir, timeout))
+                busy[connection] = (process, cluster_id, deadline(cluster_id))
+
+            deadlines = [cluster_deadline for _, _, cluster_deadline in busy.values() if cluster_deadline is not None]
+            wait_timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            for connection in wait(list(busy), timeout=wait_timeout):
+                process, cluster_id, _ = busy.pop(connection)
+                try:
+                    results[cluster_id] = connection.recv()
+                    idle.append((process, connection))
+                    continue
+                except EOFError:
+                    _stop_worker(process, connection)
+                    idle.append(_start_worker(memory_limit))
+                if cluster_id in crashed:
+                    results[cluster_id] = {"groups": [], "errors": {mutant: "Error: worker crashed"
+                                                                    for mutant in clusters[cluster_id]}}
+                else:
+                    print(f"⚠️ Worker crashed, retrying Cluster {cluster_id}...")
+                    crashed.add(cluster_id)
+                    pending.append(cluster_id)
+
+            now = time.monotonic()
+            for connection, (process, cluster_id, cluster_deadline) in list(busy.items()):
+                if cluster_deadline is not None and now >= cluster_deadline:
+                    print(f"⏱️ Cluster {cluster_id} missed its deadline, replacing its worker...")
+                    del busy[connection]
+                    _stop_worker(process, connection)
+                    idle.append(_start_worker(memory_limit))
+                    results[cluster_id] = {"groups": [], "errors": {mutant: "timeout"
+                                                                    for mutant in clusters[cluster_id]}}
+    finally:
+        for process, connection in idle + [(process, connection) for connection, (process, _, _) in busy.items()]:
+            _stop_worker(process, connection)
+    return {cluster_id: results[cluster_id] for cluster_id in clusters}
+
+def main(cluster_assignments_path=cluster_assignments_path, mutants_dir=mutants_dir, output_path=output_path,
+         timeout=MUTANT_TIMEOUT, max_workers=None):
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    # Load Cluster Assignments
+    with open(cluster_assignments_path, "r") as f:
+        cluster_assignments = json.load(f)
+
+    # Group mutants by cluster
+    clusters = {}
+    for mutant, cluster in cluster_assignments.items():
+        clusters.setdefault(cluster, []).append(mutant)
+
+    # Run Equivalence Testing Within Each Cluster, in parallel
+    print(f"🔍 Checking equivalence within {len(clusters)} clusters...")
+    equivalence_results = check_clusters(clusters, mutants_dir, timeout=timeout, max_workers=max_workers)
+    timeouts = sum(error == "timeout" for result in equivalence_results.values() for error in result["errors"].values())
+    if timeouts:
+        print(f"⏱️ {timeouts} mutants timed out")
+
+    # 💾 Save Results
+    with open(output_path, "w") as f:
+        json.dump(equivalence_results, f, indent=4)
 
-# 💾 Save Results
-with open(output_path, "w") as f:
-    json.dump(equivalence_results, f, indent=4)
+    print(f"✅ Cluster-Based Equivalence Results Saved to {output_path}")
 
-print(f"✅ Cluster-Based Equivalence Results Saved to {output_path}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.clustering.blocking import (assign_blocks, blocked_cluster, enclosing_function, function_spans,
+                                     infer_operator, mutation_sites)
+from src.feature_extraction.compare import canonical_lines, tokenize
+
+
+ORIGINAL = """LIMIT = 3
+
+
+class Counter:
+    def add(self, a, b):
+        if a > b and b > 0:
+            return a + b
+        return a - b
+
+    def reset(self):
+        def clear():
+            self.total = 0
+            return 0
+        return clear()
+"""
+
+
+class TestBlocking(unittest.TestCase):
+
+    def setUp(self):
+        """Write the original and one mutant per operator to a temporary directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.original = self._write("original.py", ORIGINAL)
+        self.mutants = [
+            self._write("aor.py", ORIGINAL.replace("return a + b", "return a - b")),
+            self._write("ror.py", ORIGINAL.replace("if a > b", "if a < b")),
+            self._write("coi.py", ORIGINAL.replace("and b > 0", "or b > 0")),
+            self._write("sdl.py", ORIGINAL.replace("            self.total = 0\n", "")),
+            self._write("module.py", ORIGINAL.replace("LIMIT = 3", "LIMIT = 4")),
+        ]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_infer_operator(self):
+        """Test that the changed tokens of a hunk name its mutation operator."""
+        self.assertEqual(infer_operator(tokenize(["a + b"]), tokenize(["a - b"])), "AOR")
+        self.assertEqual(infer_operator(tokenize(["a > b"]), tokenize(["a <= b"])), "ROR")
+        self.assertEqual(infer_operator(tokenize(["a and b"]), tokenize(["a or b"])), "COI")
+        self.assertEqual(infer_operator(tokenize(["return a"]), ()), "SDL")
+        self.assertEqual(infer_operator(tokenize(['("A", "S")']), tokenize(['("S", "A")'])), "FSM_TRANS")
+        self.assertEqual(infer_operator(tokenize(["x = 3"]), tokenize(["x = 4"])), "OTHER")
+
+    def test_infer_operator_from_token_pairs(self):
+        """Test that operators come from the aligned removed→added token pairs, not only pure edits."""
+        # Statement deletion by replacement with pass
+        self.assertEqual(infer_operator(tokenize(["x = a + b"]), tokenize(["pass"])), "SDL")
+        # Condition negated with added parentheses
+        self.assertEqual(infer_operator(tokenize(["if a > b and c:"]), tokenize(["if not (a > b and c):"])), "COI")
+        # Several swaps of one operator in a hunk, amid unchanged tokens
+        self.assertEqual(infer_operator(tokenize(["x = a - b / t", "y = 2"]), tokenize(["x = a + b * t", "y = 2"])),
+                         "AOR")
+        self.assertEqual(infer_operator(tokenize(["if name == 'main':"]), tokenize(["if name != 'main':"])), "ROR")
+        # An AOR and a ROR swap within one hunk
+        self.assertEqual(infer_operator(tokenize(["y = a + b if a > b else 0"]),
+                                        tokenize(["y = a - b if a < b else 0"])), "AOR+ROR")
+        self.assertEqual(infer_operator(tokenize(["y = a + b * c"]), tokenize(["y = a - b * d"])), "AOR+OTHER")
+
+    def test_enclosing_function(self):
+        """Test that a line range maps to its innermost function, or to the module outside any."""
+        spans = function_spans(canonical_lines(ORIGINAL))
+        self.assertEqual(enclosing_function(spans, 6, 7), "Counter.add")
+        self.assertEqual(enclosing_function(spans, 13, 14), "Counter.reset.clear")
+        self.assertEqual(enclosing_function(spans, 15, 15), "Counter.reset")
+        self.assertEqual(enclosing_function(spans, 0, 1), "<module>")
+
+    def test_mutation_sites_and_blocks(self):
+        """Test that every mutant is blocked by its operator and enclosing function."""
+        sites = mutation_sites(self.original, self.mutants)
+        self.assertEqual(sites["ror.py"], (("ROR",), ("Counter.add",), (6,)))
+        self.assertEqual(assign_blocks(self.original, self.mutants), {
+            "aor.py": "AOR|Counter.add",
+            "ror.py": "ROR|Counter.add",
+            "coi.py": "COI|Counter.add",
+            "sdl.py": "SDL|Counter.reset.clear",
+            "module.py": "OTHER|<module>",
+        })
+
+    def test_blocked_cluster(self):
+        """Test that blocks are clustered apart, with unique ids and singleton blocks as their own cluster."""
+        matrix = np.array([[0, 0], [0, 0], [9, 9], [9, 9], [0, 0], [0, 0], [5, 5]], dtype=np.float64)
+        blocks = ["a", "a", "a", "a", "b", "b", "c"]
+        labels = blocked_cluster(matrix, blocks, algo="kmeans", max_workers=1, n_clusters=2)
+        self.assertEqual(labels[0], labels[1])
+        self.assertEqual(labels[2], labels[3])
+        self.assertNotEqual(labels[0], labels[2])
+        # Identical rows of another block still get a cluster of their own
+        self.assertEqual(labels[4], labels[5])
+        self.assertNotIn(labels[4], labels[:4])
+        self.assertNotIn(labels[6], labels[:6])
+        self.assertEqual(len(np.unique(labels)), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
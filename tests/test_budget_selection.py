@@ -0,0 +1,72 @@
+import unittest
+from src.mutation_testing.budget_selection import coverage_elements, select_within_budget
+
+
+def lines(*values):
+    """Coverage elements of a mutant changing the given lines."""
+    return [("line", value) for value in values]
+
+
+class TestBudgetSelection(unittest.TestCase):
+
+    def test_coverage_elements(self):
+        """Test that every mutant covers its cluster and sites, noise mutants a cluster of their own."""
+        elements = coverage_elements({"m0.py": 0, "m1.py": -1},
+                                     {"m0.py": (("ROR",), ("FSM.transition",), (3,))})
+        self.assertEqual(elements["m0.py"], [("cluster", 0), ("operator", "ROR"), ("function", "FSM.transition"),
+                                             ("line", 3)])
+        self.assertEqual(elements["m1.py"], [("cluster", "m1.py")])
+
+    def test_budget_bound(self):
+        """Test that the selection never exceeds the budget and stops once everything is covered."""
+        elements = {"a": lines(1, 2), "b": lines(2, 3), "c": lines(4), "d": lines(1, 2, 3)}
+        selection = select_within_budget(elements, [3.0, 3.0, 3.0, 4.0], budget=7.0)
+        self.assertLessEqual(selection["estimated_cost"], 7.0)
+        self.assertEqual(selection["selected_mutants"], ["d", "c"])
+        self.assertEqual(selection["coverage"], selection["max_coverage"])
+        self.assertEqual(select_within_budget(elements, [3.0, 3.0, 3.0, 4.0], budget=1.0)["selected_mutants"], [])
+
+    def test_workers_scale_total_but_not_single_mutant(self):
+        """Test that workers multiply the total budget while a mutant over the budget is still excluded."""
+        elements = {"slow": lines(*range(10)), "a": lines(10), "b": lines(11), "c": lines(12)}
+        selection = select_within_budget(elements, [1000.0, 500.0, 500.0, 500.0], budget=600.0, workers=4)
+        self.assertNotIn("slow", selection["selected_mutants"])
+        self.assertEqual(sorted(selection["selected_mutants"]), ["a", "b", "c"])
+        self.assertEqual(selection["estimated_cost"], 1500.0)
+        self.assertEqual(select_within_budget(elements, [1000.0, 500.0, 500.0, 500.0], budget=600.0)
+                         ["estimated_cost"], 500.0)
+
+    def test_makespan_fits_budget(self):
+        """Test that a selection whose total fits in workers × budget is still cut to what fits per worker."""
+        elements = {f"m{i}": lines(i) for i in range(6)}
+        selection = select_within_budget(elements, [350.0] * 6, budget=600.0, workers=4)
+        self.assertEqual(len(selection["selected_mutants"]), 4)
+        self.assertEqual(selection["estimated_makespan"], 350.0)
+        self.assertEqual(sorted(len(mutants) for mutants in selection["schedule"]), [1, 1, 1, 1])
+
+    def test_schedule_packs_workers(self):
+        """Test that short mutants share a worker as long as its load stays within the budget."""
+        elements = {"long": lines(1), "a": lines(2), "b": lines(3), "c": lines(4)}
+        selection = select_within_budget(elements, [500.0, 200.0, 200.0, 200.0], budget=600.0, workers=2)
+        self.assertEqual(len(selection["selected_mutants"]), 4)
+        self.assertLessEqual(selection["estimated_makespan"], 600.0)
+        self.assertEqual(sorted(sorted(mutants) for mutants in selection["schedule"]), [["a", "b", "c"], ["long"]])
+
+    def test_plain_gain_wins(self):
+        """Test that the plain-gain subset is kept when gain per second favours a cheap, weak mutant."""
+        elements = {"broad": lines(*range(10)), "cheap": lines(10)}
+        selection = select_within_budget(elements, [10.0, 0.1], budget=10.0)
+        self.assertEqual(selection["selected_mutants"], ["broad"])
+        self.assertEqual(selection["coverage"], 10.0)
+
+    def test_cost_benefit_wins(self):
+        """Test that the gain-per-second subset is kept when several cheap mutants beat one expensive one."""
+        elements = {"broad": lines(*range(5)), "a": lines(10, 11, 12, 13), "b": lines(20, 21, 22, 23),
+                    "c": lines(30, 31, 32, 33)}
+        selection = select_within_budget(elements, [10.0, 1.0, 1.0, 1.0], budget=10.0)
+        self.assertEqual(sorted(selection["selected_mutants"]), ["a", "b", "c"])
+        self.assertEqual(selection["coverage"], 12.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
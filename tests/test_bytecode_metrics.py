@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+from src.feature_extraction.bytecode_metrics import build_feature_matrix, extract_bytecode_metrics, iter_code_objects
+
+
+class TestBytecodeMetrics(unittest.TestCase):
+
+    def _metrics(self, source):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "mutant.py")
+            with open(path, "w") as f:
+                f.write(source)
+            return extract_bytecode_metrics(path)
+
+    def test_repeated_qualnames_are_summed(self):
+        """Test that two lambdas add up in one size column instead of overwriting each other."""
+        source = "f = lambda x: x + 1\ng = lambda x, y: (x * y) - (x + y) * 2\n"
+        lambdas = [len(code.co_code) for name, code in iter_code_objects(compile(source, "<test>", "exec"))
+                   if name == "<lambda>"]
+        self.assertEqual(len(lambdas), 2)
+        self.assertEqual(self._metrics(source)["size:<lambda>"], sum(lambdas))
+
+    def test_operators_get_own_columns(self):
+        """Test that ``>`` and ``<`` are counted in separate comparison columns."""
+        greater = self._metrics("def f(a, b):\n    return a > b\n")
+        less = self._metrics("def f(a, b):\n    return a < b\n")
+        self.assertNotEqual(set(greater) - {"size:f", "size:<module>"}, set(less) - {"size:f", "size:<module>"})
+
+    def test_identity_and_membership_operators_get_own_columns(self):
+        """Test that ``is``/``is not`` and ``in``/``not in`` are told apart although only their argument differs."""
+        columns = {}
+        for operator in ("is", "is not", "in", "not in"):
+            metrics = self._metrics(f"def f(a, b):\n    return a {operator} b\n")
+            columns[operator] = {column for column in metrics if column.startswith(("IS_OP:", "CONTAINS_OP:"))}
+        self.assertEqual(columns, {"is": {"IS_OP:is"}, "is not": {"IS_OP:is not"},
+                                   "in": {"CONTAINS_OP:in"}, "not in": {"CONTAINS_OP:not in"}})
+
+    def test_uncompilable_mutant_is_skipped(self):
+        """Test that a mutant with a syntax error is left out instead of aborting the extraction."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = []
+            for name, source in (("ok.py", "x = 1\n"), ("broken.py", "def f(:\n"), ("ok2.py", "y = 2\n")):
+                paths.append(os.path.join(tmp_dir, name))
+                with open(paths[-1], "w") as f:
+                    f.write(source)
+            matrix, mutant_names, _ = build_feature_matrix(paths)
+        self.assertEqual(mutant_names, ["ok.py", "ok2.py"])
+        self.assertEqual(matrix.shape[0], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+import warnings
+from unittest import mock
+import numpy as np
+from sklearn.exceptions import ConvergenceWarning
+from src.clustering import hierarchical
+from src.clustering.cluster_api import ALGORITHMS, FeatureSet, cluster
+from src.clustering.incremental import assign, fit_and_save
+
+
+class TestClusterApi(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.matrix = rng.integers(0, 5, size=(40, 3)).astype(np.float64)
+
+    def test_scaling_leaves_inputs_untouched(self):
+        """Test that scaling and the exposed scaler never overwrite the caller's arrays."""
+        features = FeatureSet(self.matrix.copy())
+        np.testing.assert_allclose(features.scaled.mean(axis=0), 0, atol=1e-5)
+        np.testing.assert_array_equal(features.matrix, self.matrix)
+
+        raw = self.matrix.copy()
+        features.scaler.transform(raw)
+        np.testing.assert_array_equal(raw, self.matrix)
+
+    def test_assign_does_not_mutate_raw_matrix(self):
+        """Test that incremental assignment scales a copy of the new mutants' matrix."""
+        with tempfile.TemporaryDirectory() as model_dir:
+            features = FeatureSet(self.matrix.copy(), columns=["calls", "arithmetic", "conditionals"])
+            fit_and_save(features, algo="kmeans", model_dir=model_dir, n_clusters=3)
+            raw = self.matrix[:5].copy()
+            labels, _, _ = assign(raw, model_dir=model_dir)
+            self.assertEqual(len(labels), 5)
+            np.testing.assert_array_equal(raw, self.matrix[:5])
+
+    def test_agglomerative_reuses_cached_tree(self):
+        """Test that the registered agglomerative algorithm builds the linkage tree once per feature set."""
+        scaled = FeatureSet(self.matrix).scaled
+        with tempfile.TemporaryDirectory() as tree_dir:
+            tree_path = os.path.join(tree_dir, "linkage_tree.npz")
+            labels, _ = ALGORITHMS["agglomerative"](scaled, n_clusters=3, tree_path=tree_path)
+            with mock.patch.object(hierarchical, "build_linkage_tree", side_effect=AssertionError("rebuilt")):
+                cached_labels, _ = ALGORITHMS["agglomerative"](scaled, n_clusters=3, tree_path=tree_path)
+        np.testing.assert_array_equal(cached_labels, labels)
+
+    def test_deduplicate_falls_back_when_too_few_distinct_rows(self):
+        """Test that K-Means runs on every mutant when there are fewer distinct rows than clusters."""
+        matrix = np.repeat(np.arange(10, dtype=np.float64).reshape(5, 2), [4, 3, 2, 1, 1], axis=0)
+        _, model = cluster(FeatureSet(matrix), algo="kmeans", n_clusters=5)
+        self.assertEqual(len(model.labels_), 5)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", ConvergenceWarning)
+            labels, model = cluster(FeatureSet(matrix), algo="kmeans", n_clusters=6)
+        self.assertEqual(len(labels), len(matrix))
+        self.assertEqual(len(model.labels_), len(matrix))
+
+    def test_deduplicate_matches_full_kmeans_labels(self):
+        """Test that labels broadcast from the distinct rows give every mutant its row's cluster."""
+        labels, model = cluster(FeatureSet(self.matrix), algo="kmeans", n_clusters=3)
+        self.assertEqual(len(labels), len(self.matrix))
+        np.testing.assert_array_equal(labels, model.predict(FeatureSet(self.matrix).scaled))
+
+
+if __name__ == "__main__":
+    unittest.main()
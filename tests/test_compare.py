@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+from src.feature_extraction.compare import diff_signature, group_by_diff_signature, group_identical
+
+
+ORIGINAL = """def check(a, b):
+    if a > b:
+        return a + b
+    return a - b
+"""
+
+
+class TestDiffSignatureGrouping(unittest.TestCase):
+
+    def setUp(self):
+        """Write the original and a few mutants to a temporary directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.original = self._write("original.py", ORIGINAL)
+        self.mutants = [
+            self._write("mutant_0.py", ORIGINAL.replace("a > b", "a < b")),
+            self._write("mutant_1.py", ORIGINAL.replace("a > b", "a  <  b")),
+            self._write("mutant_2.py", ORIGINAL.replace("a > b", "a == b")),
+            self._write("mutant_3.py", ORIGINAL.replace("a + b", "a - b")),
+        ]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_identical_files_have_empty_signature(self):
+        """Test that an unchanged mutant produces no hunks."""
+        lines = ORIGINAL.splitlines()
+        self.assertEqual(diff_signature(lines, lines), ())
+
+    def test_duplicates_share_a_signature(self):
+        """Test that whitespace-only differences collapse into one group."""
+        signature_groups, _ = group_by_diff_signature(self.original, self.mutants)
+        groups = sorted(sorted(g) for g in signature_groups.values())
+        self.assertEqual(groups, [["mutant_0.py", "mutant_1.py"], ["mutant_2.py"], ["mutant_3.py"]])
+
+    def test_line_families(self):
+        """Test that mutants touching the same lines form a family."""
+        _, line_families = group_by_diff_signature(self.original, self.mutants)
+        self.assertEqual(sorted(line_families["1:2"]), ["mutant_0.py", "mutant_1.py", "mutant_2.py"])
+        self.assertEqual(line_families["2:3"], ["mutant_3.py"])
+
+    def test_group_identical(self):
+        """Test byte-identical and whitespace-normalized grouping."""
+        copy = self._write("mutant_4.py", ORIGINAL.replace("a > b", "a < b"))
+        identical_groups, normalized_groups = group_identical(self.mutants + [copy])
+        self.assertEqual(identical_groups, [[self.mutants[0], copy]])
+        self.assertEqual(normalized_groups, [[self.mutants[0], self.mutants[1], copy]])
+
+    def test_group_identical_without_duplicates(self):
+        """Test that distinct files produce no groups."""
+        self.assertEqual(group_identical([self.mutants[2], self.mutants[3]]), ([], []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+import numpy as np
+from src.clustering.consensus import co_association, consensus_cluster
+
+
+class TestConsensus(unittest.TestCase):
+
+    def test_co_association(self):
+        """Test that pairs count only subsamples containing both mutants, and noise never co-clusters."""
+        rows, cols = np.array([0, 0, 2]), np.array([1, 2, 3])
+        subsamples = [(np.array([0, 1, 2]), np.array([0, 0, 1])),
+                      (np.array([0, 1, 3]), np.array([1, 1, 0])),
+                      (np.array([0, 2, 3]), np.array([0, -1, -1]))]
+        co_clustered, co_sampled = co_association(4, rows, cols, subsamples)
+        np.testing.assert_array_equal(co_sampled, [2, 2, 1])
+        np.testing.assert_array_equal(co_clustered, [2, 0, 0])
+
+    def test_separated_blobs_are_stable(self):
+        """Test that well-separated blobs come out as the consensus clusters, every mutant stable."""
+        rng = np.random.default_rng(0)
+        points = np.vstack([rng.normal(center, 0.3, size=(25, 2)) for center in ((0, 0), (10, 0), (0, 10))])
+        labels, stability, unstable = consensus_cluster(points, algo="kmeans", n_subsamples=20, n_clusters=3,
+                                                        n_init=1, max_workers=2)
+        self.assertEqual(len(set(labels)), 3)
+        for start in (0, 25, 50):
+            self.assertEqual(len(set(labels[start:start + 25])), 1)
+        np.testing.assert_allclose(stability, 1.0)
+        self.assertFalse(unstable.any())
+
+    def test_noisy_points_are_flagged(self):
+        """Test that clusters of structureless points depend on the subsample and are flagged unstable."""
+        points = np.random.default_rng(0).uniform(size=(150, 2))
+        _, stability, unstable = consensus_cluster(points, algo="kmeans", n_subsamples=20, n_clusters=6,
+                                                   n_init=1, max_workers=2)
+        self.assertLess(stability.mean(), 0.95)
+        self.assertTrue(unstable.any())
+
+    def test_knn_pairs_keep_elongated_cluster_whole(self):
+        """Test that an elongated cluster, whose far ends are never kNN neighbours, stays one cluster."""
+        t = np.linspace(0, 30, 120)
+        chain = np.column_stack([t, np.zeros_like(t)])
+        points = np.vstack([chain, chain[:20] + [0, 20]])
+        labels, _, _ = consensus_cluster(points, algo="dbscan", n_subsamples=20, n_neighbors=5, eps=1.5,
+                                         min_samples=2, max_workers=2)
+        self.assertEqual(len(set(labels[:120])), 1)
+        self.assertEqual(len(set(labels[120:])), 1)
+        self.assertNotEqual(labels[0], labels[120])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+import unittest
+from itertools import combinations
+from unittest import mock
+from src.mutation_testing import test_suite_generator
+from src.mutation_testing.test_suite_generator import (are_mutants_equivalent, check_clusters, group_equivalent_mutants,
+                                                       load_fsm_from_file)
+
+ORIGINAL_PATH = "src/fsm_modeling/flight_booking_fsm.py"
+
+
+class TestEquivalenceGrouping(unittest.TestCase):
+
+    def setUp(self):
+        """Write copies and mutants of the original FSM to a temporary directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        with open(ORIGINAL_PATH, "r") as f:
+            original = f.read()
+        shutil.copy(ORIGINAL_PATH, os.path.join(self.tmp_dir.name, "mutant_0.py"))
+        self._write("mutant_1.py", original.replace('"A": ("Booked", "F")', '"A": ("Booked", "S")'))
+        self._write("mutant_2.py", original.replace("self.transition_count * 2) / 2", "self.transition_count * 3) / 3"))
+        self._write("mutant_3.py", original.replace('"X": ("Idle", "F")', ""))
+        self._write("mutant_4.py", original.replace("def reset(self):", "def restart(self):"))
+        self._write("mutant_5.py", original.replace('"X": ("Idle", "F")', ""))
+        self.mutants = [f"mutant_{i}.py" for i in range(6)]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write(self, name, content):
+        with open(os.path.join(self.tmp_dir.name, name), "w") as f:
+            f.write(content)
+
+    def test_groups(self):
+        """Equivalent mutants share a group; erroring FSMs stay alone; load failures are reported."""
+        result = group_equivalent_mutants(self.mutants, self.tmp_dir.name)
+        self.assertEqual(result["groups"], [["mutant_0.py", "mutant_2.py"], ["mutant_1.py"], ["mutant_3.py"],
+                                            ["mutant_5.py"]])
+        self.assertEqual(list(result["errors"]), ["mutant_4.py"])
+
+    def test_matches_pairwise_checks(self):
+        """Grouping by signature agrees with are_mutants_equivalent on every pair."""
+        groups = group_equivalent_mutants(self.mutants, self.tmp_dir.name)["groups"]
+        group_of = {mutant: i for i, group in enumerate(groups) for mutant in group}
+        for mutant1, mutant2 in combinations(group_of, 2):
+            with self.subTest(mutant1=mutant1, mutant2=mutant2):
+                fsm1 = load_fsm_from_file(os.path.join(self.tmp_dir.name, mutant1))
+                fsm2 = load_fsm_from_file(os.path.join(self.tmp_dir.name, mutant2))
+                self.assertEqual(are_mutants_equivalent(fsm1, fsm2), group_of[mutant1] == group_of[mutant2])
+
+    def test_class_cache(self):
+        """Identical files share one compiled class, instances are fresh, and the cache is bounded."""
+        paths = [os.path.join(self.tmp_dir.name, mutant) for mutant in self.mutants[:3]]
+        shutil.copy(paths[0], os.path.join(self.tmp_dir.name, "copy.py"))
+        with mock.patch.object(test_suite_generator, "CLASS_CACHE_SIZE", 2), \
+                mock.patch.object(test_suite_generator, "_class_cache", test_suite_generator.OrderedDict()):
+            fsm = load_fsm_from_file(paths[0])
+            fsm.transition("A")
+            copy = load_fsm_from_file(os.path.join(self.tmp_dir.name, "copy.py"))
+            self.assertIs(type(copy), type(fsm))
+            self.assertEqual(copy.state, "Idle")
+            for path in paths[1:]:
+                load_fsm_from_file(path)
+            self.assertEqual(len(test_suite_generator._class_cache), 2)
+            self.assertIsNot(type(load_fsm_from_file(paths[0])), type(fsm))
+
+    def test_timeout_in_parallel_clusters(self):
+        """A mutant that loops forever is recorded as a timeout and the other clusters complete."""
+        with open(ORIGINAL_PATH, "r") as f:
+            self._write("looping.py", f.read().replace("self.transition_count += 1",
+                                                       "while self.transition_count >= 0: self.transition_count += 1"))
+        clusters = {0: ["looping.py", "mutant_0.py", "mutant_2.py"], 1: ["mutant_1.py"]}
+        results = check_clusters(clusters, self.tmp_dir.name, timeout=0.5, max_workers=2)
+        self.assertEqual(list(results), [0, 1])
+        self.assertEqual(results[0], {"groups": [["mutant_0.py", "mutant_2.py"]], "errors": {"looping.py": "timeout"}})
+        self.assertEqual(results[1], {"groups": [["mutant_1.py"]], "errors": {}})
+
+    def test_cluster_deadline_kills_stuck_worker(self):
+        """A mutant stuck in C code, out of SIGALRM's reach, loses its cluster to the deadline; others complete."""
+        with open(ORIGINAL_PATH, "r") as f:
+            self._write("stuck.py", f.read().replace("self.transition_count += 1",
+                                                     "self.transition_count += sum(__import__('itertools').repeat(0))"))
+        clusters = {0: ["stuck.py", "mutant_0.py"], 1: ["mutant_1.py"], 2: ["mutant_2.py"]}
+        results = check_clusters(clusters, self.tmp_dir.name, timeout=0.5, max_workers=2, cluster_timeout=2)
+        self.assertEqual(results[0], {"groups": [], "errors": {"stuck.py": "timeout", "mutant_0.py": "timeout"}})
+        self.assertEqual(results[1], {"groups": [["mutant_1.py"]], "errors": {}})
+        self.assertEqual(results[2], {"groups": [["mutant_2.py"]], "errors": {}})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+import numpy as np
+from sklearn.cluster import DBSCAN
+from sklearn.preprocessing import StandardScaler
+from src.clustering.grid_dbscan import GridDBSCAN
+
+
+class TestGridDBSCAN(unittest.TestCase):
+
+    def setUp(self):
+        """Scaled small-integer features with many duplicates, like the structural metrics."""
+        rng = np.random.default_rng(0)
+        self.features = StandardScaler().fit_transform(rng.integers(0, 6, size=(600, 6)).astype(np.float64))
+        self.weights = rng.integers(1, 4, size=600)
+
+    def test_labels_match_sklearn(self):
+        """Labels, cluster numbering and core points are identical to scikit-learn's DBSCAN."""
+        for eps in (0.5, 1.0, 2.0):
+            for min_samples in (1, 2, 5, 10):
+                with self.subTest(eps=eps, min_samples=min_samples):
+                    expected = DBSCAN(eps=eps, min_samples=min_samples).fit(self.features)
+                    result = GridDBSCAN(eps=eps, min_samples=min_samples).fit(self.features)
+                    np.testing.assert_array_equal(result.labels_, expected.labels_)
+                    np.testing.assert_array_equal(result.core_sample_indices_, expected.core_sample_indices_)
+
+    def test_sample_weight_matches_sklearn(self):
+        """Weighted neighbourhood counts give the same labels as scikit-learn."""
+        expected = DBSCAN(eps=1.0, min_samples=8).fit_predict(self.features, sample_weight=self.weights)
+        result = GridDBSCAN(eps=1.0, min_samples=8).fit_predict(self.features, sample_weight=self.weights)
+        np.testing.assert_array_equal(result, expected)
+
+    def test_too_many_dimensions(self):
+        """The 3^d neighbouring cells limit the grid to low-dimensional features."""
+        with self.assertRaises(ValueError):
+            GridDBSCAN().fit(np.zeros((5, 20)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from src.clustering import incremental
+from src.clustering.cluster_api import FeatureSet, save_cluster_assignments
+from src.clustering.incremental import fit_and_save, update_assignments
+
+
+class TestIncrementalAssignments(unittest.TestCase):
+
+    def setUp(self):
+        """Three well-separated blobs; the last mutants are added after the first fit."""
+        rng = np.random.default_rng(0)
+        matrix = np.vstack([rng.normal(center, 0.2, size=(20, 2)) for center in ((0, 0), (5, 5), (0, 8))])
+        order = rng.permutation(len(matrix))
+        self.names = [f"mutant_{i}.py" for i in range(len(matrix))]
+        self.features = FeatureSet(matrix[order], self.names, ["calls", "conditionals"])
+        self.old = FeatureSet(self.features.matrix[:50], self.names[:50], self.features.columns)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.model_dir = os.path.join(self.tmp_dir.name, "model")
+        self.assignments_path = os.path.join(self.model_dir, "cluster_assignments.json")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_new_mutants_are_assigned_without_refit(self):
+        """Test that only new mutants are assigned, against the model that wrote the assignments."""
+        first = update_assignments(self.old, self.assignments_path, model_dir=self.model_dir, n_clusters=3)
+        with mock.patch.object(incremental, "fit_and_save", side_effect=AssertionError("refitted")):
+            updated = update_assignments(self.features, self.assignments_path, model_dir=self.model_dir)
+        self.assertEqual({name: updated[name] for name in first}, first)
+        self.assertEqual(set(updated), set(self.names))
+        with open(self.assignments_path, "r") as f:
+            self.assertEqual(json.load(f), updated)
+
+    def test_assignments_of_another_fit_are_not_merged(self):
+        """Test that a model and an assignments file from different fits trigger a refit instead of a merge."""
+        fit_and_save(self.old, model_dir=self.model_dir, n_clusters=3)
+        # Written by another fit (e.g. kmeans_clustering), with labels the model knows nothing about
+        save_cluster_assignments([7] * 50, self.old.mutant_names, self.assignments_path)
+
+        updated = update_assignments(self.features, self.assignments_path, model_dir=self.model_dir)
+        self.assertEqual(set(updated), set(self.names))
+        # Refitted with the persisted model's parameters
+        self.assertNotIn(7, updated.values())
+        self.assertEqual(len(set(updated.values())), 3)
+        with open(os.path.join(self.model_dir, "model.json"), "r") as f:
+            meta = json.load(f)
+        self.assertEqual(meta["n_fitted"], len(self.names))
+        self.assertEqual(meta["params"], {"n_clusters": 3})
+
+    def test_default_assignments_live_with_the_model(self):
+        """Test that the default assignments file is not the one written by the clustering mains."""
+        self.assertEqual(os.path.dirname(incremental.ASSIGNMENTS_PATH), incremental.MODEL_DIR)
+
+
+if __name__ == "__main__":
+    unittest.main()
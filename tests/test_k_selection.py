@@ -0,0 +1,48 @@
+import unittest
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.datasets import make_blobs
+from src.clustering.cluster_api import FeatureSet
+from src.clustering.k_selection import knee_point, select_k
+
+
+class TestKSelection(unittest.TestCase):
+
+    def test_knee_point(self):
+        """Test that the knee is the point furthest below the chord of the normalized curve."""
+        self.assertEqual(knee_point([1, 2, 3, 4, 5, 6], [100, 50, 10, 9, 8, 7]), 3)
+        self.assertEqual(knee_point([2, 4, 6, 8], [80, 20, 15, 12]), 4)
+        # A straight line has no knee below the chord: the first k is returned
+        self.assertEqual(knee_point([2, 3, 4], [30, 20, 10]), 2)
+        self.assertEqual(knee_point([2, 3, 4], [5, 5, 5]), 2)
+        self.assertEqual(knee_point([2, 3], [10, 1]), 2)
+
+    def test_selects_number_of_blobs(self):
+        """Test that the chosen k is the number of well-separated blobs."""
+        for n_blobs in (3, 4, 6):
+            with self.subTest(n_blobs=n_blobs):
+                angles = 2 * np.pi * np.arange(n_blobs) / n_blobs
+                centers = 10 * np.column_stack([np.cos(angles), np.sin(angles)])
+                points, _ = make_blobs(n_samples=100 * n_blobs, centers=centers, cluster_std=0.5, random_state=1)
+                selection = select_k(FeatureSet(points), k_values=range(2, 11))
+                self.assertEqual(selection["k"], n_blobs)
+                self.assertEqual(sorted(selection["models"]), list(range(2, 11)))
+
+    def test_chosen_model_matches_full_fit(self):
+        """Test that the reused model of the chosen k is as good as a KMeans fit with 10 initializations."""
+        points, _ = make_blobs(n_samples=600, centers=4, cluster_std=1.0, random_state=0)
+        features = FeatureSet(points)
+        selection = select_k(features, k_values=range(2, 11))
+        model = selection["models"][selection["k"]]
+        reference = KMeans(n_clusters=selection["k"], n_init=10, random_state=42).fit(features.scaled)
+        self.assertLessEqual(model.inertia_, reference.inertia_ * 1.01)
+        self.assertEqual(len(model.labels_), len(points))
+
+    def test_invalid_candidates(self):
+        """Test that a corpus too small for every candidate k is rejected."""
+        with self.assertRaises(ValueError):
+            select_k(FeatureSet(np.arange(4, dtype=np.float64).reshape(2, 2)), k_values=range(2, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from unittest import mock
+import numpy as np
+from scipy.spatial.distance import cdist
+from src.clustering import medoids
+from src.clustering.medoids import cluster_medoids, medoid
+
+
+def exact_medoid(vectors):
+    """Row with the smallest total distance to all rows (the first one on ties)."""
+    return int(np.argmin(cdist(vectors, vectors).sum(axis=1)))
+
+
+class TestMedoids(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.vectors = rng.normal(size=(400, 3))
+
+    def test_exact_within_budget(self):
+        """Test that the medoid is exact when all pairwise distances fit in the budget."""
+        vectors = self.vectors[:50]
+        self.assertEqual(medoid(vectors, max_evaluations=50 * 50), exact_medoid(vectors))
+
+    def test_sequential_halving_matches_exact(self):
+        """Test that sequential halving, on a budget below m², still finds the exact medoid."""
+        # The default budget (32 distances per point and round, 9 rounds) is under 3/4 of m²
+        self.assertEqual(medoid(self.vectors), exact_medoid(self.vectors))
+        self.assertEqual(medoid(self.vectors, metric="cityblock"),
+                         int(np.argmin(cdist(self.vectors, self.vectors, "cityblock").sum(axis=1))))
+
+    def test_single_member(self):
+        """Test that a cluster of one mutant is its own medoid."""
+        self.assertEqual(medoid(self.vectors[:1]), 0)
+        self.assertEqual(cluster_medoids(self.vectors[:3], [0, 1, -1]), {0: 0, 1: 1})
+
+    def test_all_duplicates(self):
+        """Test that a cluster of identical mutants picks its first row."""
+        self.assertEqual(medoid(np.ones((20, 3))), 0)
+        self.assertEqual(cluster_medoids(np.ones((6, 3)), [1, 0, 1, 0, 1, 1]), {0: 1, 1: 0})
+
+    def test_duplicates_are_weighted(self):
+        """Test that collapsed duplicates still count with their multiplicity."""
+        vectors = np.array([[0.0], [10.0], [10.0], [10.0], [4.0]])
+        self.assertEqual(medoid(vectors), exact_medoid(vectors))
+        self.assertEqual(medoid(vectors), 1)
+
+    def test_budget_floor(self):
+        """Test that a budget below one distance per point and round is raised to that floor, not exceeded silently."""
+        evaluations = []
+
+        def counting_cdist(a, b, metric):
+            evaluations.append(len(a) * len(b))
+            return cdist(a, b, metric)
+
+        with mock.patch.object(medoids, "cdist", side_effect=counting_cdist):
+            medoid(self.vectors, max_evaluations=10)
+        # 400 distinct points, 9 rounds
+        self.assertLessEqual(sum(evaluations), 400 * 9)
+
+    def test_cluster_medoids_matches_per_cluster_search(self):
+        """Test that grouping rows with one sort gives each cluster its own medoid row."""
+        labels = np.random.default_rng(1).integers(-1, 5, size=len(self.vectors))
+        expected = {}
+        for cluster in range(5):
+            rows = np.flatnonzero(labels == cluster)
+            expected[cluster] = int(rows[exact_medoid(self.vectors[rows])])
+        self.assertEqual(cluster_medoids(self.vectors, labels), expected)
+        self.assertEqual(cluster_medoids(self.vectors[:2], [-1, -1]), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import numpy as np
+from scipy.spatial.distance import euclidean
+from src.clustering.cluster_api import FeatureSet
+from src.clustering.mutant_pruner import prune_mutants
+
+
+def loop_prune(cluster_assignments, features):
+    """The per-cluster loop mutant_pruner ran before it was vectorized (noise ignored)."""
+    row_index = {mutant: i for i, mutant in enumerate(features.mutant_names)}
+    clustered_mutants = {}
+    for mutant, cluster in cluster_assignments.items():
+        if cluster != -1:
+            clustered_mutants.setdefault(cluster, []).append(mutant)
+    representatives = {}
+    pruned_mutants = {}
+    for cluster, mutants in clustered_mutants.items():
+        centroid = np.mean(features.matrix[[row_index[m] for m in mutants]], axis=0)
+        closest_mutant = min(mutants, key=lambda m: euclidean(features.matrix[row_index[m]], centroid))
+        representatives[cluster] = closest_mutant
+        pruned_mutants[cluster] = [m for m in mutants if m != closest_mutant]
+    return representatives, pruned_mutants
+
+
+class TestMutantPruner(unittest.TestCase):
+
+    def setUp(self):
+        """A fixed corpus of 12 mutants in 3 clusters and 2 noise points, in shuffled order."""
+        matrix = np.array([[0, 0], [5, 5], [1, 0], [9, 9], [0, 1], [5, 6], [1, 1], [20, 0],
+                           [9, 8], [6, 5], [8, 9], [0, 20]], dtype=np.float32)
+        names = [f"mutant_{i}.py" for i in range(len(matrix))]
+        # Features are stored in another order than the assignments
+        self.features = FeatureSet(matrix[::-1], names[::-1])
+        labels = [0, 2, 0, 1, 0, 2, 0, -1, 1, 2, 1, -1]
+        self.cluster_assignments = dict(zip(names, labels))
+
+    def test_fixed_fixture(self):
+        """Test the representatives and pruned mutants of a fixed fixture."""
+        representatives, pruned_mutants = prune_mutants(self.cluster_assignments, self.features, noise="drop")
+        self.assertEqual(representatives, {0: "mutant_0.py", 2: "mutant_1.py", 1: "mutant_3.py"})
+        self.assertEqual(pruned_mutants, {0: ["mutant_2.py", "mutant_4.py", "mutant_6.py"],
+                                          2: ["mutant_5.py", "mutant_9.py"],
+                                          1: ["mutant_8.py", "mutant_10.py"]})
+
+    def test_matches_loop_implementation(self):
+        """Test that the vectorized pruning gives the same output, key order included, as the old loop."""
+        expected = loop_prune(self.cluster_assignments, self.features)
+        actual = prune_mutants(self.cluster_assignments, self.features, noise="drop")
+        self.assertEqual(actual, expected)
+        self.assertEqual([list(mapping) for mapping in actual], [list(mapping) for mapping in expected])
+
+    def test_matches_loop_implementation_on_random_corpus(self):
+        """Test the same equivalence on a larger random corpus with ties and noise."""
+        rng = np.random.default_rng(0)
+        matrix = rng.integers(0, 4, size=(300, 3)).astype(np.float32)
+        names = [f"mutant_{i}.py" for i in range(len(matrix))]
+        cluster_assignments = dict(zip(names, rng.integers(-1, 20, size=len(matrix)).tolist()))
+        features = FeatureSet(matrix, names)
+        self.assertEqual(prune_mutants(cluster_assignments, features, noise="drop"),
+                         loop_prune(cluster_assignments, features))
+
+
+if __name__ == "__main__":
+    unittest.main()
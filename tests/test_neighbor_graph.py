@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from sklearn.cluster import DBSCAN
+from src.clustering import neighbor_graph
+from src.clustering.cluster_api import FeatureSet
+from src.clustering.neighbor_graph import (build_neighbor_graph, dbscan_from_graph, hdbscan_from_graph,
+                                           load_or_build_neighbor_graph)
+
+
+class TestNeighborGraph(unittest.TestCase):
+
+    def setUp(self):
+        """Three blobs, with duplicate rows, and a few scattered points."""
+        rng = np.random.default_rng(0)
+        blobs = [rng.normal(center, 0.3, size=(30, 2)) for center in ((0, 0), (5, 5), (0, 8))]
+        self.points = np.vstack(blobs + [blobs[0][:5], rng.uniform(-3, 11, size=(10, 2))])
+
+    def test_dbscan_matches_dense(self):
+        """Test that DBSCAN on a radius graph gives the dense labels for every eps up to the radius."""
+        graph = build_neighbor_graph(self.points, radius=1.0)
+        for eps in (0.2, 0.5, 1.0):
+            for min_samples in (2, 5):
+                with self.subTest(eps=eps, min_samples=min_samples):
+                    np.testing.assert_array_equal(dbscan_from_graph(graph, eps=eps, min_samples=min_samples),
+                                                  DBSCAN(eps=eps, min_samples=min_samples).fit_predict(self.points))
+
+    def test_duplicates_stay_connected(self):
+        """Test that zero distances between duplicate rows survive in the sparse graph."""
+        graph = build_neighbor_graph(np.array([[0.0, 0.0], [0.0, 0.0], [9.0, 9.0]]), radius=1.0)
+        self.assertEqual(graph[0, 1], np.finfo(graph.dtype).tiny)
+        np.testing.assert_array_equal(dbscan_from_graph(graph, eps=0.5, min_samples=2), [0, 0, -1])
+
+    def test_cached_graph_serves_smaller_radius(self):
+        """Test that a persisted radius graph is reused for a smaller radius and rebuilt for a larger one."""
+        features = FeatureSet(self.points)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            graph_path = os.path.join(tmp_dir, "neighbor_graph.npz")
+            graph = load_or_build_neighbor_graph(features, graph_path, radius=1.0)
+            with mock.patch.object(neighbor_graph, "build_neighbor_graph", side_effect=AssertionError("rebuilt")):
+                cached = load_or_build_neighbor_graph(features, graph_path, radius=0.5)
+                with self.assertRaises(AssertionError):
+                    load_or_build_neighbor_graph(features, graph_path, radius=2.0)
+                with self.assertRaises(AssertionError):
+                    load_or_build_neighbor_graph(features, graph_path, n_neighbors=5)
+        self.assertEqual((cached != graph).nnz, 0)
+
+    def test_hdbscan_per_component(self):
+        """Test that HDBSCAN per connected component finds the dense clusters; small components are noise."""
+        import hdbscan as hdbscan_lib
+
+        rng = np.random.default_rng(1)
+        # Two components of two sub-clusters each, and a two-point component
+        points = np.vstack([rng.normal(center, 0.3, size=(25, 2)) for center in ((0, 0), (3, 0), (50, 50), (53, 50))]
+                           + [[[100.0, 100.0], [100.1, 100.0]]])
+        direct = hdbscan_lib.HDBSCAN(min_cluster_size=5, min_samples=2).fit_predict(points)
+        for graph in (build_neighbor_graph(points, radius=6.0), build_neighbor_graph(points, n_neighbors=30)):
+            with self.subTest(nnz=graph.nnz):
+                labels = hdbscan_from_graph(graph, min_cluster_size=5, min_samples=2)
+                np.testing.assert_array_equal(labels[-2:], [-1, -1])
+                self.assertEqual(len(set(labels) - {-1}), 4)
+                # Same partition as the dense fit
+                self.assertEqual(len(set(zip(labels, direct))), len(set(direct)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import sys
+import unittest
+from unittest import mock
+import numpy as np
+from sklearn.cluster import DBSCAN
+from src.clustering import parameter_sweep
+from src.clustering.cluster_api import summarize_labels
+from src.clustering.parameter_sweep import _hdbscan_summaries, sweep_dbscan, sweep_hdbscan
+
+
+class TestParameterSweep(unittest.TestCase):
+
+    def setUp(self):
+        """Three blobs of different spread, duplicate rows and scattered points."""
+        rng = np.random.default_rng(0)
+        blobs = [rng.normal(center, spread, size=(30, 2)) for center, spread in (((0, 0), 0.2), ((4, 4), 0.5),
+                                                                                 ((0, 6), 0.8))]
+        self.points = np.vstack(blobs + [blobs[0][:4], rng.uniform(-3, 9, size=(15, 2))])
+
+    def test_dbscan_sweep_matches_direct_fits(self):
+        """Test that every DBSCAN summary equals the summary of a direct scikit-learn fit."""
+        results = sweep_dbscan(self.points, eps_values=[0.2, 0.5, 1.0], min_samples_values=[2, 4, 8], max_workers=2)
+        self.assertEqual(len(results), 9)
+        for row in results:
+            with self.subTest(eps=row["eps"], min_samples=row["min_samples"]):
+                labels = DBSCAN(eps=row["eps"], min_samples=row["min_samples"]).fit_predict(self.points)
+                self.assertEqual({key: row[key] for key in ("n_clusters", "noise_share", "reduction_ratio")},
+                                 summarize_labels(labels))
+
+    def test_hdbscan_sweep_matches_direct_fits(self):
+        """Test that every HDBSCAN summary, re-condensed from one tree, equals a direct fit."""
+        import hdbscan as hdbscan_lib
+
+        results = sweep_hdbscan(self.points, min_samples_values=[1, 3], min_cluster_sizes=[2, 5, 10], max_workers=2)
+        self.assertEqual(len(results), 6)
+        for row in results:
+            with self.subTest(min_samples=row["min_samples"], min_cluster_size=row["min_cluster_size"]):
+                labels = hdbscan_lib.HDBSCAN(min_cluster_size=row["min_cluster_size"],
+                                             min_samples=row["min_samples"]).fit_predict(self.points)
+                self.assertEqual({key: row[key] for key in ("n_clusters", "noise_share", "reduction_ratio")},
+                                 summarize_labels(labels))
+
+    def test_hdbscan_public_api_fallback(self):
+        """Test that the summaries are unchanged when hdbscan's internal tree module is unavailable."""
+        with mock.patch.dict(parameter_sweep._SHARED, {"features": self.points}):
+            expected = _hdbscan_summaries(2, [2, 5, 10])
+            with mock.patch.dict(sys.modules, {"hdbscan._hdbscan_tree": None}):
+                self.assertEqual(_hdbscan_summaries(2, [2, 5, 10]), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import numpy as np
+from src.clustering.cluster_api import FeatureSet
+from src.clustering.mutant_pruner import prune_mutants
+from src.clustering.representatives import STRATEGIES, representative_names, select_representatives
+
+
+class TestRepresentatives(unittest.TestCase):
+
+    def setUp(self):
+        """Two clusters on a line and two noise mutants."""
+        self.matrix = np.array([[0.0], [1.0], [2.0], [3.0], [10.0], [11.0], [12.0], [50.0], [-50.0]])
+        self.labels = np.array([0, 0, 0, 0, 1, 1, 1, -1, -1])
+
+    def test_strategy_choice(self):
+        """Test that each strategy picks its own representatives."""
+        self.assertEqual(select_representatives(self.matrix, self.labels, "centroid", noise="drop"),
+                         {0: [1], 1: [5]})
+        self.assertEqual(select_representatives(self.matrix, self.labels, "medoid", noise="drop"),
+                         {0: [1], 1: [5]})
+        self.assertEqual(select_representatives(self.matrix, self.labels, "kcenter", noise="drop",
+                                                n_representatives=2), {0: [1, 3], 1: [5, 4]})
+        self.assertEqual(select_representatives(self.matrix, self.labels, "proportional", noise="drop",
+                                                fraction=0.5), {0: [1, 3], 1: [5, 4]})
+
+    def test_cheapest_uses_run_times(self):
+        """Test that the cheapest central mutant wins and unknown run times fall back to the centroid."""
+        run_times = np.array([0.1, 5.0, 1.0, 0.1, np.inf, np.inf, np.inf, 1.0, 1.0])
+        self.assertEqual(select_representatives(self.matrix, self.labels, "cheapest", noise="drop",
+                                                run_times=run_times), {0: [2], 1: [5]})
+        with self.assertRaises(ValueError):
+            select_representatives(self.matrix, self.labels, "cheapest")
+
+    def test_unknown_strategy_or_noise(self):
+        """Test that unknown strategies and noise modes are rejected."""
+        self.assertIn("centroid", STRATEGIES)
+        with self.assertRaises(ValueError):
+            select_representatives(self.matrix, self.labels, "random")
+        with self.assertRaises(ValueError):
+            select_representatives(self.matrix, self.labels, noise="ignore")
+
+    def test_noise_handling(self):
+        """Test that noise mutants are kept as singletons by default, dropped or clustered on request."""
+        kept = select_representatives(self.matrix, self.labels)
+        self.assertEqual(kept, {0: [1], 1: [5], -1: [7, 8]})
+        self.assertNotIn(-1, select_representatives(self.matrix, self.labels, noise="drop"))
+        clustered = select_representatives(self.matrix, self.labels, noise="cluster")
+        self.assertEqual(len(clustered[-1]), 1)
+        self.assertEqual(select_representatives(self.matrix, np.full(3, -1)), {-1: [0, 1, 2]})
+
+    def test_noise_kept_when_pruning(self):
+        """Test that pruning keeps every noise mutant and prunes none of them."""
+        names = [f"mutant_{i}.py" for i in range(len(self.matrix))]
+        representatives, pruned_mutants = prune_mutants(dict(zip(names, self.labels.tolist())),
+                                                        FeatureSet(self.matrix, names))
+        self.assertEqual(representatives[-1], ["mutant_7.py", "mutant_8.py"])
+        self.assertEqual(pruned_mutants[-1], [])
+        self.assertEqual(sorted(representative_names(representatives)),
+                         ["mutant_1.py", "mutant_5.py", "mutant_7.py", "mutant_8.py"])
+
+
+if __name__ == "__main__":
+    unittest.main()
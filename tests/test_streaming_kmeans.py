@@ -0,0 +1,74 @@
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.datasets import make_blobs
+from sklearn.metrics import adjusted_rand_score
+from sklearn.preprocessing import StandardScaler
+from src.clustering import streaming_kmeans
+from src.clustering.streaming_kmeans import export_feature_matrix, fit_streaming_kmeans
+
+
+class TestStreamingKMeans(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.features_path = os.path.join(self.tmp_dir.name, "features.json")
+        self.matrix_path = os.path.join(self.tmp_dir.name, "features.npy")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write_features(self, features, mtime=None):
+        with open(self.features_path, "w") as f:
+            json.dump(features, f)
+        if mtime is not None:
+            os.utime(self.features_path, (mtime, mtime))
+
+    def test_export_is_cached_until_the_source_changes(self):
+        """Test that the matrix is exported once, kept while features.json is unchanged and refreshed after."""
+        self._write_features({"m0.py": {"calls": 1, "loops": 2}, "m1.py": {"calls": 3, "loops": 4}}, mtime=1000)
+        self.assertEqual(export_feature_matrix(self.features_path, self.matrix_path), ["m0.py", "m1.py"])
+
+        with mock.patch.object(streaming_kmeans, "save_feature_matrix", side_effect=AssertionError("exported")):
+            # Unchanged file, then same content with a new mtime: no export
+            export_feature_matrix(self.features_path, self.matrix_path)
+            self._write_features({"m0.py": {"calls": 1, "loops": 2}, "m1.py": {"calls": 3, "loops": 4}}, mtime=2000)
+            with mock.patch.object(streaming_kmeans, "_file_digest", wraps=streaming_kmeans._file_digest) as digest:
+                export_feature_matrix(self.features_path, self.matrix_path)
+                export_feature_matrix(self.features_path, self.matrix_path)
+            self.assertEqual(digest.call_count, 1)
+
+        # New content: re-exported
+        self._write_features({"m0.py": {"calls": 1, "loops": 2}, "m1.py": {"calls": 3, "loops": 4},
+                              "m2.py": {"calls": 5, "loops": 6}}, mtime=3000)
+        self.assertEqual(export_feature_matrix(self.features_path, self.matrix_path), ["m0.py", "m1.py", "m2.py"])
+        np.testing.assert_array_equal(np.load(self.matrix_path), [[1, 2], [3, 4], [5, 6]])
+
+    def test_chunked_fit_matches_in_memory_fit(self):
+        """Test that the chunked fit over a memory-mapped matrix finds the clusters of an in-memory fit."""
+        points, truth = make_blobs(n_samples=3000, centers=5, cluster_std=0.6, random_state=0)
+        np.save(self.matrix_path, points.astype(np.float32))
+
+        labels, model, scaler = fit_streaming_kmeans(self.matrix_path, n_clusters=5, chunk_size=500)
+        scaled = StandardScaler().fit_transform(points.astype(np.float32))
+        in_memory = MiniBatchKMeans(n_clusters=5, random_state=42, batch_size=500, n_init=3).fit_predict(scaled)
+
+        np.testing.assert_allclose(scaler.mean_, points.mean(axis=0), rtol=1e-4)
+        self.assertEqual(len(labels), len(points))
+        self.assertGreater(adjusted_rand_score(in_memory, labels), 0.99)
+        self.assertGreater(adjusted_rand_score(truth, labels), 0.99)
+        np.testing.assert_array_equal(labels, model.predict(scaler.transform(points.astype(np.float32))))
+
+    def test_chunk_smaller_than_clusters(self):
+        """Test that a chunk size below the number of clusters is rejected."""
+        np.save(self.matrix_path, np.zeros((20, 2), dtype=np.float32))
+        with self.assertRaises(ValueError):
+            fit_streaming_kmeans(self.matrix_path, n_clusters=5, chunk_size=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import numpy as np
+from src.mutation_testing.subsumption import dominator_mutants, pack_kills, popcount, subsumes
+
+
+class TestDominatorMutants(unittest.TestCase):
+
+    def test_pack_kills_and_popcount(self):
+        """Kill sets wider than one word keep every bit and count killing tests exactly."""
+        kills = np.zeros((2, 130), dtype=bool)
+        kills[0, [0, 63, 64, 129]] = True
+        kills[1, 5] = True
+        words = pack_kills(kills)
+        self.assertEqual(words.shape, (2, 3))
+        np.testing.assert_array_equal(popcount(words), [4, 1])
+        self.assertFalse(subsumes(words[1], words[0]))
+        self.assertTrue(subsumes(words[1], words[1] | words[0]))
+
+    def test_dominators(self):
+        """Subsumed, duplicate and unkilled mutants are left out of the dominator set."""
+        kills = np.array([
+            [1, 1, 0, 0],  # 0: subsumed by 2
+            [0, 0, 1, 0],  # 1: dominator
+            [1, 0, 0, 0],  # 2: dominator
+            [0, 0, 0, 0],  # 3: never killed
+            [0, 0, 1, 0],  # 4: duplicate of 1
+            [1, 0, 1, 1],  # 5: subsumed by 1 and 2
+        ], dtype=bool)
+        dominators, subsumed_by = dominator_mutants(pack_kills(kills))
+        np.testing.assert_array_equal(dominators, [1, 2])
+        self.assertEqual(subsumed_by[0], 2)
+        self.assertEqual(subsumed_by[3], -1)
+        self.assertEqual(subsumed_by[4], 1)
+        self.assertIn(subsumed_by[5], (1, 2))
+
+    def test_matches_pairwise_definition(self):
+        """Dominators are the first mutant of each killed set with no strictly smaller killed subset."""
+        rng = np.random.default_rng(0)
+        kills = rng.random((80, 150)) < 0.05
+        kills = np.vstack([kills, kills[:20] | kills[20:40]])
+        sets = [frozenset(np.flatnonzero(row)) for row in kills]
+        expected = [i for i, killed in enumerate(sets)
+                    if killed and killed not in sets[:i] and not any(other and other < killed for other in sets)]
+        dominators, _ = dominator_mutants(pack_kills(kills))
+        self.assertEqual(dominators.tolist(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
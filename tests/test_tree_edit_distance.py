@@ -0,0 +1,123 @@
+import os
+import tempfile
+import unittest
+from scipy.spatial.distance import squareform
+from src.feature_extraction.tree_edit_distance import (
+    build_tree, compute_distance_matrix, load_distance_matrix, lower_bound, tree_distance
+)
+
+
+SOURCE = """class FSM:
+    def step(self, x):
+        if x > 0:
+            return x + 1
+        return x
+"""
+
+
+class TestTreeEditDistance(unittest.TestCase):
+
+    def test_identical_sources(self):
+        """Test that identical sources are at distance 0."""
+        self.assertEqual(tree_distance(build_tree(SOURCE), build_tree(SOURCE)), 0)
+
+    def test_operator_replacement(self):
+        """Test that replacing one operator costs a single relabel."""
+        mutant = SOURCE.replace("x + 1", "x - 1")
+        self.assertEqual(tree_distance(build_tree(SOURCE), build_tree(mutant)), 1)
+
+    def test_statement_insertion(self):
+        """Test that inserting ``y = 2`` costs its three nodes."""
+        self.assertEqual(tree_distance(build_tree("x = 1"), build_tree("x = 1\ny = 2")), 3)
+
+    def test_lower_bound_never_exceeds_distance(self):
+        """Test the pruning bound against the exact distance."""
+        mutant = SOURCE.replace("if x > 0:", "if not x < 0:")
+        units1, units2 = build_tree(SOURCE), build_tree(mutant)
+        bound = lower_bound(units1["FSM.step"], units2["FSM.step"])
+        self.assertLessEqual(bound, tree_distance(units1, units2))
+
+    def test_matrix_reuses_cached_pairs(self):
+        """Test that a rerun keeps distances and only indexes new mutants."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = []
+            for i, source in enumerate([SOURCE, SOURCE.replace("+", "-"), SOURCE.replace(">", "<")]):
+                paths.append(os.path.join(tmp_dir, f"mutant_{i}.py"))
+                with open(paths[-1], "w") as f:
+                    f.write(source)
+
+            output_path = os.path.join(tmp_dir, "distances.npy")
+            first = list(compute_distance_matrix(paths[:2], output_path, max_workers=1))
+            second = compute_distance_matrix(paths, output_path, max_workers=1)
+            self.assertEqual(first, [1.0])
+            self.assertEqual(list(second), [1.0, 1.0, 2.0])
+
+            square, names = load_distance_matrix(output_path)
+            self.assertEqual(square.shape, (3, 3))
+            self.assertEqual(names, ["mutant_0.py", "mutant_1.py", "mutant_2.py"])
+
+    def _write_mutants(self, tmp_dir, sources):
+        paths = []
+        for i, source in enumerate(sources):
+            paths.append(os.path.join(tmp_dir, f"mutant_{i}.py"))
+            with open(paths[-1], "w") as f:
+                f.write(source)
+        return paths
+
+    def test_rerun_with_duplicate_content(self):
+        """Test that a rerun over duplicate-content mutants reads back the same distances."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            far = SOURCE.replace("return x + 1", "y = x * 2\n            return y - 1")
+            paths = self._write_mutants(tmp_dir, [SOURCE, SOURCE, SOURCE.replace("+", "-"), far])
+            output_path = os.path.join(tmp_dir, "distances.npy")
+            first = list(compute_distance_matrix(paths, output_path, max_workers=1))
+            second = list(compute_distance_matrix(paths, output_path, max_workers=1))
+            self.assertEqual(second, first)
+            self.assertNotIn(0.0, first[1:3] + first[4:])
+
+    def test_cutoff_change_recomputes(self):
+        """Test that lower bounds pruned under one cutoff are not reused as exact distances."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            far = SOURCE.replace("return x + 1", "y = x * 2\n            return y - 1")
+            paths = self._write_mutants(tmp_dir, [SOURCE, far])
+            output_path = os.path.join(tmp_dir, "distances.npy")
+            exact = tree_distance(build_tree(SOURCE), build_tree(far))
+            pruned = list(compute_distance_matrix(paths, output_path, cutoff=0, max_workers=1))
+            self.assertLess(pruned[0], exact)
+            self.assertEqual(list(compute_distance_matrix(paths, output_path, max_workers=1)), [exact])
+
+    def test_redefined_functions_are_kept(self):
+        """Test that a property setter sharing its getter's qualified name gets its own tree."""
+        source = """class Booking:
+    @property
+    def state(self):
+        return self._state
+
+    @state.setter
+    def state(self, value):
+        self._state = value
+"""
+        units = build_tree(source)
+        self.assertIn("Booking.state", units)
+        self.assertIn("Booking.state#2", units)
+        mutant = source.replace("self._state = value", "self._state = None")
+        self.assertEqual(tree_distance(units, build_tree(mutant)), 1)
+
+    def test_blocks_match_direct_distances(self):
+        """Test that lazily generated blocks, partly served from the cache, give every pairwise distance."""
+        sources = [SOURCE, SOURCE.replace("+", "-"), SOURCE.replace(">", "<"), SOURCE,
+                   SOURCE.replace("return x\n", "return -x\n"), SOURCE.replace("1", "2"),
+                   SOURCE.replace("x > 0", "x >= 0")]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = self._write_mutants(tmp_dir, sources)
+            output_path = os.path.join(tmp_dir, "distances.npy")
+            compute_distance_matrix(paths[:4], output_path, block_size=2, max_workers=1)
+            square = squareform(compute_distance_matrix(paths, output_path, block_size=2, max_workers=1))
+        trees = [build_tree(source) for source in sources]
+        for i in range(len(sources)):
+            for j in range(i + 1, len(sources)):
+                self.assertEqual(square[i, j], tree_distance(trees[i], trees[j]), (i, j))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from src.clustering import visualization
+from src.clustering.visualization import (plot_in_background, project_plot_data, reap_renderers, render_plot,
+                                          save_cluster_plot_data, save_curve_plot_data)
+
+
+class TestVisualization(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data_path = os.path.join(self.tmp_dir.name, "plot_data.npz")
+        self.image_path = os.path.join(self.tmp_dir.name, "plot.png")
+        rng = np.random.default_rng(0)
+        self.features = np.vstack([rng.normal(center, 0.3, size=(20, 4)) for center in (0, 5)])
+        self.labels = np.repeat([0, 1], 20)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_saving_leaves_projection_to_renderer(self):
+        """Test that the clustering process saves scaled features and does not run the PCA."""
+        with mock.patch.dict(sys.modules, {"sklearn.decomposition": None}):
+            save_cluster_plot_data(self.features, self.labels, self.data_path, "Clusters",
+                                   centers=self.features[[0, 20]])
+        with np.load(self.data_path) as npz:
+            data = {key: npz[key] for key in npz.files}
+        self.assertNotIn("coords", data)
+        np.testing.assert_allclose(data["features"], self.features, rtol=1e-6)
+
+        projected = project_plot_data(data)
+        self.assertEqual(projected["coords"].shape, (40, 2))
+        self.assertEqual(projected["centers"].shape, (2, 2))
+        np.testing.assert_allclose(projected["centers"], projected["coords"][[0, 20]], atol=1e-4)
+
+    def test_render_plot(self):
+        """Test that cluster data and curve data are rendered to images."""
+        save_cluster_plot_data(self.features, self.labels, self.data_path, "Clusters")
+        render_plot(self.data_path, self.image_path)
+        self.assertGreater(os.path.getsize(self.image_path), 0)
+
+        curves_path = os.path.join(self.tmp_dir.name, "curves.json")
+        curves_image = os.path.join(self.tmp_dir.name, "curves.png")
+        save_curve_plot_data([{"x": [2, 3, 4], "y": [9, 4, 3], "xlabel": "k", "ylabel": "Inertia",
+                               "title": "Elbow", "vline": 3}], curves_path)
+        render_plot(curves_path, curves_image)
+        self.assertGreater(os.path.getsize(curves_image), 0)
+
+    def test_background_renderers_are_reaped(self):
+        """Test that background renderers are tracked until they exit and are then reaped."""
+        save_cluster_plot_data(self.features, self.labels, self.data_path, "Clusters")
+        with mock.patch.object(visualization, "_renderers", []):
+            process = plot_in_background(self.data_path, self.image_path)
+            self.assertEqual(visualization._renderers, [process])
+            self.assertEqual(reap_renderers(wait=True), [])
+            self.assertEqual(process.returncode, 0)
+        self.assertTrue(os.path.exists(self.image_path))
+
+
+if __name__ == "__main__":
+    unittest.main()